@@ -1,22 +1,76 @@
-from flask import Flask, request, render_template, jsonify
+from flask import Flask, Request, Response, current_app, g, request, render_template, jsonify, stream_with_context
 import sys
+import os
+import time
+import uuid
 from src.MLProject.exception import CustomException # Import custom exception class
-from src.MLProject.pipelines.prediction_pipeline import PredictPipeline, CustomData, CustomDataJSON
-from src.MLProject.components.data_ingestion import DataIngestion
-from src.MLProject.components.data_transformation import DataTransformation
-from src.MLProject.components.model_trainer import ModelTrainer
+from src.MLProject import handlers # Request handling shared with the ASGI app
+from src.MLProject.upload_parser import UploadSchemaError
+from src.MLProject.metrics import registry, http_requests, http_request_seconds, timed, stats_collector
+from src.MLProject.logger import get_logger, request_id_var, dropped_records
 import pandas as pd
 import io
-from io import StringIO
 from werkzeug.exceptions import RequestEntityTooLarge
-from middleware import auth # Middleware handles authentication
+from middleware import auth, admit, release_admission # Middleware handles authentication and admission control
+from src.MLProject.profiling import profiled
+from src.MLProject.serving import serving_state
+
+class PredictionRequest(Request):
+    """
+    Request class that lifts the upload size limit for streaming prediction uploads.
+    """
+
+    @property
+    def max_content_length(self):
+        if self.path == '/currencyprediction' and self.args.get('stream') in handlers.STREAM_FORMATS:
+            return current_app.config['STREAM_MAX_CONTENT_LENGTH']
+        return current_app.config['MAX_CONTENT_LENGTH']
+
+logger = get_logger(__name__)
 
 # Initialize Flask app
 app = Flask(__name__)
+app.request_class = PredictionRequest
 
 # Set maximum allowed file size for uploads (5 MB in this case)
 app.config['MAX_CONTENT_LENGTH'] = 5 * 1024 * 1024
 
+# Streaming prediction uploads are processed chunk by chunk, so they may be much larger
+app.config['STREAM_MAX_CONTENT_LENGTH'] = int(os.environ.get('MLPROJECT_STREAM_MAX_BYTES', 8 * 1024 * 1024 * 1024))
+
+# Which endpoints this process serves (see handlers.APP_MODES)
+app.config['APP_MODE'] = handlers.app_mode()
+
+# Records dropped by the logging queue when the writer thread falls behind
+registry.register_collector(stats_collector("mlproject_log", lambda: {"dropped_records": dropped_records()}, counters=("dropped_records",)))
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+    # Tag every log record of this request with the caller's request id or a new one
+    g.request_id = request.headers.get('X-Request-Id') or uuid.uuid4().hex
+    request_id_var.set(g.request_id)
+
+@app.after_request
+def record_request_metrics(response):
+    # Label by route pattern (e.g. /currencytraining/<job_id>) to keep the number of series bounded
+    endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+    http_requests.inc(endpoint=endpoint, status=response.status_code)
+    if 'request_start' in g:
+        duration = time.perf_counter() - g.request_start
+        http_request_seconds.observe(duration, endpoint=endpoint)
+        logger.info("Request finished", extra={
+            "stage": "request", "endpoint": endpoint, "method": request.method,
+            "status": response.status_code, "duration_ms": round(duration * 1000, 3),
+        })
+    if 'request_id' in g:
+        response.headers['X-Request-Id'] = g.request_id
+    return response
+
+# Free the admission slot of the request once its response (streamed or not) is done
+app.teardown_request(release_admission)
+
 # Custom error handler for exceptions
 @app.errorhandler(CustomException)
 def handle_my_error(error):
@@ -28,154 +82,87 @@ def handle_my_error(error):
     response = jsonify(res)
     return response
 
+def respond(result):
+    """
+    Turns a (body, status_code, headers) result of src.MLProject.handlers into a Flask response.
+    """
+    body, status_code, headers = result
+    return jsonify(body), status_code, headers
+
 # Route for the main page
 @app.route('/')
 @auth # Apply authentication middleware
 def index():
     return render_template("index.html")
 
-# Route for training the model, handles POST requests
-@app.route('/currencytraining',methods=["POST"])
+# Route for training the model, handles POST requests (registered below in "full" mode)
 @auth # Apply authentication middleware
+@admit('training') # Limit concurrent training uploads separately from predictions
+@profiled # Profile sampled or ?profile=1 requests
 def train():
     try:
         # Check if request is JSON data
         if request.is_json:
             return trainJSON()
         
-        # Get the uploaded file from the request
+        # Get the uploaded file from the request and check its field name and extension
         f = request.files.get('train_file')
+        invalid = handlers.check_upload(f.filename if f else None, 'train_file')
+        if invalid:
+            return respond(invalid)
 
-        # Check if a file was uploaded and has the correct filename
-        if not f:
-            res={
-                "status":False,
-                "message":"Error",
-                "data":"No file uploaded or filename is not 'train_file'"
-            }
-            return res, 400  
-
-        # Get the filename of the uploaded file
-        filename = f.filename
-
-        # Check if the file is a CSV file
-        if not filename.endswith('.csv'):
-            res={
-                "status":False,
-                "message":"Error",
-                "data":"Only CSV files allowed"
-            }
-            return res, 400
-        
-        # Read the uploaded file content into a string
-        stream = io.StringIO(f.stream.read().decode("UTF8"), newline=None)
-        stream.seek(0)
-        result = stream.read()
-
-        # Convert the string content to a pandas DataFrame
-        df = pd.read_csv(StringIO(result))
-
-        # Create a DataIngestion object and call its method to initiate data ingestion
-        obj=DataIngestion()
-        train_data_path,test_data_path=obj.initiate_data_ingestion(df)
-
-        # Create a DataTransformation object and call its method to transform the data
-        data_transformation = DataTransformation()
-        train_arr,test_arr = data_transformation.initiate_data_transormation(train_data_path,test_data_path)
-
-        # Create a ModelTrainer object and call its method to train the model
-        modeltrainer = ModelTrainer()
-        print(modeltrainer.initiate_model_trainer(train_arr,test_arr))
-
-        # Prepare successful training response
-        res={
-            "status":True,
-            "message":"Training done successfully!",
-            "data":"model created at artifacts/model.pkl"
-        }
-        return jsonify(res)
+        # Parse the uploaded bytes against the training schema and queue the training job
+        return respond(handlers.train_csv(f.stream, request.args.get('mode', 'full')))
     
     except RequestEntityTooLarge as e:
         # Handle file size exceeding the limit
-        res = {
-            "status": False,
-            "message": "Error!",
-            "data": 'File size exceeds 5 MB'
-        }
-        return res, 413
+        return respond(handlers.too_large("Error!"))
+
+    except UploadSchemaError as e:
+        # Handle uploads without the expected columns
+        return respond(handlers.error(str(e)))
     
     except Exception as e:
         # Handle other exceptions
-        error = CustomException(e,sys).error_message
-        return handle_my_error(error)
+        return respond(handlers.internal_error(e))
     
 def trainJSON():
+    """
+    This function handles training the model when data is provided in JSON format through a POST request.
+
+    JSON training defaults to incremental mode (appending the rows and extending
+    the current model), since a handful of rows cannot train a model on their own;
+    pass mode=full to train only on the posted rows. See handlers.train_json.
+
+    Returns:
+        JSON response indicating success or failure and any error messages.
+    """
     try:
-        """
-        This function handles training the model when data is provided in JSON format through a POST request.
-
-        Returns:
-            JSON response indicating success or failure and any error messages.
-        """
-
-        # Get the JSON data from the request
-        data = request.json
-
-        # Check if the request has any data
-        if not data:
-            # Prepare error response for missing JSON data
-            res = {
-                'status' : False,
-                'message' : 'Error',
-                'data' : 'Invalid JSON data'
-            }
-            return jsonify(res), 400
-        
-        # Define the required keys expected in the JSON data for training
-        required_keys = ['Month', 'Weekday', 'EUR', 
-                'JPY', 'BGN', 'CZK', 'DKK', 'GBP', 'HUF', 'PLN', 'RON', 'SEK', 'CHF', 'NOK', 'TRY', 'AUD', 'BRL', 'CAD', 'CNY', 'HKD', 'IDR', 'KRW', 'MXN', 'MYR', 'NZD', 'PHP', 'SGD', 'THB', 'ZAR',
-                'Year', 'Day']
-        
-        # Find any missing keys in the provided JSON data
-        missing_keys = [key for key in required_keys if key not in data]
-
-        if missing_keys:
-            res = {
-                'status': False,
-                'message' : 'Error',
-                'data': f'Missing keys in JSON data: {missing_keys}'
-            }
-            return jsonify(res), 400
-
-        # Convert the JSON data to a pandas DataFrame
-        df = pd.DataFrame([data])
-
-        # Create a DataIngestion object and call its method to initiate data ingestion
-        obj=DataIngestion()
-        train_data_path,test_data_path=obj.initiate_data_ingestion(df)
-
-        # Create a DataTransformation object and call its method to transform the data
-        data_transformation = DataTransformation()
-        train_arr,test_arr = data_transformation.initiate_data_transormation(train_data_path,test_data_path)
-
-        # Create a ModelTrainer object and call its method to train the model
-        modeltrainer = ModelTrainer()
-        print(modeltrainer.initiate_model_trainer(train_arr,test_arr))
-
-        # Prepare successful training response
-        res={
-            "status":True,
-            "message":"Training done successfully",
-            "data":"model created at artifacts/model.pkl"
-        }
-        return jsonify(res)
+        return respond(handlers.train_json(request.json, request.args.get('mode', 'incremental')))
 
     except Exception as e:
-        error = CustomException(e,sys).error_message
-        return handle_my_error(error)
+        return respond(handlers.internal_error(e))
+
+# Route for checking the status and result of a training job (registered below in "full" mode)
+@auth # Apply authentication middleware
+def trainingStatus(job_id):
+    """
+    This function reports the stage, elapsed time and, once finished, the RMSE and model version of a training job.
+
+    Returns:
+        JSON response containing the job status, or 404 if the job is unknown.
+    """
+    return respond(handlers.training_status(job_id))
+
+# Prediction-only processes do not expose the training routes at all
+if app.config['APP_MODE'] == 'full':
+    app.add_url_rule('/currencytraining', view_func=train, methods=["POST"])
+    app.add_url_rule('/currencytraining/<job_id>', view_func=trainingStatus, methods=["GET"])
 
 @app.route('/currencyprediction', methods=['POST'])
 @auth # Apply authentication middleware
+@admit('predict') # Queue or reject predictions beyond the concurrency limit
+@profiled # Profile sampled or ?profile=1 requests
 def predict():
     """
     This function handles generating predictions on currency data. It supports receiving data in two formats:
@@ -191,121 +178,91 @@ def predict():
             return predictJSON()
         
         # Handle case where data is uploaded as a CSV file
-        # Get the uploaded file from the request
+        # Get the uploaded file from the request and check its field name and extension
         f = request.files.get('test_file')
-
-        # Check if a file was uploaded and has the correct filename
-        if not f:
-            res={
-                "status":False,
-                "message":"Error",
-                "data":"No file uploaded or filename is not 'test_file'"
-            }
-            return res, 400  
-
-        # Get the filename of the uploaded file
-        filename = f.filename
-
-        # Check if the file is a CSV file
-        if not filename.endswith('.csv'):
-            res={
-                "status":False,
-                "message":"Error",
-                "data":"Only CSV files allowed"
-            }
-            return res, 400
-
-        # Use CustomData class to extract data array from the uploaded file
-        data = CustomData(f).arr
-
-        # Use the PredictPipeline to generate predictions on the data
-        prediction = PredictPipeline().predict(data)
-
-        # Convert the prediction results to a list
-        prediction_list = prediction.tolist()
-
-        # Prepare successful prediction response with the predictions
-        res={
-            "status":True,
-            "message":"Prediction done successfully",
-            "data":prediction_list
-        }
-        return jsonify(res)
+        invalid = handlers.check_upload(f.filename if f else None, 'test_file')
+        if invalid:
+            return respond(invalid)
+
+        # Stream predictions chunk by chunk for large files when requested
+        stream_format = request.args.get('stream')
+        if stream_format:
+            invalid = handlers.check_stream_format(stream_format)
+            if invalid:
+                return respond(invalid)
+
+            # Take ownership of the uploaded file: the request context closes its files
+            # when the view returns, before the streamed response body is generated
+            upload, f.stream = f.stream, io.BytesIO()
+
+            return Response(
+                stream_with_context(handlers.stream_predictions(upload, stream_format)),
+                mimetype=handlers.STREAM_FORMATS[stream_format]
+            )
+
+        # Parse the uploaded file and predict it
+        result = handlers.predict_csv(f)
+        with timed('serialize'):
+            return respond(result)
     
     except RequestEntityTooLarge as e:
         # Handle file size exceeding the limit
-        res = {
-            "status": False,
-            "message": "Error",
-            "data": 'File size exceeds 5 MB'
-        }
-        return res, 413
+        return respond(handlers.too_large())
+
+    except UploadSchemaError as e:
+        # Handle uploads without the expected columns
+        return respond(handlers.error(str(e)))
     
     except Exception as e:
-        error = CustomException(e,sys).error_message
-        return handle_my_error(error)
-    
+        return respond(handlers.internal_error(e))
+
 def predictJSON():
     """
     This function handles generating predictions when data is provided in JSON format through a POST request.
 
+    The body may be a single record, a list of records, or a columnar object of
+    arrays (see handlers.predict_json).
+
     Returns:
         JSON response containing the predicted values and success/error messages.
     """
     try:
-        # Get the JSON data from the request
-        data = request.json
-
-        # Check if the request has any data
-        if not data:
-            res = {
-                'status' : False,
-                'message' : 'Error',
-                'data' : 'Invalid JSON data'
-            }
-            return jsonify(res), 400
-        
-        # Define the required keys expected in the JSON data for prediction
-        required_keys = ['Month', 'Weekday', 'EUR', 
-                'JPY', 'BGN', 'CZK', 'DKK', 'GBP', 'HUF', 'PLN', 'RON', 'SEK', 'CHF', 'NOK', 'TRY', 'AUD', 'BRL', 'CAD', 'CNY', 'HKD', 'IDR', 'KRW', 'MXN', 'MYR', 'NZD', 'PHP', 'SGD', 'THB', 'ZAR',
-                'Year', 'Day']
+        result = handlers.predict_json(request.json)
+        with timed('serialize'):
+            return respond(result)
         
-        # Find any missing keys in the provided JSON data
-        missing_keys = [key for key in required_keys if key not in data]
-
-        # Check if any keys are missing from the JSON data 
-        if missing_keys:
-            res = {
-                'status': False,
-                'message' : 'Error',
-                'data': f'Missing keys in JSON data: {missing_keys}'
-            }
-            return jsonify(res), 400
-        
-        # Convert the JSON data to a pandas DataFrame
-        df = pd.DataFrame([data])
+    except Exception as e:
+        return respond(handlers.internal_error(e))
 
-        # Create a CustomDataJSON object using the DataFrame and extract the data array
-        data = CustomDataJSON(df).arr
+# Liveness probe: the process is up and handling requests
+@app.route('/health', methods=['GET'])
+def health():
+    return jsonify({"status":True, "message":"OK"})
 
-        # Use the PredictPipeline to generate predictions on the data
-        prediction = PredictPipeline().predict(data)
+# Readiness probe: healthy only once the current model has been loaded and warmed
+@app.route('/ready', methods=['GET'])
+def ready():
+    """
+    This function reports whether this process has warmed a model and can take traffic.
 
-        # Convert the prediction results to a list
-        prediction_list = prediction.tolist()
+    Returns:
+        JSON response with the serving state; 200 when ready, 503 otherwise.
+    """
+    return respond(handlers.readiness())
 
-        # Prepare successful prediction response with the predictions
-        res={
-            "status":True,
-            "message":"Prediction done successfully",
-            "data":prediction_list
-        }
+# Route exposing the metrics of this process in the Prometheus text format
+@app.route('/metrics', methods=['GET'])
+@auth # Apply authentication middleware
+def metrics():
+    """
+    This function renders per-stage latency histograms, request counters and cache statistics for scraping.
 
-        return jsonify(res)
-        
-    except Exception as e:
-        error = CustomException(e,sys).error_message
-        return handle_my_error(error)
+    Returns:
+        Prometheus text exposition of every registered metric.
+    """
+    return Response(registry.render(), mimetype='text/plain; version=0.0.4')
 
 if __name__ == "__main__":
+    # Development server; use `gunicorn -c gunicorn.conf.py wsgi:app` in production
+    serving_state.warm_up()
     app.run(debug=True,host='0.0.0.0',port=5000)
\ No newline at end of file
@@ -0,0 +1,435 @@
+"""
+ASGI entry point: the prediction and training API served from an event loop.
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5000 --workers 4
+
+The endpoints, request formats, token check and responses are the same as in
+app.py: both apps validate requests and build responses with
+src.MLProject.handlers and only differ in how they read requests. Request
+bodies are read asynchronously, so a slow client holds a connection but not a
+thread. Parsing, validation, prediction and serialization run on a bounded
+thread pool (MLPROJECT_ASGI_THREADS). NumPy, pandas and the forest release the
+GIL for most of that work, so one process can keep many connections open while
+a few threads do the CPU work. That work is admitted through the
+per-route-class limits of src.MLProject.admission once the body has been read,
+so a slow upload never holds a slot.
+
+Every uvicorn worker warms the current model at startup; /ready reports 503
+until it has. Per-request profiling (?profile=1) is only available in the
+Flask app.
+"""
+import os
+import json
+import time
+import uuid
+import asyncio
+import functools
+import contextvars
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from urllib.parse import parse_qs
+from starlette.applications import Starlette
+from starlette.datastructures import Headers, UploadFile
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+from src.MLProject import handlers
+from src.MLProject.upload_parser import UploadSchemaError
+from src.MLProject.metrics import registry, http_requests, http_request_seconds, timed
+from src.MLProject.logger import get_logger, request_id_var
+from src.MLProject.serving import serving_state
+from src.MLProject.admission import admission, AdmissionRejected, rejection_body
+from middleware import check_token
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class ASGIConfig:
+    """
+    This dataclass holds configuration settings for the ASGI app.
+    """
+
+    # Threads running parsing, validation, prediction and serialization; work beyond this waits for a thread.
+    threads:int = int(os.environ.get("MLPROJECT_ASGI_THREADS", os.cpu_count() or 4))
+
+    # Maximum request body size, as MAX_CONTENT_LENGTH in the Flask app (5 MB).
+    max_content_length:int = 5 * 1024 * 1024
+
+    # Maximum body size of streaming prediction uploads, which are processed chunk by chunk.
+    stream_max_content_length:int = int(os.environ.get("MLPROJECT_STREAM_MAX_BYTES", 8 * 1024 * 1024 * 1024))
+
+    # "full" serves training and prediction, "predict" only prediction (see handlers.APP_MODES).
+    app_mode:str = handlers.app_mode()
+
+
+config = ASGIConfig()
+
+# Bounded pool for every blocking call made on behalf of a request
+executor = ThreadPoolExecutor(max_workers=config.threads, thread_name_prefix="asgi-worker")
+
+
+class BodyTooLarge(Exception):
+    """
+    Raised while reading a request body that exceeds the size limit.
+    """
+
+
+async def run_in_pool(func, *args):
+    """
+    Runs a blocking call on the bounded thread pool without blocking the event loop.
+
+    The call runs in a copy of the caller's context, so its log records carry the request id.
+    """
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(executor, functools.partial(context.run, func, *args))
+
+
+async def run_admitted(route_class, func, *args):
+    """
+    Runs a blocking call on the thread pool once the route class's admission limit lets it in.
+
+    Request bodies are read before this is called, so a slow upload never holds a slot.
+    """
+    limiter = admission.limiter(route_class)
+    if limiter is None:
+        return await run_in_pool(func, *args)
+    async with limiter.slot_async():
+        return await run_in_pool(func, *args)
+
+
+class AdmittedResponse:
+    """
+    This class sends a response and then frees the admission slot it holds, e.g. for a streamed body.
+    """
+
+    def __init__(self, response, release):
+        self.response = response
+        self.release = release
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await self.response(scope, receive, send)
+        finally:
+            self.release()
+
+
+def rejection_response(e):
+    """
+    Builds the 429/503 response for a request the admission limits turned away.
+    """
+    return JSONResponse(rejection_body(e), e.status_code, headers={"Retry-After": str(e.retry_after)})
+
+
+def is_json(request):
+    """
+    Returns whether the request body is JSON, with the same rule as Flask's request.is_json.
+    """
+    mimetype = request.headers.get('content-type', '').split(';')[0].strip().lower()
+    return mimetype == 'application/json' or (mimetype.startswith('application/') and mimetype.endswith('+json'))
+
+
+def respond(result):
+    """
+    Turns a (body, status_code, headers) result of src.MLProject.handlers into a response.
+    """
+    body, status_code, headers = result
+    return JSONResponse(body, status_code, headers=headers)
+
+
+def json_response(result):
+    """
+    Serializes a handler result; called on the thread pool since large prediction lists take a while.
+    """
+    with timed('serialize'):
+        return respond(result)
+
+
+def error_response(e):
+    """
+    Builds the response the Flask app's CustomException handler returns.
+    """
+    return respond(handlers.internal_error(e))
+
+
+def too_large_response(message="Error"):
+    """
+    Builds the response for a body over the size limit (the training route uses the message "Error!").
+    """
+    return respond(handlers.too_large(message))
+
+
+def auth(endpoint):
+    """
+    Async counterpart of middleware.auth: the same token check and error responses.
+    """
+    @functools.wraps(endpoint)
+    async def decorated(request):
+        error = check_token(request.query_params.get("token"))
+        if error is not None:
+            res, status_code = error
+            return JSONResponse(res, status_code)
+        return await endpoint(request)
+    return decorated
+
+
+class RequestContext:
+    """
+    This class is the ASGI middleware for request ids, body size limits, request metrics and the request log.
+
+    The body limit is enforced as the body is received, so an oversized upload is
+    rejected without being buffered, whether or not it declares a Content-Length.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    @staticmethod
+    def body_limit(scope):
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        if scope["path"] == "/currencyprediction" and query.get("stream", [None])[0] in handlers.STREAM_FORMATS:
+            return config.stream_max_content_length
+        return config.max_content_length
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter()
+        headers = Headers(scope=scope)
+
+        # Tag every log record of this request with the caller's request id or a new one
+        request_id = headers.get("x-request-id") or uuid.uuid4().hex
+        request_id_var.set(request_id)
+
+        limit = self.body_limit(scope)
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise BodyTooLarge()
+            return message
+
+        async def send_with_metrics(message):
+            if message["type"] == "http.response.start":
+                # Label by route pattern (e.g. /currencytraining/{job_id}) to keep the number of series bounded
+                endpoint = ROUTE_PATHS.get(scope.get("endpoint"), "unmatched")
+                status_code = message["status"]
+                duration = time.perf_counter() - start
+                http_requests.inc(endpoint=endpoint, status=status_code)
+                http_request_seconds.observe(duration, endpoint=endpoint)
+                logger.info("Request finished", extra={
+                    "stage": "request", "endpoint": endpoint, "method": scope["method"],
+                    "status": status_code, "duration_ms": round(duration * 1000, 3),
+                })
+                message["headers"] = list(message.get("headers", [])) + [(b"x-request-id", request_id.encode("latin-1"))]
+            await send(message)
+
+        # Reject bodies that announce an oversized length before reading them
+        content_length = headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > limit:
+            return await too_large_response()(scope, receive, send_with_metrics)
+
+        await self.app(scope, limited_receive, send_with_metrics)
+
+
+async def read_csv_upload(request, field):
+    """
+    Reads a multipart upload without blocking and checks the file field like the Flask app.
+
+    Returns:
+        tuple: The parsed form and the UploadFile, or the form and an error response.
+    """
+    form = await request.form(max_files=1)
+    f = form.get(field)
+    invalid = handlers.check_upload(f.filename if isinstance(f, UploadFile) else None, field)
+    if invalid:
+        return form, respond(invalid)
+    return form, f
+
+
+def schema_error_response(e):
+    return respond(handlers.error(str(e)))
+
+
+def predict_csv(upload):
+    """
+    Parses an uploaded CSV file and predicts it. Runs on the thread pool.
+    """
+    return json_response(handlers.predict_csv(upload.file))
+
+
+def predict_json(body):
+    """
+    Decodes a JSON prediction body and predicts it. Runs on the thread pool.
+    """
+    return json_response(handlers.predict_json(json.loads(body)))
+
+
+async def stream_predictions(form, upload, stream_format):
+    """
+    Streams the predictions of an uploaded CSV file chunk by chunk, each chunk parsed and predicted on the thread pool.
+    """
+    chunks = handlers.stream_predictions(upload.file, stream_format)
+    try:
+        while True:
+            body = await run_in_pool(next, chunks, None)
+            if body is None:
+                break
+            yield body
+
+    finally:
+        chunks.close()
+        await form.close()
+
+
+@auth
+async def predict(request):
+    """
+    This function handles generating predictions from a JSON body or an uploaded CSV file, as /currencyprediction in app.py.
+    """
+    form = None
+    streaming = False
+    try:
+        if is_json(request):
+            return await run_admitted('predict', predict_json, await request.body())
+
+        form, upload = await read_csv_upload(request, 'test_file')
+        if isinstance(upload, Response):
+            return upload
+
+        # Stream predictions chunk by chunk for large files when requested
+        stream_format = request.query_params.get('stream')
+        if stream_format:
+            invalid = handlers.check_stream_format(stream_format)
+            if invalid:
+                return respond(invalid)
+
+            # The whole stream runs under one prediction slot
+            limiter = admission.limiter('predict')
+            if limiter is not None:
+                await limiter.acquire_async()
+            streaming = True
+            response = StreamingResponse(stream_predictions(form, upload, stream_format), media_type=handlers.STREAM_FORMATS[stream_format])
+            return AdmittedResponse(response, limiter.release) if limiter is not None else response
+
+        return await run_admitted('predict', predict_csv, upload)
+
+    except BodyTooLarge:
+        return too_large_response()
+
+    except AdmissionRejected as e:
+        return rejection_response(e)
+
+    except UploadSchemaError as e:
+        return schema_error_response(e)
+
+    except Exception as e:
+        return error_response(e)
+
+    finally:
+        if form is not None and not streaming:
+            await form.close()
+
+
+def train_csv(upload, mode):
+    """
+    Parses an uploaded training CSV file and queues a job for it. Runs on the thread pool.
+    """
+    return respond(handlers.train_csv(upload.file, mode))
+
+
+def train_json(body, mode):
+    """
+    Decodes JSON training rows, validates them and queues a job for them. Runs on the thread pool.
+    """
+    return respond(handlers.train_json(json.loads(body), mode))
+
+
+@auth
+async def train(request):
+    """
+    This function handles training from an uploaded CSV file or JSON rows, as /currencytraining in app.py.
+    """
+    form = None
+    try:
+        # JSON training defaults to incremental mode, file uploads to full training
+        if is_json(request):
+            return await run_admitted('training', train_json, await request.body(), request.query_params.get('mode', 'incremental'))
+
+        form, upload = await read_csv_upload(request, 'train_file')
+        if isinstance(upload, Response):
+            return upload
+
+        return await run_admitted('training', train_csv, upload, request.query_params.get('mode', 'full'))
+
+    except BodyTooLarge:
+        return too_large_response("Error!")
+
+    except AdmissionRejected as e:
+        return rejection_response(e)
+
+    except UploadSchemaError as e:
+        return schema_error_response(e)
+
+    except Exception as e:
+        return error_response(e)
+
+    finally:
+        if form is not None:
+            await form.close()
+
+
+@auth
+async def training_status(request):
+    """
+    This function reports the status and result of a training job, as /currencytraining/<job_id> in app.py.
+    """
+    return respond(handlers.training_status(request.path_params['job_id']))
+
+
+# Liveness probe: the process is up and handling requests
+async def health(request):
+    return JSONResponse({"status":True, "message":"OK"})
+
+
+# Readiness probe: healthy only once the current model has been loaded and warmed
+async def ready(request):
+    return respond(handlers.readiness())
+
+
+@auth
+async def metrics(request):
+    return Response(registry.render(), media_type='text/plain; version=0.0.4')
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Warm the current model before the server accepts connections
+    await run_in_pool(serving_state.warm_up)
+    yield
+    executor.shutdown(wait=False)
+
+
+routes = [
+    Route('/currencyprediction', predict, methods=['POST']),
+    Route('/health', health, methods=['GET']),
+    Route('/ready', ready, methods=['GET']),
+    Route('/metrics', metrics, methods=['GET']),
+]
+
+# Prediction-only processes do not expose the training routes at all
+if config.app_mode == 'full':
+    routes += [
+        Route('/currencytraining', train, methods=['POST']),
+        Route('/currencytraining/{job_id}', training_status, methods=['GET']),
+    ]
+
+# Route pattern of each endpoint, used as the metrics label
+ROUTE_PATHS = {route.endpoint: route.path for route in routes}
+
+app = RequestContext(Starlette(routes=routes, lifespan=lifespan))
@@ -0,0 +1,72 @@
+"""
+Compares the storage formats of the dataset artifacts (raw/train/test/dataset).
+
+    python benchmarks/bench_artifact_formats.py --scale 100 --repeat 3
+
+For every format it reports the write time, the time of a full read, of a read
+of a few columns and (where supported) of a memory-mapped read, and the size
+on disk. parquet and feather need pyarrow and are skipped without it.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from src.MLProject.dataset_io import ARTIFACT_FORMATS, artifact_path, read_dataset, write_dataset
+
+# Columns read by the "columns" measurement
+SELECTED_COLUMNS = ["Date", "EUR", "GBP", "INR"]
+
+
+def _size_bytes(path):
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+    return os.path.getsize(path)
+
+
+def _best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return round(min(timings), 4)
+
+
+def run(df, fmt, artifacts_dir, repeat):
+    path = artifact_path(os.path.join(artifacts_dir, "dataset.csv"), fmt)
+    columns = [column for column in SELECTED_COLUMNS if column in df.columns]
+
+    result = {"format": fmt, "rows": len(df)}
+    result["write_s"] = _best_of(repeat, lambda: write_dataset(df, path))
+    result["read_s"] = _best_of(repeat, lambda: read_dataset(path))
+    result["read_columns_s"] = _best_of(repeat, lambda: read_dataset(path, columns=columns))
+    if fmt in ("feather", "npy"):
+        result["read_mmap_s"] = _best_of(repeat, lambda: read_dataset(path, mmap=True))
+    result["size_mb"] = round(_size_bytes(path) / 2**20, 2)
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default=os.path.join("artifacts", "raw.csv"))
+    parser.add_argument("--scale", type=int, default=1, help="repeat the dataset this many times")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = pd.concat([pd.read_csv(args.data)] * args.scale, ignore_index=True)
+    artifacts_dir = tempfile.mkdtemp(prefix="bench-formats-")
+    try:
+        for fmt in ARTIFACT_FORMATS:
+            try:
+                print(json.dumps(run(df, fmt, artifacts_dir, args.repeat)))
+            except Exception as e:
+                print(json.dumps({"format": fmt, "skipped": str(e).splitlines()[0]}))
+    finally:
+        shutil.rmtree(artifacts_dir, ignore_errors=True)
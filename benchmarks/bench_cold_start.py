@@ -0,0 +1,111 @@
+"""
+Measures how long a fresh serving process takes to become ready, and its memory once it is.
+
+    python benchmarks/bench_cold_start.py --repeat 5
+
+Every run starts a new interpreter that imports app.py (as a gunicorn worker
+importing wsgi.py does), warms the current model and serves one JSON prediction
+through the test client. It reports, as the median over the runs:
+
+    import_s      importing app.py
+    warmup_s      loading the current model and predicting the warm-up rows
+    first_s       the first prediction request after warm-up
+    ready_s       interpreter start until warmed up (what a readiness probe waits for)
+    rss_mb        resident set size of the ready process
+    pss_mb        proportional set size (shared pages split between the processes mapping them)
+    modules       modules loaded; "training_loaded" tells whether the training code was imported
+
+Modes (MLPROJECT_APP_MODE) and engines (MLPROJECT_PREDICT_ENGINE):
+    full / predict        training routes served or not; training code is imported lazily in both
+    sklearn / compiled    the compiled engine maps compiled.pkl and never imports scikit-learn
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the measured interpreter; prints one JSON line
+PROBE = r"""
+import time
+start = time.perf_counter()
+import sys
+import app
+imported = time.perf_counter()
+from src.MLProject.serving import serving_state
+if not serving_state.warm_up():
+    sys.exit(serving_state.error)
+warmed = time.perf_counter()
+
+from src.MLProject.schema import FEATURE_COLUMNS
+record = {column: 1.0 for column in FEATURE_COLUMNS}
+response = app.app.test_client().post("/currencyprediction?token=toA72nrlQAHlBU7", json=record)
+assert response.status_code == 200, response.get_data(as_text=True)
+first = time.perf_counter()
+
+usage = {}
+with open("/proc/self/smaps_rollup") as file_obj:
+    for line in file_obj:
+        parts = line.split()
+        if parts[0] in ("Rss:", "Pss:"):
+            usage[parts[0][:-1].lower()] = int(parts[1]) / 1024
+
+import json
+print(json.dumps({
+    "import_s": imported - start,
+    "warmup_s": warmed - imported,
+    "first_s": first - warmed,
+    "ready_s": warmed - start,
+    "rss_mb": usage.get("rss"),
+    "pss_mb": usage.get("pss"),
+    "modules": len(sys.modules),
+    "training_loaded": "src.MLProject.pipelines.training_pipeline" in sys.modules,
+    "sklearn_loaded": "sklearn" in sys.modules,
+}))
+"""
+
+
+def run_once(mode, engine, log_dir):
+    env = dict(
+        os.environ,
+        PYTHONPATH=ROOT,
+        MLPROJECT_APP_MODE=mode,
+        MLPROJECT_PREDICT_ENGINE=engine,
+        MLPROJECT_LOG_DIR=log_dir,
+        MLPROJECT_PREDICTION_CACHE="0",
+    )
+    out = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT, env=env, capture_output=True, text=True)
+    if out.returncode != 0:
+        raise RuntimeError(f"{mode}/{engine} failed:\n{out.stderr or out.stdout}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def run(mode, engine, repeat, log_dir):
+    runs = [run_once(mode, engine, log_dir) for _ in range(repeat)]
+    result = {"mode": mode, "engine": engine, "runs": repeat}
+    for key in ("import_s", "warmup_s", "first_s", "ready_s", "rss_mb", "pss_mb", "modules"):
+        values = [r[key] for r in runs if r[key] is not None]
+        result[key] = round(statistics.median(values), 4 if key.endswith("_s") else 1) if values else None
+    result["training_loaded"] = any(r["training_loaded"] for r in runs)
+    result["sklearn_loaded"] = any(r["sklearn_loaded"] for r in runs)
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="*", default=["full", "predict"])
+    parser.add_argument("--engines", nargs="*", default=["sklearn", "compiled"])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # One untimed run per engine first, so every measured run starts with a warm page cache
+    with tempfile.TemporaryDirectory() as log_dir:
+        for engine in args.engines:
+            run_once(args.modes[0], engine, log_dir)
+        for mode in args.modes:
+            for engine in args.engines:
+                print(json.dumps(run(mode, engine, args.repeat, log_dir)))
@@ -0,0 +1,109 @@
+"""
+Measures the cost of a log call on the request path.
+
+    python benchmarks/bench_logging.py --records 50000 --threads 1 4 16
+
+Modes:
+    disabled    logger below its level: the call returns after the level check
+    queue       the logging subsystem: NonBlockingQueueHandler + background JSON writer
+    sync        a RotatingFileHandler with the same JSON formatter, written on the calling thread
+
+Every thread logs records with the request id, stage and duration fields a request
+logs. The report gives the per-call latency percentiles seen by the callers, the
+throughput, and for the queue mode the records dropped because the queue was full.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from src.MLProject import logger as mlproject_logger
+from src.MLProject.logger import LoggingConfig, JsonFormatter, request_id_var
+
+
+def _log_records(log, records, latencies):
+    request_id_var.set(f"bench-{threading.get_ident()}")
+    extra = {"stage": "predict", "duration_ms": 1.234, "endpoint": "/currencyprediction"}
+    for i in range(records):
+        start = time.perf_counter_ns()
+        log.info("Request finished", extra=extra)
+        latencies.append(time.perf_counter_ns() - start)
+
+
+def run(mode, log_dir, records, threads):
+    log = logging.getLogger(f"bench.{mode}.{threads}")
+    log.propagate = False
+    log.setLevel(logging.INFO)
+    handler = None
+
+    if mode == "disabled":
+        log.setLevel(logging.WARNING)
+    elif mode == "sync":
+        handler = logging.handlers.RotatingFileHandler(os.path.join(log_dir, f"sync-{threads}.log"),
+                                                       maxBytes=10 * 1024 * 1024, backupCount=2)
+        handler.setFormatter(JsonFormatter())
+        log.addHandler(handler)
+    else:
+        log.addHandler(mlproject_logger._state["handler"])
+
+    dropped_before = mlproject_logger.dropped_records()
+    per_thread = [[] for _ in range(threads)]
+    workers = [threading.Thread(target=_log_records, args=(log, records // threads, per_thread[i])) for i in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    # Time until the writer thread has caught up, i.e. the real I/O cost moved off the callers
+    drain_start = time.perf_counter()
+    if mode == "queue":
+        mlproject_logger._state["listener"].queue.join()
+    drain = time.perf_counter() - drain_start
+
+    if handler is not None:
+        log.removeHandler(handler)
+        handler.close()
+    log.handlers.clear()
+
+    latencies = np.concatenate([np.array(values) for values in per_thread]) / 1000
+    p50, p99, p999 = np.percentile(latencies, [50, 99, 99.9])
+    return {
+        "mode": mode,
+        "threads": threads,
+        "records": len(latencies),
+        "p50_us": round(float(p50), 2),
+        "p99_us": round(float(p99), 2),
+        "p999_us": round(float(p999), 2),
+        "max_us": round(float(latencies.max()), 2),
+        "calls_per_s": round(len(latencies) / elapsed, 1),
+        "drain_s": round(drain, 3),
+        "dropped": mlproject_logger.dropped_records() - dropped_before,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=50000)
+    parser.add_argument("--threads", type=int, nargs="*", default=[1, 4, 16])
+    parser.add_argument("--queue-size", type=int, default=LoggingConfig.queue_size)
+    args = parser.parse_args()
+
+    log_dir = tempfile.mkdtemp(prefix="bench-logging-")
+    try:
+        mlproject_logger.configure_logging(LoggingConfig(log_dir=log_dir, queue_size=args.queue_size))
+        for threads in args.threads:
+            for mode in ("disabled", "queue", "sync"):
+                print(json.dumps(run(mode, log_dir, args.records, threads)), flush=True)
+    finally:
+        mlproject_logger.shutdown_logging()
+        shutil.rmtree(log_dir, ignore_errors=True)
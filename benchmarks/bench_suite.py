@@ -0,0 +1,222 @@
+"""
+Benchmark suite for the training and prediction pipeline.
+
+Measures DataIngestion, DataTransformation, ModelTrainer and PredictPipeline
+separately, on artifacts/raw.csv and on synthetic datasets scaled from it, and
+prediction over a range of batch sizes. Every result reports latency
+percentiles, throughput and the peak traced memory of one extra run.
+
+    python benchmarks/bench_suite.py
+    python benchmarks/bench_suite.py --scales 1 10 100 1000 --train-scales 1 10 \\
+        --batch-sizes 1 10 100 1000 10000 100000
+    python benchmarks/bench_suite.py --save-baseline benchmarks/baselines/ci.json
+    python benchmarks/bench_suite.py --compare benchmarks/baselines/ci.json --tolerance 0.25
+
+--compare exits with status 1 when the p50 latency of any benchmark present in
+the baseline got slower by more than the tolerance. Baselines are only
+comparable on the same machine.
+
+Every stage runs in a scratch working directory, so the artifacts/ folder and
+model registry of the checkout are never modified. The prediction result cache
+is disabled so the model itself is measured. Peak memory comes from tracemalloc:
+it covers Python and NumPy allocations of this process, but not of the joblib
+workers used by the hyperparameter search.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pandas as pd
+import sklearn
+from src.MLProject.schema import TRAINING_COLUMNS
+from src.MLProject.components.data_ingestion import DataIngestion
+from src.MLProject.components.data_transformation import DataTransformation
+from src.MLProject.components.model_trainer import ModelTrainer
+from src.MLProject.pipelines.prediction_pipeline import PredictPipeline
+from src.MLProject.prediction_cache import prediction_cache
+
+# Columns that are not exchange rates and get no synthetic noise
+NON_RATE_COLUMNS = ("Month", "Weekday", "Date", "INR")
+
+
+def make_dataset(base, scale, seed=0):
+    """
+    Builds a synthetic dataset of scale times the base rows: the first copy is the
+    base data, every further copy has the rates and target jittered by ~1%.
+    """
+    if scale == 1:
+        return base.copy()
+    rng = np.random.default_rng(seed)
+    df = pd.concat([base] * scale, ignore_index=True)
+    noisy = [column for column in df.columns if column not in NON_RATE_COLUMNS] + ["INR"]
+    jitter = 1 + rng.normal(0, 0.01, size=(len(df), len(noisy)))
+    jitter[:len(base)] = 1
+    df[noisy] = df[noisy].to_numpy() * jitter
+    return df
+
+
+def measure(name, fn, repeat, rows, memory=True, **labels):
+    """
+    Runs fn repeat times for latency and once more under tracemalloc for peak memory.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    result = {"benchmark": name, **labels, "rows": rows, "repeat": repeat}
+    p50, p95, p99 = np.percentile(timings, [50, 95, 99])
+    result.update({
+        "p50_ms": round(p50 * 1000, 3),
+        "p95_ms": round(p95 * 1000, 3),
+        "p99_ms": round(p99 * 1000, 3),
+        "mean_ms": round(float(np.mean(timings)) * 1000, 3),
+        "throughput_rows_s": round(rows / p50, 1) if p50 > 0 else None,
+    })
+
+    if memory:
+        tracemalloc.start()
+        fn()
+        result["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+        tracemalloc.stop()
+
+    print(json.dumps(result), flush=True)
+    return result
+
+
+def key_of(result):
+    """
+    Identifies a benchmark across runs, e.g. "predict[engine=sklearn,batch=100]".
+    """
+    labels = ",".join(f"{k}={result[k]}" for k in ("engine", "scale", "batch") if k in result)
+    return f"{result['benchmark']}[{labels}]"
+
+
+def run_suite(base, args):
+    results = []
+    frames = {}
+
+    for scale in args.scales:
+        df = make_dataset(base, scale)
+
+        ingestion = DataIngestion()
+        ingestion.ingestion_config.async_artifacts = False
+        results.append(measure("ingestion", lambda: ingestion.initiate_data_ingestion(df),
+                               args.repeat, len(df), not args.no_memory, scale=scale))
+
+        train_set, test_set = ingestion.split_data(df)
+        transformation = DataTransformation()
+        results.append(measure("transformation", lambda: transformation.initiate_data_transormation(train_set, test_set),
+                               args.repeat, len(df), not args.no_memory, scale=scale))
+        frames[scale] = transformation.initiate_data_transormation(train_set, test_set)
+
+    # Training publishes to the scratch registry; the last trained model is used for prediction
+    for scale in args.train_scales:
+        if scale not in frames:
+            train_set, test_set = DataIngestion().split_data(make_dataset(base, scale))
+            frames[scale] = DataTransformation().initiate_data_transormation(train_set, test_set)
+        train_arr, test_arr = frames[scale]
+        results.append(measure("training", lambda: ModelTrainer().initiate_model_trainer(train_arr, test_arr),
+                               args.train_repeat, len(train_arr) + len(test_arr), not args.no_memory, scale=scale))
+
+    if not args.batch_sizes:
+        return results
+    if not args.train_scales:
+        sys.exit("Prediction needs a trained model: pass at least one --train-scales value")
+
+    # Tile the held-out features up to the largest batch
+    features = frames[args.train_scales[-1]][1][:, :-1]
+    features = np.resize(features, (max(args.batch_sizes), features.shape[1]))
+
+    prediction_cache.config.enabled = False
+    for engine in args.engines:
+        pipeline = PredictPipeline(engine=engine)
+        pipeline.predict(features[:1])
+        for batch in args.batch_sizes:
+            repeat = args.predict_repeat or max(3, min(200, 100000 // batch))
+            results.append(measure("predict", lambda: pipeline.predict(features[:batch]),
+                                   repeat, batch, not args.no_memory, engine=engine, batch=batch))
+
+    return results
+
+
+def compare(results, baseline_path, tolerance):
+    """
+    Prints the benchmarks whose p50 latency regressed beyond tolerance and returns how many did.
+    """
+    with open(baseline_path) as file_obj:
+        baseline = {key_of(result): result for result in json.load(file_obj)["results"]}
+
+    regressions = 0
+    for result in results:
+        base = baseline.get(key_of(result))
+        if base is None or not base["p50_ms"]:
+            continue
+        ratio = result["p50_ms"] / base["p50_ms"]
+        if ratio > 1 + tolerance:
+            regressions += 1
+            print(json.dumps({"regression": key_of(result), "baseline_p50_ms": base["p50_ms"],
+                              "p50_ms": result["p50_ms"], "ratio": round(ratio, 3)}))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default=os.path.join("artifacts", "raw.csv"))
+    parser.add_argument("--scales", type=int, nargs="*", default=[1, 10], help="dataset scales for ingestion and transformation")
+    parser.add_argument("--train-scales", type=int, nargs="*", default=[1], help="dataset scales for training")
+    parser.add_argument("--batch-sizes", type=int, nargs="*", default=[1, 10, 100, 1000, 10000])
+    parser.add_argument("--engines", nargs="*", default=["sklearn", "compiled"])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--train-repeat", type=int, default=1)
+    parser.add_argument("--predict-repeat", type=int, default=None, help="defaults to 3-200 depending on the batch size")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--save-baseline", default=None)
+    parser.add_argument("--compare", default=None)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    data_path = os.path.abspath(args.data)
+    base = pd.read_csv(data_path)[TRAINING_COLUMNS]
+    baseline_paths = [os.path.abspath(path) if path else None for path in (args.save_baseline, args.compare)]
+
+    scratch = tempfile.mkdtemp(prefix="bench-suite-")
+    cwd = os.getcwd()
+    try:
+        os.chdir(scratch)
+        results = run_suite(base, args)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    save_path, compare_path = baseline_paths
+    if save_path:
+        os.makedirs(os.path.dirname(save_path) or ".", exist_ok=True)
+        with open(save_path, "w") as file_obj:
+            json.dump({
+                "meta": {
+                    "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "data": os.path.relpath(data_path, ROOT),
+                    "python": platform.python_version(),
+                    "numpy": np.__version__,
+                    "pandas": pd.__version__,
+                    "sklearn": sklearn.__version__,
+                    "cpu_count": os.cpu_count(),
+                    "machine": platform.machine(),
+                },
+                "results": results,
+            }, file_obj, indent=2)
+
+    if compare_path and compare(results, compare_path, args.tolerance):
+        sys.exit(1)
@@ -0,0 +1,68 @@
+"""
+Compares the data handoff between the ingestion and transformation stages.
+
+    python benchmarks/bench_training_stages.py --repeat 5 --scale 10
+
+Modes:
+    disk      initiate_data_ingestion writes raw/train/test CSVs, transformation reads them back
+    memory    split_data hands the DataFrames over, CSV artifacts are written in the background
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from src.MLProject.components.data_ingestion import DataIngestion
+from src.MLProject.components.data_transformation import DataTransformation
+
+
+def run_once(df, mode, artifacts_dir):
+    ingestion = DataIngestion()
+    ingestion.ingestion_config.raw_data_path = os.path.join(artifacts_dir, "raw.csv")
+    ingestion.ingestion_config.train_data_path = os.path.join(artifacts_dir, "train.csv")
+    ingestion.ingestion_config.test_data_path = os.path.join(artifacts_dir, "test.csv")
+
+    start = time.perf_counter()
+    if mode == "disk":
+        train_data, test_data = ingestion.initiate_data_ingestion(df)
+    else:
+        train_data, test_data = ingestion.split_data(df)
+    ingested = time.perf_counter()
+
+    DataTransformation().initiate_data_transormation(train_data, test_data)
+    transformed = time.perf_counter()
+
+    # Not part of the critical path in memory mode, but wait so runs do not overlap
+    if ingestion.pending_write is not None:
+        ingestion.pending_write.result()
+
+    return ingested - start, transformed - ingested
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default=os.path.join("artifacts", "raw.csv"))
+    parser.add_argument("--scale", type=int, default=1, help="repeat the dataset this many times")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    df = pd.concat([pd.read_csv(args.data)] * args.scale, ignore_index=True)
+    artifacts_dir = tempfile.mkdtemp(prefix="bench-artifacts-")
+    try:
+        for mode in ("disk", "memory"):
+            runs = [run_once(df, mode, artifacts_dir) for _ in range(args.repeat)]
+            print(json.dumps({
+                "mode": mode,
+                "rows": len(df),
+                "ingestion_ms": round(min(r[0] for r in runs) * 1000, 2),
+                "transformation_ms": round(min(r[1] for r in runs) * 1000, 2),
+                "total_ms": round(min(r[0] + r[1] for r in runs) * 1000, 2),
+            }))
+    finally:
+        shutil.rmtree(artifacts_dir, ignore_errors=True)
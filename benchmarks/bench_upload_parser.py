@@ -0,0 +1,71 @@
+"""
+Compares parsing an uploaded CSV file the old way and with read_upload.
+
+    python benchmarks/bench_upload_parser.py --scale 100
+
+Modes:
+    string        decode the upload into a str, copy it through StringIO and let pandas infer dtypes
+    read_upload   parse the bytes stream against the training schema with explicit dtypes
+
+Peak memory is the tracemalloc peak while parsing, relative to the size of the upload.
+"""
+import os
+import sys
+import io
+import json
+import time
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from src.MLProject.schema import TRAINING_COLUMNS, TRAINING_DATE_FORMAT
+from src.MLProject.upload_parser import read_upload, UploadParserConfig
+
+
+def parse_string(payload):
+    stream = io.StringIO(payload.read().decode("UTF8"), newline=None)
+    stream.seek(0)
+    result = stream.read()
+    return pd.read_csv(io.StringIO(result))
+
+
+def run(mode, data, engine):
+    payload = io.BytesIO(data)
+    tracemalloc.start()
+    start = time.perf_counter()
+    if mode == "string":
+        df = parse_string(payload)
+    else:
+        df = read_upload(payload, TRAINING_COLUMNS, (TRAINING_DATE_FORMAT,), config=UploadParserConfig(engine=engine))
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "mode": mode if mode == "string" else f"{mode}[{engine}]",
+        "rows": len(df),
+        "seconds": round(seconds, 4),
+        "upload_mb": round(len(data) / 2**20, 2),
+        "peak_mb": round(peak / 2**20, 2),
+        "frame_mb": round(df.memory_usage(deep=True).sum() / 2**20, 2),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default=os.path.join("artifacts", "raw.csv"))
+    parser.add_argument("--scale", type=int, default=10, help="repeat the dataset this many times")
+    args = parser.parse_args()
+
+    with open(args.data, "rb") as file_obj:
+        header = file_obj.readline()
+        body = file_obj.read()
+    data = header + body * args.scale
+
+    print(json.dumps(run("string", data, None)))
+    for engine in ("c", "pyarrow"):
+        try:
+            print(json.dumps(run("read_upload", data, engine)))
+        except ImportError as e:
+            print(json.dumps({"mode": f"read_upload[{engine}]", "skipped": str(e)}))
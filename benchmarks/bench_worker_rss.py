@@ -0,0 +1,86 @@
+"""
+Measures per-worker memory when several serving processes load the current model.
+
+Each mode starts N fresh processes that load the model and run one prediction,
+then all of them report memory while still alive, so shared pages are split
+between them in the proportional set size (PSS).
+
+    python benchmarks/bench_worker_rss.py --workers 4
+
+Modes:
+    sklearn           load_object(model.pkl): every worker unpickles its own forest
+    compiled-mmap     compiled.pkl loaded with mmap_mode="r": tree arrays shared via the page cache
+"""
+import os
+import sys
+import json
+import argparse
+import multiprocessing as mp
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _memory_kb():
+    """
+    Returns the resident and proportional set size of this process in kB.
+    """
+    usage = {}
+    with open("/proc/self/smaps_rollup") as file_obj:
+        for line in file_obj:
+            parts = line.split()
+            if parts[0] in ("Rss:", "Pss:"):
+                usage[parts[0][:-1].lower()] = int(parts[1])
+    return usage
+
+
+def _worker(mode, model_path, barrier, results):
+    import numpy as np
+    from src.MLProject.utils import load_object
+    from src.MLProject.compiled_forest import COMPILED_FILE_NAME
+
+    if mode == "sklearn":
+        model = load_object(model_path)
+    else:
+        model = load_object(os.path.join(os.path.dirname(model_path), COMPILED_FILE_NAME), mmap_mode="r")
+
+    # Touch every tree once so the pages a real worker would use are resident
+    model.predict(np.zeros((64, model.n_features_in_ if mode == "sklearn" else model.n_features)))
+
+    barrier.wait()
+    results.put(_memory_kb())
+    barrier.wait()
+
+
+def run(mode, model_path, workers):
+    ctx = mp.get_context("spawn")
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    procs = [ctx.Process(target=_worker, args=(mode, model_path, barrier, results)) for _ in range(workers)]
+    for proc in procs:
+        proc.start()
+    usage = [results.get() for _ in procs]
+    for proc in procs:
+        proc.join()
+    return {
+        "mode": mode,
+        "workers": workers,
+        "rss_mb_per_worker": round(sum(u["rss"] for u in usage) / workers / 1024, 1),
+        "pss_mb_per_worker": round(sum(u["pss"] for u in usage) / workers / 1024, 1),
+        "pss_mb_total": round(sum(u["pss"] for u in usage) / 1024, 1),
+    }
+
+
+if __name__ == "__main__":
+    from src.MLProject.model_registry import model_registry
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--model", default=None, help="model.pkl of a published version (defaults to the current one)")
+    args = parser.parse_args()
+
+    model_path = args.model or model_registry.current_model_path()
+    if model_path is None:
+        sys.exit("No published model version; train one first")
+
+    for mode in ("sklearn", "compiled-mmap"):
+        print(json.dumps(run(mode, model_path, args.workers)))
@@ -0,0 +1,313 @@
+"""
+Load generator that replays recorded or synthesized traffic against the app.
+
+    python benchmarks/load_test.py --concurrency 8 --requests 2000
+    python benchmarks/load_test.py --url http://localhost:5000 --concurrency 32 --rate 200 --duration 60
+    python benchmarks/load_test.py --mix predict-json=8,predict-batch=1,predict-csv=1 --record traffic.jsonl
+    python benchmarks/load_test.py --capture traffic.jsonl --url http://localhost:5000
+
+Targets:
+    default       Flask's test client in this process (one client per worker thread)
+    --url         a running server, e.g. the dev server, gunicorn or a load balancer
+
+Traffic comes from a capture file (--capture) or is synthesized from artifacts/test.csv
+(--mix). A capture is JSON lines, one request per line:
+
+    {"method": "POST", "path": "/currencyprediction", "args": {"stream": "csv"},
+     "json": {...}}                                  # JSON body
+    {"method": "POST", "path": "/currencytraining", "args": {"mode": "full"},
+     "file": {"field": "train_file", "name": "train.csv", "content": "Month,..."}}
+
+An optional "kind" labels the request in the per-endpoint breakdown (synthesized requests
+use their kind). The token query parameter is added to every request. Lines without "method" and
+"path" are skipped, so --record output can be replayed as is.
+
+Without --rate the workers send back to back (closed loop). With --rate requests are
+scheduled at a fixed arrival rate (open loop) and latency is measured from the
+scheduled time, so queueing in front of a saturated server shows up in the percentiles.
+Errors are transport failures, non-2xx responses and JSON bodies with "status": false.
+"""
+import os
+import sys
+import io
+import json
+import time
+import uuid
+import random
+import argparse
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pandas as pd
+
+# Synthesized request kinds and their default weights
+DEFAULT_MIX = "predict-json=8,predict-batch=1,predict-csv=1"
+
+
+def synthesize(kind, test_df, rng, batch_rows):
+    """
+    Builds one request of the given kind from rows of the test dataset.
+    """
+    rows = test_df.sample(n=batch_rows if kind in ("predict-batch", "predict-csv", "train-csv") else 1,
+                          random_state=rng.integers(1 << 31))
+    dates = pd.to_datetime(rows["Date"], format="%Y-%m-%d")
+
+    if kind in ("predict-json", "predict-batch"):
+        features = rows.drop(columns=["Date", "INR"]).rename(columns={"CNH": "CNY"})
+        features = features.assign(Year=dates.dt.year, Day=dates.dt.day)
+        records = json.loads(features.to_json(orient="records"))
+        body = records[0] if kind == "predict-json" else records
+        return {"kind": kind, "method": "POST", "path": "/currencyprediction", "json": body}
+
+    if kind == "predict-csv":
+        upload = rows.drop(columns=["INR"]).assign(Date=dates.dt.strftime("%d-%m-%Y"))
+        return {"kind": kind, "method": "POST", "path": "/currencyprediction",
+                "file": {"field": "test_file", "name": "test.csv", "content": upload.to_csv(index=False)}}
+
+    if kind == "train-json":
+        return {"kind": kind, "method": "POST", "path": "/currencytraining", "args": {"mode": "incremental"},
+                "json": json.loads(rows.to_json(orient="records"))}
+
+    if kind == "train-csv":
+        return {"kind": kind, "method": "POST", "path": "/currencytraining", "args": {"mode": "incremental"},
+                "file": {"field": "train_file", "name": "train.csv", "content": rows.to_csv(index=False)}}
+
+    raise ValueError(f"Unknown request kind: {kind}")
+
+
+def load_capture(path):
+    """
+    Reads the requests of a capture file, skipping lines that are not requests.
+    """
+    requests, skipped = [], 0
+    with open(path) as file_obj:
+        for line in file_obj:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if isinstance(record, dict) and "method" in record and "path" in record:
+                requests.append(record)
+            else:
+                skipped += 1
+    if not requests:
+        sys.exit(f"{path} contains no requests (skipped {skipped} lines without method/path)")
+    return requests, skipped
+
+
+def _encode_multipart(file_spec):
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="{file_spec["field"]}"; filename="{file_spec["name"]}"\r\n'
+        "Content-Type: text/csv\r\n\r\n"
+        f'{file_spec["content"]}\r\n'
+        f"--{boundary}--\r\n"
+    ).encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+class HttpTarget:
+    """
+    Sends requests to a running server with urllib.
+    """
+
+    def __init__(self, url, token, timeout):
+        self.url = url.rstrip("/")
+        self.token = token
+        self.timeout = timeout
+
+    def send(self, spec):
+        args = dict(spec.get("args") or {}, token=self.token)
+        url = f"{self.url}{spec['path']}?{urllib.parse.urlencode(args)}"
+        if "file" in spec:
+            data, content_type = _encode_multipart(spec["file"])
+        elif "json" in spec:
+            data, content_type = json.dumps(spec["json"]).encode(), "application/json"
+        else:
+            data, content_type = None, None
+
+        req = urllib.request.Request(url, data=data, method=spec["method"])
+        if content_type:
+            req.add_header("Content-Type", content_type)
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+
+class TestClientTarget:
+    """
+    Sends requests through Flask's test client, one client per thread.
+    """
+
+    def __init__(self, token):
+        from app import app
+        self.app = app
+        self.token = token
+        self._local = threading.local()
+
+    def send(self, spec):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+
+        kwargs = {"query_string": dict(spec.get("args") or {}, token=self.token)}
+        if "file" in spec:
+            file_spec = spec["file"]
+            kwargs["data"] = {file_spec["field"]: (io.BytesIO(file_spec["content"].encode()), file_spec["name"])}
+            kwargs["content_type"] = "multipart/form-data"
+        elif "json" in spec:
+            kwargs["json"] = spec["json"]
+
+        response = client.open(spec["path"], method=spec["method"], **kwargs)
+        return response.status_code, response.get_data()
+
+
+def _is_error(status, body):
+    if not 200 <= status < 300:
+        return True
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        # Streamed CSV/NDJSON responses are not a single JSON document
+        return False
+    return isinstance(payload, dict) and payload.get("status") is False
+
+
+def run_load(target, requests, concurrency, total, duration, rate):
+    """
+    Sends requests from concurrency worker threads and collects one sample per request.
+
+    Returns:
+        tuple: The samples (endpoint, latency seconds, error flag) and the wall-clock seconds.
+    """
+    samples = []
+    lock = threading.Lock()
+    counter = {"next": 0}
+    start = time.perf_counter()
+    deadline = start + duration if duration else None
+
+    def next_index():
+        with lock:
+            index = counter["next"]
+            if total is not None and index >= total:
+                return None
+            counter["next"] += 1
+            return index
+
+    def worker():
+        while True:
+            index = next_index()
+            if index is None:
+                return
+
+            # Open loop: wait for this request's scheduled send time
+            scheduled = start + index / rate if rate else time.perf_counter()
+            now = time.perf_counter()
+            if deadline is not None and max(now, scheduled) >= deadline:
+                return
+            if scheduled > now:
+                time.sleep(scheduled - now)
+
+            spec = requests[index % len(requests)]
+            sent = scheduled if rate else time.perf_counter()
+            try:
+                status, body = target.send(spec)
+                error = _is_error(status, body)
+            except Exception:
+                error = True
+            latency = time.perf_counter() - sent
+
+            key = spec.get("kind") or f"{spec['method']} {spec['path']}"
+            with lock:
+                samples.append((key, latency, error))
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - start
+
+
+def summarize(samples, elapsed):
+    """
+    Computes latency percentiles, error rate and throughput overall and per request kind or endpoint.
+    """
+    def stats(group):
+        latencies = np.array([latency for _, latency, _ in group]) * 1000
+        errors = sum(error for _, _, error in group)
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (0, 0, 0)
+        return {
+            "requests": len(group),
+            "errors": errors,
+            "error_rate": round(errors / len(group), 4) if group else 0.0,
+            "throughput_rps": round(len(group) / elapsed, 1) if elapsed else None,
+            "p50_ms": round(float(p50), 3),
+            "p95_ms": round(float(p95), 3),
+            "p99_ms": round(float(p99), 3),
+            "max_ms": round(float(latencies.max()), 3) if len(latencies) else 0.0,
+        }
+
+    by_endpoint = defaultdict(list)
+    for sample in samples:
+        by_endpoint[sample[0]].append(sample)
+
+    report = {"elapsed_s": round(elapsed, 3), **stats(samples)}
+    report["endpoints"] = {key: stats(group) for key, group in sorted(by_endpoint.items())}
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=None, help="base URL of a running server (default: Flask test client)")
+    parser.add_argument("--token", default=os.environ.get("MLPROJECT_TOKEN", "toA72nrlQAHlBU7"))
+    parser.add_argument("--capture", default=None, help="JSON lines file of requests to replay")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="synthesized kinds and weights, e.g. predict-json=8,train-json=1")
+    parser.add_argument("--data", default=os.path.join("artifacts", "test.csv"), help="rows used to synthesize requests")
+    parser.add_argument("--batch-rows", type=int, default=50, help="rows per synthesized batch/CSV request")
+    parser.add_argument("--unique", type=int, default=1000, help="number of distinct synthesized requests")
+    parser.add_argument("--record", default=None, help="write the synthesized requests as a capture file")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=None, help="total requests (default 1000 unless --duration)")
+    parser.add_argument("--duration", type=float, default=None, help="seconds to run")
+    parser.add_argument("--rate", type=float, default=None, help="open-loop arrival rate in requests/s")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.capture:
+        requests, skipped = load_capture(args.capture)
+        source = {"capture": args.capture, "skipped_lines": skipped}
+    else:
+        rng = np.random.default_rng(args.seed)
+        test_df = pd.read_csv(args.data)
+        mix = {kind: float(weight) for kind, weight in (item.split("=") for item in args.mix.split(","))}
+        kinds = random.Random(args.seed).choices(list(mix), weights=list(mix.values()), k=args.unique)
+        requests = [synthesize(kind, test_df, rng, args.batch_rows) for kind in kinds]
+        source = {"mix": mix, "unique_requests": len(requests)}
+        if args.record:
+            with open(args.record, "w") as file_obj:
+                for spec in requests:
+                    file_obj.write(json.dumps(spec) + "\n")
+
+    target = HttpTarget(args.url, args.token, args.timeout) if args.url else TestClientTarget(args.token)
+    total = args.requests if args.requests is not None else (None if args.duration else 1000)
+
+    samples, elapsed = run_load(target, requests, args.concurrency, total, args.duration, args.rate)
+    report = {
+        "target": args.url or "test-client",
+        "concurrency": args.concurrency,
+        "rate": args.rate,
+        **source,
+        **summarize(samples, elapsed),
+    }
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,71 @@
+"""
+Gunicorn settings for production serving.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Every setting can be tuned through the environment:
+
+    MLPROJECT_BIND              address to listen on (0.0.0.0:5000)
+    MLPROJECT_WORKERS           worker processes (number of CPUs)
+    MLPROJECT_THREADS           request threads per worker (4); the prediction admission
+                                limit defaults to one less (see src/MLProject/admission.py)
+    MLPROJECT_WORKER_TIMEOUT    seconds before a silent worker is restarted (120)
+    MLPROJECT_GRACEFUL_TIMEOUT  seconds a worker gets to finish its requests on reload (30)
+    MLPROJECT_MAX_REQUESTS      requests after which a worker is recycled (0 = never)
+    MLPROJECT_APP_MODE          "full" (training and prediction) or "predict" (prediction only)
+
+The app is preloaded, so the model is warmed once in the master (see wsgi.py).
+The master watches the model registry: when a new version becomes current it
+sends itself SIGHUP, warms the new model in on_reload, then forks new workers and
+stops the old ones gracefully. `kill -HUP <master pid>` does the same by hand.
+
+Training jobs run in the workers, and a reload kills any job still running after
+graceful_timeout. The automatic reload therefore waits until no training job is
+queued or running in any worker; a job submitted in the moment between that check
+and the reload can still be cut short and is reported as failed. Reload by hand
+only when /currencytraining shows no active job, or serve training from a separate
+MLPROJECT_APP_MODE=full deployment and run MLPROJECT_APP_MODE=predict here.
+"""
+import os
+import time
+import signal
+import multiprocessing
+
+bind = os.environ.get("MLPROJECT_BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("MLPROJECT_WORKERS", multiprocessing.cpu_count()))
+threads = int(os.environ.get("MLPROJECT_THREADS", 4))
+worker_class = "gthread"
+preload_app = True
+timeout = int(os.environ.get("MLPROJECT_WORKER_TIMEOUT", 120))
+graceful_timeout = int(os.environ.get("MLPROJECT_GRACEFUL_TIMEOUT", 30))
+max_requests = int(os.environ.get("MLPROJECT_MAX_REQUESTS", 0))
+max_requests_jitter = max_requests // 10
+
+# One log file per process: rotating a shared file from several processes is not safe
+os.environ.setdefault("MLPROJECT_LOG_FILE", "mlproject-{pid}.log")
+
+
+def when_ready(server):
+    # Reload the workers whenever a new model version is published, once no training job is active
+    from src.MLProject.serving import serving_state
+    from src.MLProject.handlers import app_mode
+
+    def reload(version):
+        if app_mode() == "full":
+            from src.MLProject.pipelines.training_jobs import training_jobs
+            if training_jobs.active_jobs():
+                server.log.info("Deferring reload to model %s until training jobs finish", version)
+            while training_jobs.active_jobs():
+                time.sleep(serving_state.config.model_poll_seconds)
+        os.kill(os.getpid(), signal.SIGHUP)
+
+    serving_state.watch_model(reload)
+
+
+def on_reload(server):
+    # Runs in the master before the new workers are forked: warm the new model once for all of them
+    import gc
+    from src.MLProject.serving import serving_state
+    serving_state.warm_up()
+    gc.freeze()
+
@@ -1,41 +1,95 @@
-from flask import request
+from flask import Response, request, g
 import functools
+from src.MLProject.admission import admission, AdmissionRejected, rejection_body
 
-# middleware -> auth 
-def auth(view_func):
-    @functools.wraps(view_func)
-    def decorated(*args, **kwargs):
-        # 1. accept from params
-        token = request.args.get("token")
+# Token check shared by the Flask and ASGI apps: returns None when the token is valid,
+# otherwise the error response body and status code
+def check_token(token):
+    # 1. accept from params
+    if not token:
+        res={
+            "status":False,
+            "message":"Error",
+            "data":'Missing token'
+        }
+        return res, 401
 
-        if not token:
+
+    # define dummy fucntion which checks for token fom backend and return user object
+    try:
+        if token != 'toA72nrlQAHlBU7':
             res={
                 "status":False,
                 "message":"Error",
-                "data":'Missing token'
+                "data":'Unautorised user'
             }
             return res, 401
-        
-
-        # define dummy fucntion which checks for token fom backend and return user object
-        try:
-            if token != 'toA72nrlQAHlBU7':
-                res={
-                    "status":False,
-                    "message":"Error",
-                    "data":'Unautorised user'
-                }
-                return res, 401
-
-            return view_func(*args, **kwargs)
-
-        except ValueError as e:
-            # Handle errors during token verification or backend communication
-            res={
-                "status":False,
-                "message":"Error",
-                "data":'Internal server error'
-            }
-            return res, 500
-        
+
+        return None
+
+    except ValueError as e:
+        # Handle errors during token verification or backend communication
+        res={
+            "status":False,
+            "message":"Error",
+            "data":'Internal server error'
+        }
+        return res, 500
+
+# middleware -> auth
+def auth(view_func):
+    @functools.wraps(view_func)
+    def decorated(*args, **kwargs):
+        error = check_token(request.args.get("token"))
+        if error is not None:
+            return error
+
+        return view_func(*args, **kwargs)
+
     return decorated
+
+# middleware -> admission control
+def admit(route_class):
+    """
+    Runs a view within the admission limits of its route class ("predict" or "training").
+
+    A request that finds the class's queue full gets 429, one that waits too long
+    gets 503, both with Retry-After. The slot is released by release_admission when
+    the request is torn down; a streamed body keeps it until the body is finished.
+    """
+    def decorator(view_func):
+        @functools.wraps(view_func)
+        def decorated(*args, **kwargs):
+            limiter = admission.limiter(route_class)
+            if limiter is None:
+                return view_func(*args, **kwargs)
+
+            try:
+                limiter.acquire()
+            except AdmissionRejected as e:
+                return rejection_body(e), e.status_code, {"Retry-After": str(e.retry_after)}
+
+            g.admission_limiter = limiter
+            rv = view_func(*args, **kwargs)
+
+            # The request is torn down before a streamed body is generated: hand the slot to the body
+            if isinstance(rv, Response) and rv.is_streamed:
+                g.pop('admission_limiter', None)
+                rv.response = _release_after(rv.response, limiter)
+            return rv
+
+        return decorated
+    return decorator
+
+def _release_after(body, limiter):
+    # Runs when the body is exhausted, closed by the server, or garbage collected
+    try:
+        yield from body
+    finally:
+        limiter.release()
+
+# Registered with app.teardown_request: frees the admission slot taken by @admit
+def release_admission(error=None):
+    limiter = g.pop('admission_limiter', None)
+    if limiter is not None:
+        limiter.release()
@@ -0,0 +1,284 @@
+import os
+import time
+import asyncio
+import threading
+from collections import deque
+from contextlib import contextmanager, asynccontextmanager
+from dataclasses import dataclass
+from src.MLProject.metrics import registry, stats_collector, admission_queue_seconds
+
+
+@dataclass
+class AdmissionConfig:
+    """
+    This dataclass holds configuration settings for admission control.
+
+    Every route class has its own concurrency limit and bounded wait queue, so a
+    burst of training uploads cannot take the threads prediction requests need.
+    Limits apply per serving process.
+    """
+
+    # Whether requests are admitted through the per-class limits at all.
+    enabled:bool = os.environ.get("MLPROJECT_ADMISSION", "1") == "1"
+
+    # Prediction requests processed at once, requests allowed to wait for a slot,
+    # and seconds a request waits before it is turned away with 503. The concurrency
+    # defaults to one less than the request threads of a gunicorn worker (MLPROJECT_THREADS,
+    # see gunicorn.conf.py), so a thread stays free for training uploads and probes; a
+    # limit at or above the thread count would never bind. Under gunicorn a waiting request
+    # holds its thread, so the queue only absorbs what the spare threads can hold. The ASGI
+    # app waits without a thread and runs admitted work on MLPROJECT_ASGI_THREADS.
+    predict_concurrency:int = int(os.environ.get("MLPROJECT_ADMIT_PREDICT_CONCURRENCY", max(int(os.environ.get("MLPROJECT_THREADS", 4)) - 1, 1)))
+    predict_queue:int = int(os.environ.get("MLPROJECT_ADMIT_PREDICT_QUEUE", 64))
+    predict_queue_timeout:float = float(os.environ.get("MLPROJECT_ADMIT_PREDICT_TIMEOUT", 1.0))
+
+    # The same limits for training uploads; parsing and hashing a training upload is
+    # CPU-heavy and the jobs themselves are queued separately by training_jobs.
+    training_concurrency:int = int(os.environ.get("MLPROJECT_ADMIT_TRAINING_CONCURRENCY", 1))
+    training_queue:int = int(os.environ.get("MLPROJECT_ADMIT_TRAINING_QUEUE", 1))
+    training_queue_timeout:float = float(os.environ.get("MLPROJECT_ADMIT_TRAINING_TIMEOUT", 5.0))
+
+    # Retry-After seconds sent with a rejection of each class.
+    predict_retry_after:int = int(os.environ.get("MLPROJECT_ADMIT_PREDICT_RETRY_AFTER", 1))
+    training_retry_after:int = int(os.environ.get("MLPROJECT_ADMIT_TRAINING_RETRY_AFTER", 30))
+
+
+class AdmissionRejected(Exception):
+    """
+    Raised when a request is not admitted: 429 when the wait queue is full, 503 when the wait timed out.
+    """
+
+    def __init__(self, route_class, reason, retry_after):
+        self.route_class = route_class
+        self.reason = reason
+        self.retry_after = retry_after
+        self.status_code = 429 if reason == "queue_full" else 503
+        if reason == "queue_full":
+            message = f"Too many {route_class} requests, retry later"
+        else:
+            message = f"Timed out waiting for a {route_class} slot, retry later"
+        super().__init__(message)
+
+
+class _Waiter:
+    """
+    A queued request; granted is set under the limiter lock when a slot is handed to it.
+    """
+
+    __slots__ = ("granted", "event", "loop", "future")
+
+    def __init__(self, loop=None):
+        self.granted = False
+        self.loop = loop
+        if loop is None:
+            self.event = threading.Event()
+        else:
+            self.future = loop.create_future()
+
+    def wake(self):
+        if self.loop is None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(lambda: self.future.done() or self.future.set_result(None))
+
+
+class AdmissionLimiter:
+    """
+    This class admits at most `concurrency` requests of one route class and queues a bounded number more.
+
+    Waiting requests are served first come, first served: a released slot is handed
+    straight to the oldest waiter. Threads (Flask) and event-loop tasks (ASGI) can
+    wait on the same limiter.
+    """
+
+    def __init__(self, route_class, concurrency, queue_size, queue_timeout, retry_after):
+        """
+        Initialize the limiter.
+
+        Args:
+            route_class (str): Name of the route class, used in metrics and messages.
+            concurrency (int): Requests processed at once.
+            queue_size (int): Requests allowed to wait for a slot; more are rejected with 429.
+            queue_timeout (float): Seconds a request may wait before it is rejected with 503.
+            retry_after (int): Retry-After seconds sent with rejections.
+        """
+        self.route_class = route_class
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        self._waiters = deque()
+        self._in_flight = 0
+        self._stats = {"admitted": 0, "queued": 0, "rejected_queue_full": 0, "rejected_timeout": 0}
+
+    def _try_enter(self, loop=None):
+        """
+        Takes a free slot, or queues a waiter. Returns None when admitted right away. Call with the lock held.
+        """
+        if self._in_flight < self.concurrency and not self._waiters:
+            self._in_flight += 1
+            self._stats["admitted"] += 1
+            return None
+        if len(self._waiters) >= self.queue_size:
+            self._reject("queue_full")
+        waiter = _Waiter(loop)
+        self._waiters.append(waiter)
+        self._stats["queued"] += 1
+        return waiter
+
+    def _reject(self, reason):
+        self._stats[f"rejected_{reason}"] += 1
+        raise AdmissionRejected(self.route_class, reason, self.retry_after)
+
+    def _finish_wait(self, waiter, start):
+        """
+        Settles a waiter after its wait: admitted if a slot was handed over, otherwise rejected on timeout.
+        """
+        with self._lock:
+            if not waiter.granted:
+                self._waiters.remove(waiter)
+                self._reject("timeout")
+            self._stats["admitted"] += 1
+        admission_queue_seconds.observe(time.perf_counter() - start, route_class=self.route_class)
+
+    def acquire(self):
+        """
+        Waits for a slot on the calling thread.
+
+        Raises:
+            AdmissionRejected: If the queue is full or the wait timed out.
+        """
+        start = time.perf_counter()
+        with self._lock:
+            waiter = self._try_enter()
+        if waiter is None:
+            admission_queue_seconds.observe(0.0, route_class=self.route_class)
+            return
+        waiter.event.wait(self.queue_timeout)
+        self._finish_wait(waiter, start)
+
+    async def acquire_async(self):
+        """
+        Waits for a slot without blocking the event loop.
+
+        Raises:
+            AdmissionRejected: If the queue is full or the wait timed out.
+        """
+        start = time.perf_counter()
+        with self._lock:
+            waiter = self._try_enter(asyncio.get_running_loop())
+        if waiter is None:
+            admission_queue_seconds.observe(0.0, route_class=self.route_class)
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), self.queue_timeout)
+        except asyncio.TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            # The client went away while waiting: leave the queue, or pass on a slot handed over meanwhile
+            with self._lock:
+                granted = waiter.granted
+                if not granted:
+                    self._waiters.remove(waiter)
+            if granted:
+                self.release()
+            raise
+        self._finish_wait(waiter, start)
+
+    def release(self):
+        """
+        Frees a slot, handing it to the oldest waiter if there is one.
+        """
+        with self._lock:
+            if self._waiters:
+                waiter = self._waiters.popleft()
+                waiter.granted = True
+                waiter.wake()
+            else:
+                self._in_flight -= 1
+
+    @contextmanager
+    def slot(self):
+        """
+        Holds a slot for the with block (see acquire).
+        """
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    @asynccontextmanager
+    async def slot_async(self):
+        """
+        Holds a slot for the async with block (see acquire_async).
+        """
+        await self.acquire_async()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self):
+        """
+        Returns the requests in flight and waiting, and the admission and rejection counters.
+        """
+        stats = dict(self._stats)
+        stats["in_flight"] = self._in_flight
+        stats["waiting"] = len(self._waiters)
+        return stats
+
+
+class AdmissionController:
+    """
+    This class holds the limiter of every route class ("predict" and "training").
+    """
+
+    def __init__(self, config=None):
+        """
+        Initialize one limiter per route class.
+
+        Args:
+            config (AdmissionConfig): Optional configuration, defaults to AdmissionConfig().
+        """
+        self.config = config or AdmissionConfig()
+        self.limiters = {
+            route_class: AdmissionLimiter(
+                route_class,
+                getattr(self.config, f"{route_class}_concurrency"),
+                getattr(self.config, f"{route_class}_queue"),
+                getattr(self.config, f"{route_class}_queue_timeout"),
+                getattr(self.config, f"{route_class}_retry_after"),
+            )
+            for route_class in ("predict", "training")
+        }
+
+    def limiter(self, route_class):
+        """
+        Returns the limiter of a route class, or None when admission control is disabled.
+        """
+        return self.limiters[route_class] if self.config.enabled else None
+
+
+def rejection_body(error):
+    """
+    Builds the JSON body of a rejected request, in the apps' response format.
+
+    Args:
+        error (AdmissionRejected): The rejection.
+    """
+    return {
+        "status":False,
+        "message":"Error",
+        "data":str(error)
+    }
+
+
+# Process-wide admission controller shared by the Flask and ASGI apps
+admission = AdmissionController()
+for _route_class, _limiter in admission.limiters.items():
+    registry.register_collector(stats_collector(
+        f"mlproject_admission_{_route_class}", _limiter.stats,
+        counters=("admitted", "queued", "rejected_queue_full", "rejected_timeout"),
+    ))
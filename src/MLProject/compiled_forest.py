@@ -0,0 +1,269 @@
+import os
+import sys
+import numpy as np
+from src.MLProject.exception import CustomException
+from src.MLProject.metrics import registry, stats_collector
+from src.MLProject.model_cache import ModelCache
+from src.MLProject.utils import load_object
+
+# File name of the compiled engine saved next to a published model
+COMPILED_FILE_NAME = 'compiled.pkl'
+
+
+class CompiledForest:
+    """
+    This class is an array-backed inference engine for fitted tree-ensemble regressors.
+
+    Every tree of the forest is flattened into shared contiguous arrays (feature,
+    threshold, left/right child, leaf value). Prediction walks all trees for all
+    rows at once with vectorized NumPy gathers, one tree level per step.
+
+    Inputs are validated like scikit-learn's: values are cast to float32, infinite
+    values (including finite ones beyond the float32 range) are rejected, and NaN
+    follows each node's missing-value direction, or is rejected when the source
+    trees do not record one.
+    """
+
+    # Upper bound on rows x trees traversed together, to keep the index arrays small
+    max_cells = 1 << 20
+
+    def __init__(self, feature, threshold, children_left, children_right, value, roots, max_depth, n_features, missing_go_to_left=None):
+        """
+        Initialize the engine from already flattened arrays.
+
+        Args:
+            feature (np.array): Split feature of every node (0 for leaves).
+            threshold (np.array): Split threshold of every node.
+            children_left (np.array): Global index of the left child (the node itself for leaves).
+            children_right (np.array): Global index of the right child (the node itself for leaves).
+            value (np.array): Prediction stored at every node.
+            roots (np.array): Global index of the root node of each tree.
+            max_depth (int): Depth of the deepest tree.
+            n_features (int): Number of input features.
+            missing_go_to_left (np.array): Whether NaN goes to the left child at every node,
+                or None if the trees cannot route missing values.
+        """
+        self.feature = feature
+        self.threshold = threshold
+        self.children_left = children_left
+        self.children_right = children_right
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features)
+        self.missing_go_to_left = missing_go_to_left
+        self.is_leaf = children_left == np.arange(len(children_left))
+
+    @classmethod
+    def from_estimator(cls, model):
+        """
+        Flattens a fitted RandomForestRegressor (or any single-output forest of decision trees).
+
+        Args:
+            model: The fitted ensemble, exposing estimators_ with tree_ attributes.
+
+        Returns:
+            CompiledForest: The compiled engine.
+
+        Raises:
+            CustomException: If the model is not a supported tree ensemble.
+        """
+        try:
+            trees = [estimator.tree_ for estimator in model.estimators_]
+            if any(tree.value.shape[1] != 1 for tree in trees):
+                raise ValueError("Only single-output tree ensembles can be compiled")
+
+            sizes = np.array([tree.node_count for tree in trees])
+            offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+
+            # scikit-learn 1.3+ records where NaN goes at every split; older trees reject NaN
+            routes_missing = all(hasattr(tree, "missing_go_to_left") for tree in trees)
+
+            features, thresholds, lefts, rights, values, missing_lefts = [], [], [], [], [], []
+            for tree, offset in zip(trees, offsets):
+                node_ids = np.arange(tree.node_count) + offset
+                is_leaf = tree.children_left < 0
+
+                # Leaves point at themselves so extra traversal steps are no-ops
+                lefts.append(np.where(is_leaf, node_ids, tree.children_left + offset))
+                rights.append(np.where(is_leaf, node_ids, tree.children_right + offset))
+                features.append(np.where(is_leaf, 0, tree.feature))
+                thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+                values.append(tree.value[:, 0, 0])
+                if routes_missing:
+                    missing_lefts.append(np.asarray(tree.missing_go_to_left, dtype=bool))
+
+            return cls(
+                feature=np.ascontiguousarray(np.concatenate(features), dtype=np.int32),
+                threshold=np.ascontiguousarray(np.concatenate(thresholds), dtype=np.float64),
+                children_left=np.ascontiguousarray(np.concatenate(lefts), dtype=np.int32),
+                children_right=np.ascontiguousarray(np.concatenate(rights), dtype=np.int32),
+                value=np.ascontiguousarray(np.concatenate(values), dtype=np.float64),
+                roots=np.ascontiguousarray(offsets, dtype=np.int32),
+                max_depth=max(tree.max_depth for tree in trees),
+                n_features=model.n_features_in_,
+                missing_go_to_left=np.ascontiguousarray(np.concatenate(missing_lefts)) if routes_missing else None,
+            )
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def predict(self, features):
+        """
+        Makes predictions for a 2-D array of features.
+
+        Args:
+            features (array-like): The features on which to make predictions.
+
+        Returns:
+            np.array: The predicted values, matching the source forest within float tolerance.
+
+        Raises:
+            CustomException: If an error occurs during prediction.
+        """
+        try:
+            # Trees are fitted on float32 inputs, so round the same way sklearn does;
+            # values beyond the float32 range become infinite and are rejected like infinity
+            with np.errstate(over="ignore"):
+                X = np.asarray(features, dtype=np.float32)
+            if X.ndim != 2 or X.shape[1] != self.n_features:
+                raise ValueError(f"Expected a 2-D array with {self.n_features} features, got shape {X.shape}")
+            if np.isinf(X).any():
+                raise ValueError("Input X contains infinity or a value too large for dtype('float32').")
+
+            # Engines compiled before missing values were routed have no missing_go_to_left
+            missing_go_to_left = getattr(self, "missing_go_to_left", None)
+            has_missing = bool(np.isnan(X).any())
+            if has_missing and missing_go_to_left is None:
+                raise ValueError("Input X contains NaN.")
+
+            n_trees = len(self.roots)
+            chunk_rows = max(1, self.max_cells // n_trees)
+            X_flat = X.ravel()
+            preds = np.empty(X.shape[0], dtype=np.float64)
+
+            for start in range(0, X.shape[0], chunk_rows):
+                n_rows = min(chunk_rows, X.shape[0] - start)
+
+                # One node index per (row, tree) pair, flattened row-major,
+                # with the offset of that row's features in X_flat
+                nodes = np.tile(self.roots, n_rows)
+                row_offsets = np.repeat(np.arange(start, start + n_rows, dtype=np.intp) * self.n_features, n_trees)
+
+                # Advance every unfinished path one level per step, dropping
+                # paths that reached a leaf every few steps to shrink the work
+                active = np.arange(nodes.size)
+                current = nodes.copy()
+                for depth in range(self.max_depth):
+                    x = X_flat[row_offsets + self.feature[current]]
+                    go_left = x <= self.threshold[current]
+                    if has_missing:
+                        go_left |= np.isnan(x) & missing_go_to_left[current]
+                    current = np.where(go_left, self.children_left[current], self.children_right[current])
+                    if depth % 3 == 2:
+                        nodes[active] = current
+                        keep = ~self.is_leaf[current]
+                        active, current, row_offsets = active[keep], current[keep], row_offsets[keep]
+                        if active.size == 0:
+                            break
+                nodes[active] = current
+
+                preds[start:start + n_rows] = self.value[nodes].reshape(n_rows, n_trees).mean(axis=1)
+
+            return preds
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+def check_equivalence(model, compiled, n_rows=16, seed=0):
+    """
+    Checks that a compiled engine predicts like its source forest, edge cases included.
+
+    Random rows spanning each feature's split thresholds are predicted as they are,
+    and with one feature set exactly on a threshold, to NaN or to the float32 limits;
+    both engines must return the same values. With a feature beyond the float32
+    range or infinite, both must reject the input.
+
+    Args:
+        model: The fitted forest.
+        compiled (CompiledForest): The engine compiled from it.
+        n_rows (int): Number of random base rows.
+        seed (int): Seed of the random rows.
+
+    Raises:
+        ValueError: If the engines disagree on any case.
+    """
+    def predict(predictor, X):
+        try:
+            with np.errstate(over="ignore", invalid="ignore"):
+                return np.asarray(predictor.predict(X), dtype=np.float64)
+        except Exception:
+            return None
+
+    rng = np.random.default_rng(seed)
+    split = ~compiled.is_leaf
+    base = np.zeros((n_rows, compiled.n_features))
+    thresholds = {}
+    for column in range(compiled.n_features):
+        # Splits that only separate missing values have an infinite threshold
+        values = compiled.threshold[split & (compiled.feature == column)]
+        values = values[np.isfinite(values)]
+        thresholds[column] = values if values.size else np.zeros(1)
+        base[:, column] = rng.uniform(thresholds[column].min() - 1, thresholds[column].max() + 1, n_rows)
+
+    # Cases both engines must predict, stacked so each engine makes one call per group
+    float32_max = float(np.finfo(np.float32).max)
+    groups = {"random rows": [base], "on a threshold": [], "NaN": [], "the float32 limits": []}
+    for column in range(compiled.n_features):
+        for name, value in (
+            ("on a threshold", rng.choice(thresholds[column], n_rows)),
+            ("NaN", np.nan),
+            ("the float32 limits", np.where(np.arange(n_rows) % 2, float32_max, -float32_max)),
+        ):
+            X = base.copy()
+            X[:, column] = value
+            groups[name].append(X)
+
+    for name, arrays in groups.items():
+        X = np.vstack(arrays)
+        expected, actual = predict(model, X), predict(compiled, X)
+        if (expected is None) != (actual is None):
+            raise ValueError(f"Compiled engine {'rejects' if actual is None else 'accepts'} {name}, unlike the model")
+        if expected is not None and not np.allclose(expected, actual, rtol=1e-9, atol=1e-12):
+            raise ValueError(f"Compiled engine differs from the model on {name} by up to {np.abs(expected - actual).max():.3g}")
+
+    # Cases both engines must reject, one feature at a time
+    for column in range(compiled.n_features):
+        for name, value in (("beyond float32", 1e39), ("infinity", -np.inf)):
+            X = base[:1].copy()
+            X[:, column] = value
+            if (predict(model, X) is None) != (predict(compiled, X) is None):
+                raise ValueError(f"Compiled engine and model disagree on rejecting feature {column} {name}")
+
+
+def load_compiled_forest(file_path):
+    """
+    Loads the compiled engine for a pickled forest.
+
+    When training published a compiled copy next to the model, its arrays are
+    memory-mapped read-only, so every worker process on the host shares them.
+    Otherwise the forest is loaded and compiled in this process.
+
+    Args:
+        file_path (str): The path to the pickled model.
+
+    Returns:
+        CompiledForest: The compiled engine.
+    """
+    compiled_path = os.path.join(os.path.dirname(file_path), COMPILED_FILE_NAME)
+    if os.path.exists(compiled_path):
+        return load_object(compiled_path, mmap_mode="r")
+    return CompiledForest.from_estimator(load_object(file_path))
+
+
+# Process-wide cache of compiled engines, keyed by model path like model_cache
+compiled_model_cache = ModelCache(loader=load_compiled_forest)
+registry.register_collector(stats_collector(
+    "mlproject_compiled_model_cache", compiled_model_cache.stats, counters=("hits", "load_count"),
+))
@@ -1,9 +1,15 @@
 import os
 import sys 
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from src.MLProject.exception import CustomException
-from src.MLProject.logger import logging
+from src.MLProject.logger import get_logger
 from dataclasses import dataclass
 from sklearn.model_selection import train_test_split
+import pandas as pd
+from src.MLProject.dataset_io import artifact_path, read_dataset, write_dataset
+
+logger = get_logger(__name__)
 
 @dataclass
 class DataIngestionConfig:
@@ -19,6 +25,39 @@ class DataIngestionConfig:
     # The path where the testing data will be saved.    
     test_data_path:str = os.path.join('artifacts','test.csv')
 
+    # The path of the cumulative dataset that incremental training appends to.
+    dataset_path:str = os.path.join('artifacts','dataset.csv')
+
+    # Whether split_data writes the raw/train/test artifacts at all (training does not read them back).
+    persist_artifacts:bool = os.environ.get('MLPROJECT_PERSIST_SPLITS', '1') == '1'
+
+    # Whether split_data writes those files on a background thread instead of blocking training.
+    async_artifacts:bool = os.environ.get('MLPROJECT_ASYNC_SPLITS', '1') == '1'
+
+    # Storage format of the dataset artifacts: csv, parquet, feather (both need pyarrow) or npy.
+    # The extensions of the paths above are replaced to match.
+    artifact_format:str = os.environ.get('MLPROJECT_ARTIFACT_FORMAT', 'csv')
+
+    def __post_init__(self):
+        self.raw_data_path = artifact_path(self.raw_data_path, self.artifact_format)
+        self.train_data_path = artifact_path(self.train_data_path, self.artifact_format)
+        self.test_data_path = artifact_path(self.test_data_path, self.artifact_format)
+        self.dataset_path = artifact_path(self.dataset_path, self.artifact_format)
+
+
+# Single background thread that writes dataset artifacts, created lazily per process
+_artifact_writer = None
+_artifact_writer_pid = None
+_artifact_writer_lock = threading.Lock()
+
+def _get_artifact_writer():
+    global _artifact_writer, _artifact_writer_pid
+    with _artifact_writer_lock:
+        if _artifact_writer is None or _artifact_writer_pid != os.getpid():
+            _artifact_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="artifact-writer")
+            _artifact_writer_pid = os.getpid()
+        return _artifact_writer
+
 class DataIngestion:
     """
     This class handles data ingestion tasks, including reading, splitting, and saving data.
@@ -29,6 +68,7 @@ class DataIngestion:
         Initialize the data ingestion object with a default configuration.
         """
         self.ingestion_config = DataIngestionConfig()
+        self.pending_write = None
 
     def initiate_data_ingestion(self,df):
         """
@@ -44,20 +84,13 @@ class DataIngestion:
             CustomException: If an error occurs during data ingestion.
         """
         try:
-            # logging.info("Reading data")
-
-            # Create the directory for the raw data file if it doesn't exist
-            os.makedirs(os.path.dirname(self.ingestion_config.raw_data_path),exist_ok=True)
+            logger.info("Reading data")
 
-            # Split the DataFrame into training and testing sets (80%/20%)
+            # Split the data and save the raw data, training data, and testing data as artifacts
             train_set,test_set = train_test_split(df,test_size=0.2,random_state=42)
+            self._save_artifacts(df,train_set,test_set)
 
-            # Save the raw data, training data, and testing data to CSV files
-            df.to_csv(self.ingestion_config.raw_data_path,index=False,header=True)
-            train_set.to_csv(self.ingestion_config.train_data_path,index=False,header=True)
-            test_set.to_csv(self.ingestion_config.test_data_path,index=False,header=True)
-
-            # logging.info("Data ingestion is completed")
+            logger.info("Data ingestion is completed", extra={"rows": len(df), "train_rows": len(train_set), "test_rows": len(test_set)})
 
             return (
                 self.ingestion_config.train_data_path,
@@ -65,4 +98,114 @@ class DataIngestion:
             )
 
         except Exception as e:
-            raise CustomException(e,sys)
\ No newline at end of file
+            raise CustomException(e,sys)
+
+    def split_data(self,df):
+        """
+        Splits a pandas DataFrame into training and testing sets and hands them over in memory.
+
+        Writing the raw/train/test artifacts is an optional side effect done on a
+        background thread (see DataIngestionConfig); the Future for it is kept on
+        pending_write.
+
+        Args:
+            df (pandas.DataFrame): The DataFrame containing the data to be ingested.
+
+        Returns:
+            tuple: The training and testing DataFrames.
+
+        Raises:
+            CustomException: If an error occurs during data ingestion.
+        """
+        try:
+            # Split the DataFrame into training and testing sets (80%/20%)
+            train_set,test_set = train_test_split(df,test_size=0.2,random_state=42)
+
+            self.pending_write = None
+            if self.ingestion_config.persist_artifacts:
+                if self.ingestion_config.async_artifacts:
+                    self.pending_write = _get_artifact_writer().submit(self._save_artifacts,df,train_set,test_set)
+                else:
+                    self._save_artifacts(df,train_set,test_set)
+
+            return train_set,test_set
+
+        except Exception as e:
+            raise CustomException(e,sys)
+
+    def _save_artifacts(self,df,train_set,test_set):
+        """
+        Saves the raw data, training data, and testing data in the configured artifact format.
+        """
+        # Create the directory for the raw data file if it doesn't exist
+        os.makedirs(os.path.dirname(self.ingestion_config.raw_data_path),exist_ok=True)
+
+        write_dataset(df,self.ingestion_config.raw_data_path)
+        write_dataset(train_set,self.ingestion_config.train_data_path)
+        write_dataset(test_set,self.ingestion_config.test_data_path)
+
+    def build_dataset(self,df,append=False):
+        """
+        Builds the dataset a new model is trained on, without touching the stored one.
+
+        Args:
+            df (pandas.DataFrame): The newly uploaded training rows.
+            append (bool): Append to the stored dataset instead of replacing it. Rows with a
+                Date already present are replaced by the new ones.
+
+        Returns:
+            pandas.DataFrame: The full dataset; store_dataset saves it once the model is published.
+
+        Raises:
+            CustomException: If an error occurs while reading the stored dataset.
+        """
+        try:
+            if append:
+                # Let queued artifact writes (e.g. a previous full upload) land before reading
+                _get_artifact_writer().submit(lambda: None).result()
+
+                # Start from the last uploaded dataset when nothing was stored yet
+                candidates = [self.ingestion_config.dataset_path, self.ingestion_config.raw_data_path, artifact_path(self.ingestion_config.raw_data_path, 'csv')]
+                base_path = next((path for path in candidates if os.path.exists(path)), None)
+                if base_path is not None:
+                    stored = read_dataset(base_path)
+
+                    # Binary formats store Date as a datetime; compare dates in one representation
+                    df = df[stored.columns].assign(Date=pd.to_datetime(df['Date'], format='%Y-%m-%d'))
+                    stored = stored.assign(Date=pd.to_datetime(stored['Date'], format='%Y-%m-%d'))
+                    df = pd.concat([stored, df], ignore_index=True)
+                    df = df.drop_duplicates(subset=['Date'], keep='last').reset_index(drop=True)
+
+            return df
+
+        except Exception as e:
+            raise CustomException(e,sys)
+
+    def store_dataset(self,df):
+        """
+        Saves the dataset the published model is based on, replacing the stored one.
+
+        Called only after the model trained on it is published, so a failed run
+        leaves the stored dataset matching the current model.
+
+        Args:
+            df (pandas.DataFrame): The dataset returned by build_dataset.
+
+        Raises:
+            CustomException: If an error occurs while writing the dataset.
+        """
+        try:
+            dataset_path = self.ingestion_config.dataset_path
+            os.makedirs(os.path.dirname(dataset_path),exist_ok=True)
+
+            # write_dataset renames a finished temporary file so readers never see a partial dataset;
+            # the next build_dataset waits for a write still running in the background
+            if self.ingestion_config.async_artifacts:
+                self.pending_write = _get_artifact_writer().submit(write_dataset,df,dataset_path)
+            else:
+                write_dataset(df,dataset_path)
+
+            logger.info("Stored dataset updated", extra={"rows": len(df)})
+
+        except Exception as e:
+            raise CustomException(e,sys)
@@ -1,21 +1,48 @@
 import sys
-from src.MLProject.logger import logging
+from src.MLProject.logger import get_logger
 from src.MLProject.exception import CustomException
 
 import numpy as np, pandas as pd
+from src.MLProject.dataset_io import read_dataset
+
+logger = get_logger(__name__)
 
 
 class DataTransformation:
     """
     This class handles data transformation steps for training and testing data.
     """
+    def transform_frame(self,df):
+        """
+        Turns a DataFrame of training rows into a feature array with the target as its last column.
+
+        Args:
+            df (pandas.DataFrame): Rows with a 'Date' column in %Y-%m-%d format and the 'INR' target.
+
+        Returns:
+            np.array: The features (Year and Day appended, Date removed) followed by the target.
+        """
+        df=df.copy()
+
+        # Create datetime, year, and day columns from the 'Date' column
+        df['date']=pd.to_datetime(df['Date'], format = '%Y-%m-%d')
+        df['Year'] = df['date'].dt.year
+        df['Day'] = df['date'].dt.day
+
+        # Separate target feature from the DataFrame
+        target_feature_df=df['INR']
+        df=df.drop(columns=['INR','Date','date'],axis=1)
+
+        # Combine features and target feature back into a NumPy array
+        return np.c_[df,np.array(target_feature_df)]
+
     def initiate_data_transormation(self,train_path,test_path):
         """
-        Performs data transformation on training and testing CSV files.
+        Performs data transformation on training and testing data.
 
         Args:
-            train_path (str): The path to the training CSV file.
-            test_path (str): The path to the testing CSV file.
+            train_path (str or pandas.DataFrame): The path to the training data (CSV or a dataset_io format), or the training DataFrame itself.
+            test_path (str or pandas.DataFrame): The path to the testing data (CSV or a dataset_io format), or the testing DataFrame itself.
 
         Returns:
             tuple: A tuple containing the transformed training and testing data as NumPy arrays.
@@ -24,33 +51,16 @@ class DataTransformation:
             CustomException: If an error occurs during data transformation.
         """
         try:
-            # Read training and testing data as pandas DataFrames
-            train_df=pd.read_csv(train_path)
-            test_df=pd.read_csv(test_path)
-
-            # logging.info("Reading the train and test file")
-
-            # Create datetime, year, and day columns from the 'Date' column
-            train_df['date']=pd.to_datetime(train_df['Date'], format = '%Y-%m-%d')
-            train_df['Year'] = train_df['date'].dt.year
-            train_df['Day'] = train_df['date'].dt.day
-
-            test_df['date']=pd.to_datetime(test_df['Date'], format = '%Y-%m-%d')
-            test_df['Year'] = test_df['date'].dt.year
-            test_df['Day'] = test_df['date'].dt.day
-
-            # Separate target feature from training and testing DataFrames
-            target_feature_train_df=train_df['INR']
-            train_df=train_df.drop(columns=['INR','Date','date'],axis=1)
+            # Read training and testing data as pandas DataFrames unless they were handed over in memory
+            train_df=train_path if isinstance(train_path,pd.DataFrame) else read_dataset(train_path)
+            test_df=test_path if isinstance(test_path,pd.DataFrame) else read_dataset(test_path)
 
-            target_feature_test_df=test_df['INR']
-            test_df=test_df.drop(columns=['INR','Date','date'],axis=1)
+            logger.info("Reading the train and test file")
 
-            # logging.info("Applying Preprocessing on training and test dataframe")
+            logger.info("Applying Preprocessing on training and test dataframe")
 
-            # Combine features and target feature back into NumPy arrays
-            train_arr = np.c_[train_df,np.array(target_feature_train_df)]
-            test_arr = np.c_[test_df,np.array(target_feature_test_df)]
+            train_arr = self.transform_frame(train_df)
+            test_arr = self.transform_frame(test_df)
 
             return (
                 train_arr,
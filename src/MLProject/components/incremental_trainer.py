@@ -0,0 +1,151 @@
+import os, sys
+from src.MLProject.logger import get_logger
+from src.MLProject.exception import CustomException
+from src.MLProject.components.data_transformation import DataTransformation
+from src.MLProject.components.model_trainer import ModelTrainer
+from src.MLProject.model_registry import model_registry
+from src.MLProject.utils import load_object
+from dataclasses import dataclass
+from sklearn.ensemble import RandomForestRegressor, ExtraTreesRegressor
+from sklearn.metrics import mean_squared_error
+import numpy as np, pandas as pd
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class IncrementalTrainerConfig:
+    """
+    This dataclass holds the policy for updating the current model instead of retraining it.
+    """
+
+    trees_per_update:int = int(os.environ.get("MLPROJECT_INCREMENTAL_TREES", 25))
+    # Number of trees fitted on the newest rows at every update.
+
+    max_trees:int = int(os.environ.get("MLPROJECT_INCREMENTAL_MAX_TREES", 400))
+    # Size cap of the forest; beyond it the oldest trees are replaced by the new ones. A published
+    # forest never grows past its own size either, so it stays within the budgets it was selected for.
+
+    window_rows:int = int(os.environ.get("MLPROJECT_INCREMENTAL_WINDOW_ROWS", 1000))
+    # Number of most recent rows (by Date) the new trees are fitted and evaluated on.
+
+    max_updates_before_retrain:int = int(os.environ.get("MLPROJECT_INCREMENTAL_MAX_UPDATES", 30))
+    # Incremental updates allowed since the last full retrain before a full retrain is forced.
+
+    max_rmse_degradation:float = float(os.environ.get("MLPROJECT_INCREMENTAL_MAX_DEGRADATION", 0.25))
+    # Relative RMSE increase of the updated model over the current one, on the held-out new rows,
+    # that rejects the update and forces a full retrain.
+
+    holdout_fraction:float = float(os.environ.get("MLPROJECT_INCREMENTAL_HOLDOUT", 0.2))
+    # Fraction of the newly uploaded rows (the newest ones, at least one) held out to evaluate the update.
+
+
+class IncrementalTrainer:
+    """
+    This class extends the current forest with warm-started trees fitted on a sliding window of recent rows.
+    """
+
+    def __init__(self):
+        """
+        Initialize the incremental trainer with a default configuration.
+        """
+        self.incremental_trainer_config = IncrementalTrainerConfig()
+        self.model_trainer = ModelTrainer()
+
+    def full_retrain_reason(self):
+        """
+        Checks the policy for whether the next update has to be a full retrain.
+
+        Returns:
+            str or None: Why a full retrain is needed, or None if an incremental update is allowed.
+        """
+        version = model_registry.current_version()
+        if version is None:
+            return "no published model"
+
+        metadata = model_registry.metadata(version)
+        if metadata.get("updates_since_full_retrain", 0) >= self.incremental_trainer_config.max_updates_before_retrain:
+            return "maximum incremental updates reached"
+
+        return None
+
+    def initiate_incremental_training(self,dataset,new_rows):
+        """
+        Adds trees fitted on the newest rows of the stored dataset to the current model and publishes it.
+
+        The update is evaluated on rows neither model has seen: the newest of the
+        uploaded rows (holdout_fraction of them, at least one) are left out of the
+        fit, and the updated and the current model are both scored on them. Held-out
+        rows are learned by the next update or full retrain.
+
+        Args:
+            dataset (pandas.DataFrame): The full dataset, new rows included.
+            new_rows (pandas.DataFrame): The uploaded rows that were appended to it.
+
+        Returns:
+            tuple: The updated model's RMSE on the held-out new rows, and None, or None and
+            the reason a full retrain is required instead.
+
+        Raises:
+            CustomException: If an error occurs during the update.
+        """
+        try:
+            config = self.incremental_trainer_config
+
+            version = model_registry.current_version()
+            metadata = model_registry.metadata(version) if version else {}
+            model = load_object(model_registry.model_path(version)) if version else None
+            if not isinstance(model, (RandomForestRegressor, ExtraTreesRegressor)):
+                return None, "current model does not support warm start"
+
+            # Order by date and hold out the newest uploaded rows; an uploaded row replaces a
+            # stored one with the same Date, so it is new to the current model either way
+            ordered = dataset.assign(_date=pd.to_datetime(dataset['Date'], format='%Y-%m-%d')).sort_values('_date')
+            is_new = ordered['_date'].isin(pd.to_datetime(new_rows['Date'], format='%Y-%m-%d'))
+            new_index = ordered.index[is_new.values]
+            holdout_index = new_index[len(new_index) - max(int(len(new_index) * config.holdout_fraction), 1):]
+            if len(holdout_index) == 0:
+                return None, "no new rows to evaluate the update on"
+
+            ordered = ordered.drop(columns=['_date'])
+            transformation = DataTransformation()
+            test_arr = transformation.transform_frame(ordered.loc[holdout_index])
+            train_arr = transformation.transform_frame(ordered.drop(index=holdout_index).tail(config.window_rows))
+
+            # Score the current model before the warm start changes it in place
+            current_rmse = np.sqrt(mean_squared_error(test_arr[:,-1], model.predict(test_arr[:,:-1])))
+
+            # Fit the new trees on a sliding window of the most recent rows
+            logger.info("Adding warm-started trees", extra={"window_rows": len(train_arr), "holdout_rows": len(test_arr), "trees": config.trees_per_update})
+
+            n_trees = len(model.estimators_)
+            model.set_params(warm_start=True, n_estimators=n_trees + config.trees_per_update)
+            model.fit(train_arr[:,:-1], train_arr[:,-1])
+
+            # Replace the oldest trees once the forest exceeds its size cap
+            max_trees = min(config.max_trees, n_trees)
+            if len(model.estimators_) > max_trees:
+                model.estimators_ = model.estimators_[-max_trees:]
+            model.set_params(warm_start=False, n_estimators=len(model.estimators_))
+
+            rmse = np.sqrt(mean_squared_error(test_arr[:,-1], model.predict(test_arr[:,:-1])))
+
+            # Give up on the update if it is much worse than the current model on the same rows
+            if rmse > current_rmse * (1 + config.max_rmse_degradation):
+                return None, f"RMSE {rmse:.4f} on new rows degraded beyond {config.max_rmse_degradation:.0%} of the current model's {current_rmse:.4f}"
+
+            self.model_trainer.publish_model(model, {
+                "model_name": metadata.get("model_name", type(model).__name__),
+                "rmse": float(rmse),
+                "current_model_rmse": float(current_rmse),
+                "holdout_rows": len(test_arr),
+                "training_mode": "incremental",
+                "baseline_rmse": metadata.get("baseline_rmse", metadata.get("rmse")),
+                "updates_since_full_retrain": metadata.get("updates_since_full_retrain", 0) + 1,
+                "n_estimators": len(model.estimators_),
+            })
+
+            return rmse, None
+
+        except Exception as e:
+            raise CustomException(e,sys)
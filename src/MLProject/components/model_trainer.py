@@ -1,11 +1,19 @@
 import os, sys
-from src.MLProject.logger import logging
+import time
+from src.MLProject.logger import get_logger
 from src.MLProject.exception import CustomException
 from sklearn.ensemble import RandomForestRegressor
 import numpy as np
-from src.MLProject.utils import save_object, evaluate_models
+from src.MLProject.utils import evaluate_models, serialized_size
+from src.MLProject.pipelines.prediction_pipeline import PredictPipelineConfig
+from src.MLProject.model_registry import model_registry
+from src.MLProject.compiled_forest import CompiledForest, COMPILED_FILE_NAME, check_equivalence
 from dataclasses import dataclass
+from sklearn.base import clone
 from sklearn.metrics import mean_squared_error
+from sklearn.model_selection import train_test_split
+
+logger = get_logger(__name__)
 
 @dataclass
 class ModelTrainerConfig:
@@ -14,7 +22,26 @@ class ModelTrainerConfig:
     """
 
     trained_model_file_path = os.path.join('artifacts','model.pkl')
-    # Path to the file where the trained model will be saved.
+    # Legacy single-file model path, still served when the registry has no published version.
+
+    n_jobs:int = int(os.environ.get("MLPROJECT_TRAIN_N_JOBS", -1))
+    # Number of worker processes used for the hyperparameter search (-1 uses every core).
+
+    latency_budget_ms:float = float(os.environ.get("MLPROJECT_LATENCY_BUDGET_MS", 50))
+    # p99 single-row prediction latency allowed on the serving engine (0 disables the budget).
+
+    size_budget_mb:float = float(os.environ.get("MLPROJECT_SIZE_BUDGET_MB", 256))
+    # Size allowed for the published artifacts, model.pkl plus compiled.pkl (0 disables the budget).
+
+    latency_samples:int = int(os.environ.get("MLPROJECT_LATENCY_SAMPLES", 500))
+    # Single-row predictions timed per candidate to estimate its latency percentiles.
+
+    validation_fraction:float = float(os.environ.get("MLPROJECT_VALIDATION_FRACTION", 0.2))
+    # Share of the training rows held out to compare candidates; the test rows only score the chosen one.
+
+    latency_rounds:int = int(os.environ.get("MLPROJECT_LATENCY_ROUNDS", 5))
+    # Rounds the samples are split into; the budget is checked against the median of the rounds'
+    # p99, so a burst of serving traffic during one round does not decide the selection.
 
 
 class ModelTrainer:
@@ -27,6 +54,9 @@ class ModelTrainer:
         Initialize the model trainer with a default configuration.
         """
         self.model_trainer_config = ModelTrainerConfig()
+        self.model_version = None
+        self.model_path = None
+        self.selection = None
     
     def initiate_model_trainer(self,train_arr,test_arr):
         """
@@ -36,14 +66,21 @@ class ModelTrainer:
             train_arr (np.array): The training data as a NumPy array.
             test_arr (np.array): The testing data as a NumPy array.
 
+        Every candidate is scored on its RMSE on a validation split of the training
+        rows, single-row latency and artifact size, and the most accurate one within
+        the latency and size budgets is refit on all training rows and published. The
+        test rows are used only to score that model, so its test RMSE stays unbiased.
+
         Returns:
-            float: The root mean squared error (RMSE) of the best model on the test data.
+            float: The root mean squared error (RMSE) of the selected model on the test data.
+            The published version and its model path are stored on model_version and model_path,
+            and the selection trade-off on selection.
 
         Raises:
             CustomException: If an error occurs during training or evaluation.
         """
         try:
-            # logging.info("Split train and test input data")
+            logger.info("Split train and test input data")
 
             # Separate features and target values from training and testing data
             X_train,y_train,X_test,y_test=(
@@ -53,48 +90,202 @@ class ModelTrainer:
                 test_arr[:,-1]
             )
 
-            # Define a dictionary containing candidate models (here, RandomForestRegressor)
-            models={
-                "RandomForest": RandomForestRegressor()
+            # Candidate forests of decreasing inference cost: fewer and shallower trees
+            # predict faster and publish smaller artifacts, usually for a little accuracy
+            sizes={
+                "RandomForest":{'n_estimators':[400], 'max_depth':[None]},
+                "RandomForest-200":{'n_estimators':[200], 'max_depth':[None]},
+                "RandomForest-100":{'n_estimators':[100], 'max_depth':[None]},
+                "RandomForest-50-depth12":{'n_estimators':[50], 'max_depth':[12]},
             }
 
+            # Define a dictionary containing candidate models (here, RandomForestRegressor)
+            models={name: RandomForestRegressor() for name in sizes}
+
             # Define hyperparameter grids for each model in another dictionary
             params={
-                "RandomForest":{
-                    'n_estimators':[400],
+                name:{
                     'min_samples_split':[2],
                     'min_samples_leaf':[1],
                     'max_features':['sqrt'],
-                    'max_depth':[None],
-                    'bootstrap':[False]
+                    'bootstrap':[False],
+                    **size
                 }
+                for name, size in sizes.items()
             }
 
+            # Hold out part of the training rows to compare the candidates on
+            X_fit,X_val,y_fit,y_val=train_test_split(
+                X_train,y_train,test_size=self.model_trainer_config.validation_fraction,random_state=42
+            )
+
             # Use the evaluate_models function to evaluate all models with their hyperparameter grids
-            model_report:dict = evaluate_models(X_train,y_train,X_test,y_test,models,params)
+            model_report:dict = evaluate_models(X_fit,y_fit,X_val,y_val,models,params,n_jobs=self.model_trainer_config.n_jobs)
 
-             # Find the model with the best score (lowest RMSE) based on the evaluation report
-            best_model_score = max(sorted(model_report.values()))
+            # Measure what each candidate costs to serve
+            costs = {name: self.measure_candidate(models[name], X_val) for name in models}
 
-            # Save the best model to the specified path using the save_object function
-            best_model_name = list(model_report.keys())[
-                list(model_report.values()).index(best_model_score)
-            ]
-            
-            # Make predictions on the test data using the best model
-            best_model = models[best_model_name]
+            # Pick the lowest validation RMSE among the candidates within the latency and size budgets
+            self.selection = self.select_model(model_report, costs)
+            best_model_name = self.selection["model_name"]
 
-            # logging.info("Best model found")
+            logger.info("Best model found", extra={
+                "model_name": best_model_name,
+                "validation_rmse": self.selection["validation_rmse"],
+                "latency_p99_ms": self.selection["latency_p99_ms"],
+                "artifact_mb": self.selection["artifact_mb"],
+                "within_budget": self.selection["within_budget"],
+            })
 
-            save_object(
-                file_path=self.model_trainer_config.trained_model_file_path,
-                obj=best_model
-            )
+            # Refit the chosen model on every training row, using the search's cores
+            best_model = clone(models[best_model_name]).set_params(n_jobs=self.model_trainer_config.n_jobs)
+            best_model.fit(X_train,y_train)
+            best_model.set_params(n_jobs=None)
 
+            # Calculate the root mean squared error (RMSE) of the chosen model on the test data
             predicted=best_model.predict(X_test)
-            
-            # Calculate the root mean squared error (RMSE) on the test data
-            return np.sqrt(mean_squared_error(y_test,predicted))
+            rmse = np.sqrt(mean_squared_error(y_test,predicted))
+            self.selection["test_rmse"] = float(rmse)
+
+            # Publish the best model as a new registry version and make it current
+            self.publish_model(best_model, {"model_name": best_model_name, "rmse": float(rmse), "selection": self.selection})
+
+            return rmse
 
         except Exception as e:
-            raise CustomException(e,sys)
\ No newline at end of file
+            raise CustomException(e,sys)
+
+    def measure_candidate(self, model, X):
+        """
+        Measures the serving cost of a fitted model.
+
+        Latency is timed one row at a time on the engine serving is configured with
+        (MLPROJECT_PREDICT_ENGINE), in latency_rounds rounds. Training may share the
+        machine with serving traffic, so the reported p99 is the median of the rounds'
+        p99 and the spread between rounds is recorded with it. Size is that of the
+        artifacts publish_model would write, counted without writing them.
+
+        Args:
+            model: The fitted model.
+            X (np.array): Feature rows to time predictions on.
+
+        Returns:
+            dict: latency_p50_ms, latency_p99_ms, the lowest and highest round p99
+            (latency_p99_min_ms, latency_p99_max_ms), latency_samples, model_mb,
+            compiled_mb and artifact_mb (their sum).
+        """
+        config = self.model_trainer_config
+        engine = PredictPipelineConfig().engine
+        compiled = CompiledForest.from_estimator(model) if hasattr(model, "estimators_") else None
+        predictor = compiled if engine == "compiled" and compiled is not None else model
+
+        # Time single-row predictions after one untimed call
+        rows = X[np.arange(config.latency_samples) % len(X)]
+        predictor.predict(rows[:1])
+        latencies = np.empty(len(rows))
+        for i in range(len(rows)):
+            start = time.perf_counter()
+            predictor.predict(rows[i:i+1])
+            latencies[i] = time.perf_counter() - start
+        latencies *= 1000
+
+        rounds = [chunk for chunk in np.array_split(latencies, max(config.latency_rounds, 1)) if len(chunk)]
+        round_p99 = [float(np.percentile(chunk, 99)) for chunk in rounds]
+
+        sizes = {
+            name: round(serialized_size(obj) / (1024 * 1024), 3) if obj is not None else 0.0
+            for name, obj in (("model_mb", model), ("compiled_mb", compiled))
+        }
+
+        return {
+            "latency_p50_ms": round(float(np.percentile(latencies, 50)), 3),
+            "latency_p99_ms": round(float(np.median(round_p99)), 3),
+            "latency_p99_min_ms": round(min(round_p99), 3),
+            "latency_p99_max_ms": round(max(round_p99), 3),
+            "latency_samples": len(latencies),
+            **sizes,
+            "artifact_mb": round(sizes["model_mb"] + sizes["compiled_mb"], 3),
+        }
+
+    def select_model(self, model_report, costs):
+        """
+        Picks the candidate with the lowest validation RMSE among those within the latency and size budgets.
+
+        If no candidate fits, the one exceeding its budgets by the smallest factor is
+        picked and within_budget is False.
+
+        Args:
+            model_report (dict): Validation RMSE of each candidate, from evaluate_models.
+            costs (dict): Serving cost of each candidate, from measure_candidate.
+
+        Returns:
+            dict: The chosen model and its validation RMSE, latency and size, the budgets,
+            the validation RMSE given up against the most accurate candidate, and every
+            candidate's numbers. initiate_model_trainer adds the chosen model's test_rmse.
+        """
+        latency_budget = self.model_trainer_config.latency_budget_ms
+        size_budget = self.model_trainer_config.size_budget_mb
+
+        def budget_ratio(name):
+            # Largest cost-to-budget ratio; at most 1.0 when the candidate fits every budget
+            ratios = [0.0]
+            if latency_budget > 0:
+                ratios.append(costs[name]["latency_p99_ms"] / latency_budget)
+            if size_budget > 0:
+                ratios.append(costs[name]["artifact_mb"] / size_budget)
+            return max(ratios)
+
+        feasible = [name for name in model_report if budget_ratio(name) <= 1.0]
+        if feasible:
+            best_model_name = min(feasible, key=model_report.get)
+        else:
+            best_model_name = min(model_report, key=budget_ratio)
+        most_accurate = min(model_report, key=model_report.get)
+
+        return {
+            "model_name": best_model_name,
+            "engine": PredictPipelineConfig().engine,
+            "validation_rmse": float(model_report[best_model_name]),
+            "latency_p99_ms": costs[best_model_name]["latency_p99_ms"],
+            "artifact_mb": costs[best_model_name]["artifact_mb"],
+            "within_budget": bool(feasible),
+            "latency_budget_ms": latency_budget,
+            "size_budget_mb": size_budget,
+            "most_accurate": most_accurate,
+            "rmse_given_up": float(model_report[best_model_name] - model_report[most_accurate]),
+            "candidates": {
+                name: {"validation_rmse": float(model_report[name]), **costs[name]}
+                for name in model_report
+            },
+        }
+
+    def publish_model(self, model, metadata):
+        """
+        Publishes a trained model as the current registry version.
+
+        Args:
+            model: The fitted model.
+            metadata (dict): Information recorded with the version (model name, RMSE, ...).
+
+        Returns:
+            str: The published version, also stored on model_version (and its path on model_path).
+
+        Raises:
+            ValueError: If the compiled copy of a tree ensemble does not predict like the model.
+        """
+        # Tree ensembles also get a compiled copy whose arrays serving workers memory-map,
+        # published only if it predicts like the model, edge-case inputs included
+        extra_objects = {}
+        if hasattr(model, "estimators_"):
+            compiled = CompiledForest.from_estimator(model)
+            check_equivalence(model, compiled)
+            extra_objects[COMPILED_FILE_NAME] = compiled
+
+        self.model_version = model_registry.publish(
+            model,
+            metadata=metadata,
+            extra_objects=extra_objects
+        )
+        self.model_path = model_registry.model_path(self.model_version)
+
+        return self.model_version
\ No newline at end of file
@@ -0,0 +1,152 @@
+import os
+import sys
+import json
+import shutil
+import numpy as np
+import pandas as pd
+from src.MLProject.exception import CustomException
+from src.MLProject.schema import dataset_dtype
+
+# Supported dataset artifact formats and their file extensions
+ARTIFACT_FORMATS = {
+    'csv': '.csv',
+    'parquet': '.parquet',
+    'feather': '.feather',
+    'npy': '.npy',
+}
+
+# Name of the schema sidecar inside an npy dataset directory
+NPY_SCHEMA_FILE = 'schema.json'
+
+
+def artifact_path(path, fmt):
+    """
+    Returns the path of a dataset artifact in a given format.
+
+    Args:
+        path (str): The artifact path with any extension, e.g. artifacts/train.csv.
+        fmt (str): One of ARTIFACT_FORMATS.
+
+    Returns:
+        str: The path with the extension of fmt.
+    """
+    if fmt not in ARTIFACT_FORMATS:
+        raise ValueError(f"Unknown artifact format: {fmt}")
+    return os.path.splitext(path)[0] + ARTIFACT_FORMATS[fmt]
+
+
+def format_of(path):
+    """
+    Infers the artifact format from a path's extension.
+    """
+    extension = os.path.splitext(path)[1]
+    for fmt, ext in ARTIFACT_FORMATS.items():
+        if ext == extension:
+            return fmt
+    raise ValueError(f"Unknown artifact format for {path}")
+
+
+def apply_dtypes(df):
+    """
+    Casts every column of a dataset to its declared storage dtype.
+
+    Args:
+        df (pandas.DataFrame): Dataset rows.
+
+    Returns:
+        pandas.DataFrame: A copy with explicit dtypes (see schema.DATASET_DTYPES).
+    """
+    columns = {}
+    for column in df.columns:
+        dtype = dataset_dtype(column)
+        if dtype.startswith('datetime64'):
+            columns[column] = pd.to_datetime(df[column], format='%Y-%m-%d').astype(dtype)
+        else:
+            columns[column] = df[column].astype(dtype)
+    return pd.DataFrame(columns, index=df.index)
+
+
+def write_dataset(df, path):
+    """
+    Writes a dataset artifact in the format given by the path's extension.
+
+    Binary formats store explicit dtypes (float64 rates, small-integer calendar
+    columns). The npy format is a directory with one .npy file per column and a
+    JSON schema sidecar, so single columns can be loaded or memory-mapped.
+
+    Args:
+        df (pandas.DataFrame): Dataset rows.
+        path (str): Destination path; its extension selects the format.
+
+    Raises:
+        CustomException: If the dataset cannot be written (e.g. pyarrow is missing for parquet/feather).
+    """
+    try:
+        fmt = format_of(path)
+        tmp_path = path + '.tmp'
+
+        if fmt == 'csv':
+            df.to_csv(tmp_path, index=False, header=True)
+        elif fmt == 'parquet':
+            apply_dtypes(df).to_parquet(tmp_path, index=False)
+        elif fmt == 'feather':
+            apply_dtypes(df).reset_index(drop=True).to_feather(tmp_path)
+        else:
+            typed = apply_dtypes(df)
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            os.makedirs(tmp_path)
+            schema = {'rows': len(typed), 'columns': []}
+            for column in typed.columns:
+                np.save(os.path.join(tmp_path, f'{column}.npy'), typed[column].to_numpy())
+                schema['columns'].append({'name': column, 'dtype': str(typed[column].dtype)})
+            with open(os.path.join(tmp_path, NPY_SCHEMA_FILE), 'w') as file_obj:
+                json.dump(schema, file_obj, indent=2)
+
+        # Swap the finished artifact into place so readers never see a partial one
+        if os.path.isdir(tmp_path):
+            shutil.rmtree(path, ignore_errors=True)
+            os.rename(tmp_path, path)
+        else:
+            os.replace(tmp_path, path)
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+def read_dataset(path, columns=None, mmap=False):
+    """
+    Reads a dataset artifact written by write_dataset (or any CSV file).
+
+    Args:
+        path (str): The artifact path; its extension selects the format.
+        columns (list): Optional subset of columns to load.
+        mmap (bool): For npy and feather artifacts, map the file instead of reading it
+            into memory (npy columns become read-only memory maps).
+
+    Returns:
+        pandas.DataFrame: The dataset.
+
+    Raises:
+        CustomException: If the dataset cannot be read.
+    """
+    try:
+        fmt = format_of(path)
+
+        if fmt == 'csv':
+            return pd.read_csv(path, usecols=columns)
+        if fmt == 'parquet':
+            return pd.read_parquet(path, columns=columns)
+        if fmt == 'feather':
+            from pyarrow import feather
+            return feather.read_table(path, columns=columns, memory_map=mmap).to_pandas()
+
+        with open(os.path.join(path, NPY_SCHEMA_FILE)) as file_obj:
+            schema = json.load(file_obj)
+        names = columns or [column['name'] for column in schema['columns']]
+        return pd.DataFrame({
+            name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r' if mmap else None)
+            for name in names
+        }, copy=False)
+
+    except Exception as e:
+        raise CustomException(e, sys)
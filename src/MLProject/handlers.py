@@ -0,0 +1,297 @@
+import os
+import sys
+import json
+from src.MLProject.exception import CustomException
+from src.MLProject.pipelines.prediction_pipeline import PredictPipeline, CustomData, CustomDataJSONBatch, CustomDataStream
+from src.MLProject.pipelines.batching import micro_batcher
+from src.MLProject.schema import TRAINING_COLUMNS, TRAINING_DATE_FORMAT, PREDICTION_DATE_FORMAT
+from src.MLProject.upload_parser import read_upload, read_records, UploadSchemaError
+from src.MLProject.metrics import timed
+from src.MLProject.serving import serving_state
+from src.MLProject.admission import admission
+
+# Request handling shared by the Flask app (app.py) and the ASGI app (asgi.py).
+# Every handler takes already-read request data and returns a (body, status_code,
+# headers) tuple; the apps only read requests and turn these tuples into responses.
+
+# Response content types for streaming CSV prediction
+STREAM_FORMATS = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+# Serving modes: "full" serves training and prediction, "predict" only prediction.
+# The training code (pipelines, components, scikit-learn's model selection) is
+# imported on the first training request, so a prediction-only worker never loads it.
+APP_MODES = ('full', 'predict')
+
+
+def app_mode():
+    """
+    Returns the serving mode set with MLPROJECT_APP_MODE (see APP_MODES).
+
+    Raises:
+        ValueError: If the mode is not one of APP_MODES.
+    """
+    mode = os.environ.get('MLPROJECT_APP_MODE', 'full')
+    if mode not in APP_MODES:
+        raise ValueError(f"MLPROJECT_APP_MODE must be one of {list(APP_MODES)}")
+    return mode
+
+
+def error(data, status_code=400, message="Error", headers=None):
+    """
+    Builds an error result in the apps' response format.
+    """
+    res={
+        "status":False,
+        "message":message,
+        "data":data
+    }
+    return res, status_code, headers or {}
+
+
+def internal_error(e):
+    """
+    Builds the result the Flask app's CustomException handler returns for an unexpected error.
+    """
+    return error(str(CustomException(e,sys).error_message), 200, "Error!")
+
+
+def too_large(message="Error"):
+    """
+    Builds the result for a body over the size limit (the training route uses the message "Error!").
+    """
+    return error('File size exceeds 5 MB', 413, message)
+
+
+def check_upload(filename, field):
+    """
+    Checks the file field of a multipart upload.
+
+    Args:
+        filename (str): The uploaded file's name, or None when the field is missing.
+        field (str): The expected field name, "train_file" or "test_file".
+
+    Returns:
+        tuple or None: The 400 result, or None if the upload can be parsed.
+    """
+    if not filename:
+        return error(f"No file uploaded or filename is not '{field}'")
+    if not filename.endswith('.csv'):
+        return error("Only CSV files allowed")
+    return None
+
+
+def check_stream_format(stream_format):
+    """
+    Returns the 400 result for an unknown ?stream= format, or None.
+    """
+    if stream_format not in STREAM_FORMATS:
+        return error(f"stream must be one of {sorted(STREAM_FORMATS)}")
+    return None
+
+
+def predict_csv(upload):
+    """
+    Predicts an uploaded CSV file.
+
+    Args:
+        upload (file object): The binary stream of the uploaded file (or an object with a .stream).
+    """
+    data = CustomData(upload).arr
+    prediction = PredictPipeline().predict(data)
+    res={
+        "status":True,
+        "message":"Prediction done successfully",
+        "data":prediction.tolist()
+    }
+    return res, 200, {}
+
+
+def predict_json(data):
+    """
+    Validates and predicts a JSON prediction body.
+
+    The body may be a single record, a list of records, or a columnar object of
+    arrays. The whole batch is validated at once and scored with one predict call.
+
+    Args:
+        data: The decoded JSON body.
+    """
+    # Check if the request has any data
+    if not data or not isinstance(data, (dict, list)):
+        return error('Invalid JSON data')
+
+    # Normalize and validate the records in one pass over the batch
+    try:
+        batch = CustomDataJSONBatch(data)
+    except ValueError as e:
+        # Raised for columnar objects whose arrays have different lengths
+        return error(f'Invalid JSON data: {e}')
+
+    # Report validation errors per row
+    if batch.errors:
+        if batch.is_single and list(batch.errors[0]) == ['row', 'missing_keys']:
+            return error(f"Missing keys in JSON data: {batch.errors[0]['missing_keys']}")
+        return error(batch.errors)
+
+    # Coalesce single-row requests with concurrent ones when micro-batching is enabled,
+    # otherwise use the PredictPipeline to generate predictions for the whole batch
+    if micro_batcher.config.enabled and len(batch.arr) == 1:
+        prediction = micro_batcher.predict(batch.arr[0])
+    else:
+        prediction = PredictPipeline().predict(batch.arr)
+
+    res={
+        "status":True,
+        "message":"Prediction done successfully",
+        "data":prediction.tolist()
+    }
+    return res, 200, {}
+
+
+def stream_predictions(upload, stream_format):
+    """
+    Predicts an uploaded CSV file chunk by chunk and yields the results as they are ready.
+
+    Args:
+        upload (file object): The binary stream of the uploaded CSV file; closed when done.
+        stream_format (str): "ndjson" for one JSON object per row, "csv" for a single prediction column.
+
+    Yields:
+        str: Serialized predictions for one chunk (an error line if a chunk fails).
+    """
+    row = 0
+    pipeline = PredictPipeline()
+    try:
+        if stream_format == 'csv':
+            yield 'prediction\n'
+
+        for data in CustomDataStream(upload):
+            prediction = pipeline.predict(data)
+
+            with timed('serialize'):
+                if stream_format == 'csv':
+                    body = ''.join(f'{value!r}\n' for value in prediction.tolist())
+                else:
+                    body = ''.join(
+                        json.dumps({"row": row + i, "prediction": value}) + '\n'
+                        for i, value in enumerate(prediction.tolist())
+                    )
+            yield body
+            row += len(prediction)
+
+    except Exception as e:
+        # Headers are already sent, so report the failure in-band and stop
+        error_message = CustomException(e,sys).error_message
+        res = {"status": False, "message": "Error!", "row": row, "data": str(error_message)}
+        yield json.dumps(res) + '\n'
+
+    finally:
+        upload.close()
+
+
+def train_csv(upload, mode):
+    """
+    Parses an uploaded training CSV file and queues a job for it.
+
+    Raises:
+        UploadSchemaError: If the file does not have the training columns.
+    """
+    df = read_upload(upload, TRAINING_COLUMNS, (TRAINING_DATE_FORMAT, PREDICTION_DATE_FORMAT))
+    return submit_training(df, mode)
+
+
+def train_json(data, mode):
+    """
+    Validates JSON training rows and queues a job for them.
+
+    The body is one training row or a list of rows. Rows are parsed with the CSV
+    upload's column aliases, date formats and dtypes, so a row that could not be
+    trained on is rejected here rather than in the job.
+
+    Args:
+        data: The decoded JSON body.
+        mode (str): "full" or "incremental" training.
+    """
+    # Check if the request has any data
+    if not data:
+        return error('Invalid JSON data')
+
+    # Training rows need the same columns as a training CSV, including Date and the INR target
+    records = data if isinstance(data, list) else [data]
+    try:
+        df = read_records(records, TRAINING_COLUMNS, (TRAINING_DATE_FORMAT, PREDICTION_DATE_FORMAT))
+    except UploadSchemaError as e:
+        return error(str(e))
+
+    return submit_training(df, mode)
+
+
+def submit_training(df, mode):
+    """
+    Queues a training job for a DataFrame and builds the "accepted" result.
+
+    Args:
+        df (pandas.DataFrame): The training data.
+        mode (str): "full" or "incremental" training.
+
+    Returns:
+        tuple: The job id and status URL (202), 400 for an unknown mode, or 429 if the training queue is full.
+    """
+    # Imported on first use: loading the training pipeline pulls in every training component
+    from src.MLProject.pipelines.training_jobs import training_jobs, TrainingQueueFull
+    from src.MLProject.pipelines.training_pipeline import TRAINING_MODES
+
+    if mode not in TRAINING_MODES:
+        return error(f"mode must be one of {list(TRAINING_MODES)}")
+
+    try:
+        job, created = training_jobs.submit(df, mode)
+    except TrainingQueueFull as e:
+        return error(f"Training queue is full, retry later ({e})", 429,
+                     headers={"Retry-After": str(admission.config.training_retry_after)})
+
+    res={
+        "status":True,
+        "message":"Training job submitted" if created else "Training job already in progress",
+        "data":{
+            "job_id":job["job_id"],
+            "state":job["state"],
+            "mode":mode,
+            "status_url":f"/currencytraining/{job['job_id']}"
+        }
+    }
+    return res, 202, {}
+
+
+def training_status(job_id):
+    """
+    Reports the stage, elapsed time and, once finished, the RMSE and model version of a training job.
+
+    Returns:
+        tuple: The job status, or 404 if the job is unknown.
+    """
+    from src.MLProject.pipelines.training_jobs import training_jobs
+
+    job = training_jobs.status(job_id)
+    if job is None:
+        return error(f"Unknown training job '{job_id}'", 404)
+
+    res={
+        "status":True,
+        "message":f"Training job {job['state']}",
+        "data":job
+    }
+    return res, 200, {}
+
+
+def readiness():
+    """
+    Reports whether this process has warmed a model and can take traffic: 200 when ready, 503 otherwise.
+    """
+    status = serving_state.status()
+    res={
+        "status":status["ready"],
+        "message":"Ready" if status["ready"] else "Not ready",
+        "data":status
+    }
+    return res, 200 if status["ready"] else 503, {}
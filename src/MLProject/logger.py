@@ -1,25 +1,231 @@
-import logging
 import os
-from datetime import datetime 
+import json
+import time
+import queue
+import atexit
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+
+@dataclass
+class LoggingConfig:
+    """
+    This dataclass holds configuration settings for the logging subsystem.
+    """
+
+    # Directory of the log files.
+    log_dir:str = os.environ.get("MLPROJECT_LOG_DIR", os.path.join(os.getcwd(), "logs"))
+
+    # Log file name; "{pid}" is replaced by the process id, which gives every
+    # worker of a multi-process server its own file (rotation is per process).
+    file_name:str = os.environ.get("MLPROJECT_LOG_FILE", "mlproject.log")
+
+    # Level of the root logger.
+    level:str = os.environ.get("MLPROJECT_LOG_LEVEL", "INFO")
+
+    # Per-module levels, e.g. "src.MLProject.components=DEBUG,werkzeug=WARNING".
+    module_levels:str = os.environ.get("MLPROJECT_LOG_LEVELS", "werkzeug=WARNING")
+
+    # Size in bytes at which the log file is rotated, and how many rotated files are kept.
+    max_bytes:int = int(os.environ.get("MLPROJECT_LOG_MAX_BYTES", 10 * 1024 * 1024))
+    backup_count:int = int(os.environ.get("MLPROJECT_LOG_BACKUPS", 5))
+
+    # Records allowed to wait for the writer thread; beyond that new records are dropped, never waited for.
+    queue_size:int = int(os.environ.get("MLPROJECT_LOG_QUEUE_SIZE", 10000))
+
+    # Also write the JSON lines to stderr (e.g. when a container collects stdout/stderr).
+    console:bool = os.environ.get("MLPROJECT_LOG_CONSOLE", "0") == "1"
+
+
+# Request id of the code currently running, set per request by the Flask app
+request_id_var = contextvars.ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else was passed with extra= and is written as a field
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    This class formats log records as one JSON object per line.
+
+    Standard fields are ts, level, logger, message, pid and thread; request_id is added
+    when the record was logged during a request, and every extra= field (e.g. stage,
+    duration_ms) is copied as is.
+    """
+
+    def format(self, record):
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created)) + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "pid": record.process,
+            "thread": record.threadName,
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and value is not None:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    This class hands records to the writer thread without ever blocking the caller.
+
+    Unlike QueueHandler, the record is not formatted on the calling thread: only the
+    message is interpolated and the request id captured, since both depend on state
+    that may change before the writer thread runs. When the queue is full the record
+    is dropped and counted instead of waiting for the disk.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        if getattr(record, "request_id", None) is None:
+            record.request_id = request_id_var.get()
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+# State of the configured subsystem, rebuilt in forked children
+_state = {"config": None, "handler": None, "listener": None, "pid": None}
+_state_lock = threading.Lock()
+
+
+def _file_handler(config):
+    os.makedirs(config.log_dir, exist_ok=True)
+    path = os.path.join(config.log_dir, config.file_name.replace("{pid}", str(os.getpid())))
+    handler = RotatingFileHandler(path, maxBytes=config.max_bytes, backupCount=config.backup_count, delay=True)
+    handler.setFormatter(JsonFormatter())
+    return handler
+
+
+def _start_listener(config):
+    """
+    Creates a fresh queue and writer thread for this process and points the queue handler at it.
+    """
+    log_queue = queue.Queue(maxsize=config.queue_size)
+    handlers = [_file_handler(config)]
+    if config.console:
+        console = logging.StreamHandler()
+        console.setFormatter(JsonFormatter())
+        handlers.append(console)
+
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+
+    if _state["handler"] is None:
+        _state["handler"] = NonBlockingQueueHandler(log_queue)
+    else:
+        _state["handler"].queue = log_queue
+    _state["listener"] = listener
+    _state["pid"] = os.getpid()
+
+
+def configure_logging(config=None):
+    """
+    Sets up queue-based JSON logging for the process; calling it again has no effect.
+
+    The root logger gets a NonBlockingQueueHandler and a background QueueListener
+    writes the records to a size-rotated file, so logging calls never wait for I/O.
+
+    Args:
+        config (LoggingConfig): Optional configuration, defaults to LoggingConfig().
+    """
+    with _state_lock:
+        if _state["config"] is not None:
+            return
+        config = config or LoggingConfig()
+        _state["config"] = config
+        _start_listener(config)
+
+        root = logging.getLogger()
+        root.addHandler(_state["handler"])
+        root.setLevel(config.level.upper())
+        for item in filter(None, (part.strip() for part in config.module_levels.split(","))):
+            name, _, level = item.partition("=")
+            logging.getLogger(name.strip()).setLevel(level.strip().upper())
+
+
+def restart_listener():
+    """
+    Starts a new writer thread in a forked child, where the parent's thread does not exist.
+    """
+    with _state_lock:
+        if _state["config"] is not None and _state["pid"] != os.getpid():
+            _start_listener(_state["config"])
+
+
+def shutdown_logging():
+    """
+    Writes the queued records and stops the writer thread.
+    """
+    with _state_lock:
+        listener = _state["listener"]
+        if listener is not None and _state["pid"] == os.getpid():
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+        _state["listener"] = None
+
+
+def dropped_records():
+    """
+    Returns how many records were dropped because the queue was full.
+    """
+    return _state["handler"].dropped if _state["handler"] is not None else 0
+
+
+def get_logger(name):
+    """
+    Returns the logger of a module, configuring the subsystem on first use.
+
+    Args:
+        name (str): Usually __name__; per-module levels match on this name and its parents.
+    """
+    configure_logging()
+    return logging.getLogger(name)
 
-# # Define the log file name dynamically based on current date and time
-# LOG_FILE = f"{datetime.now().strftime('%m_%d_%Y_%H_%M_%S')}.log"
 
-# # Construct the log file path by joining current working directory, "logs" folder, and the log file name
-# log_path = os.path.join(os.getcwd(),"logs",LOG_FILE)
+@contextmanager
+def log_stage(logger, stage, level=logging.INFO, **fields):
+    """
+    Logs the end of a stage with its duration (and any extra fields) as structured data.
 
-# # Create the "logs" directory if it doesn't exist (avoiding errors)
-# os.makedirs(log_path,exist_ok=True)
+    Args:
+        logger (logging.Logger): The module's logger.
+        stage (str): The stage name, written as the "stage" field.
+        level (int): The level of the record.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if logger.isEnabledFor(level):
+            duration_ms = round((time.perf_counter() - start) * 1000, 3)
+            logger.log(level, f"{stage} finished", extra={"stage": stage, "duration_ms": duration_ms, **fields})
 
-# # Combine the path to the "logs" directory and the log file name for full path
-# LOG_FILE_PATH = os.path.join(log_path,LOG_FILE)
 
-# # Configure basic logging with the following settings:
-# # - Log file: Use the constructed LOG_FILE_PATH
-# # - Format: Include timestamp, line number, logger name, log level, and message
-# # - Level: Set log level to INFO (will capture informational and higher severity messages)
-# logging.basicConfig(
-#     filename=LOG_FILE_PATH,
-#     format="[ %(asctime)s ] %(lineno)d %(name)s - %(levelname)s - %(message)s",
-#     level=logging.INFO,
-# )
\ No newline at end of file
+atexit.register(shutdown_logging)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=restart_listener)
@@ -0,0 +1,224 @@
+import math
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+
+# Default histogram buckets in seconds, from 100us to 60s
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
+
+
+def _format_labels(labelnames, labelvalues, extra=None):
+    pairs = list(zip(labelnames, labelvalues))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class Counter:
+    """
+    This class counts events, optionally per label set.
+    """
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        """
+        Adds amount to the counter of the given label values.
+        """
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """
+    This class records a distribution of observations in fixed buckets, optionally per label set.
+
+    An observation costs one bisect and a few additions under a lock, so it is
+    cheap enough for every request.
+    """
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        """
+        Records one observation for the given label values.
+        """
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # Per-bucket counts (the last one is +Inf), then the sum of observations
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """
+        Observes the wall-clock seconds spent in the with block.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((key, list(values)) for key, values in self._series.items())
+        for key, values in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), values[:-1]):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(values[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    This class holds the process's metrics and renders them in the Prometheus text format.
+
+    Besides counters and histograms, collectors can be registered: callables that
+    return (name, type, documentation, value) tuples read at scrape time, e.g.
+    from the stats() of the model and prediction caches.
+    """
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def counter(self, name, documentation, labelnames=()):
+        metric = Counter(name, documentation, labelnames)
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        metric = Histogram(name, documentation, labelnames, buckets)
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector):
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self):
+        """
+        Returns every metric in the Prometheus text exposition format.
+        """
+        lines = []
+        for metric in list(self._metrics):
+            lines.extend(metric.render())
+        for collector in list(self._collectors):
+            for name, metric_type, documentation, value in collector():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def stats_collector(prefix, stats_fn, counters=()):
+    """
+    Builds a collector that exposes the numeric fields of a stats() dict.
+
+    Args:
+        prefix (str): Metric name prefix, e.g. "mlproject_prediction_cache".
+        stats_fn (callable): Returns the stats dict.
+        counters (tuple): Fields that only ever increase; exposed as counters named <prefix>_<field>_total.
+
+    Returns:
+        callable: A collector for MetricsRegistry.register_collector.
+    """
+    def collect():
+        for field, value in stats_fn().items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            if field in counters:
+                yield f"{prefix}_{field}_total", "counter", f"{field} ({prefix})", value
+            else:
+                yield f"{prefix}_{field}", "gauge", f"{field} ({prefix})", value
+    return collect
+
+
+# Process-wide registry; in a multi-process server every worker exposes its own metrics
+registry = MetricsRegistry()
+
+stage_seconds = registry.histogram(
+    "mlproject_stage_seconds",
+    "Seconds spent in each serving stage (upload_parse, date_features, validation, model_load, predict, serialize)",
+    ("stage",),
+)
+
+training_stage_seconds = registry.histogram(
+    "mlproject_training_stage_seconds",
+    "Seconds spent in each training stage (ingestion, transformation, training)",
+    ("stage",),
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0),
+)
+
+http_requests = registry.counter(
+    "mlproject_http_requests_total",
+    "HTTP requests by endpoint and status code",
+    ("endpoint", "status"),
+)
+
+http_request_seconds = registry.histogram(
+    "mlproject_http_request_seconds",
+    "Seconds from the start of a request until its response is returned (streamed bodies excluded)",
+    ("endpoint",),
+)
+
+admission_queue_seconds = registry.histogram(
+    "mlproject_admission_queue_seconds",
+    "Seconds admitted requests waited for a slot of their route class (predict, training)",
+    ("route_class",),
+)
+
+
+def timed(stage):
+    """
+    Context manager that observes the seconds spent in a serving stage.
+
+    Args:
+        stage (str): The stage label, e.g. "predict".
+    """
+    return stage_seconds.time(stage=stage)
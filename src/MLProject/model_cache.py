@@ -0,0 +1,181 @@
+import os
+import sys
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from src.MLProject.exception import CustomException
+from src.MLProject.utils import load_object
+from src.MLProject.metrics import registry, stats_collector, timed
+
+
+@dataclass
+class ModelCacheConfig:
+    """
+    This dataclass holds configuration settings for the in-process model cache.
+    """
+
+    # How a changed artifact is detected: "stat" compares mtime/size/inode,
+    # "hash" compares a SHA-256 of the file contents, computed again only when mtime/size/inode change.
+    change_detection:str = os.environ.get("MLPROJECT_MODEL_CACHE_CHECK", "stat")
+
+    # Maximum number of artifacts kept loaded; the least recently loaded one is dropped first.
+    max_entries:int = int(os.environ.get("MLPROJECT_MODEL_CACHE_SIZE", 2))
+
+
+@dataclass
+class CacheEntry:
+    """
+    This dataclass holds one cached model together with the file signature it was loaded from.
+    """
+    model:object
+    signature:tuple
+    loaded_at:float
+
+
+class ModelCache:
+    """
+    This class keeps loaded model objects in memory and reloads them only when the artifact on disk changes.
+    """
+
+    def __init__(self, loader=load_object, config=None):
+        """
+        Initialize the cache.
+
+        Args:
+            loader (callable): Function that loads an object from a file path.
+            config (ModelCacheConfig): Optional configuration, defaults to ModelCacheConfig().
+        """
+        self.config = config or ModelCacheConfig()
+        self.loader = loader
+        self._entries = {}
+        self._hashes = {}
+        self._lock = threading.Lock()
+        # Guards _stats, _hashes and changes to _entries; held only briefly, never while loading or hashing
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "load_count": 0,
+            "total_load_seconds": 0.0,
+            "last_load_seconds": 0.0,
+        }
+
+    def _signature(self, file_path):
+        """
+        Computes the change-detection signature of a file.
+
+        Args:
+            file_path (str): The path to the artifact.
+
+        Returns:
+            tuple: A value that changes whenever the file contents are replaced.
+        """
+        st = os.stat(file_path)
+        stat_signature = (st.st_ino, st.st_size, st.st_mtime_ns)
+        if self.config.change_detection == "hash":
+            # Hash the contents only when the cheap stat check says the file may have changed
+            with self._stats_lock:
+                cached = self._hashes.get(file_path)
+            if cached is not None and cached[0] == stat_signature:
+                return cached[1]
+            sha = hashlib.sha256()
+            with open(file_path, "rb") as file_obj:
+                for block in iter(lambda: file_obj.read(1024 * 1024), b""):
+                    sha.update(block)
+            signature = (st.st_size, sha.hexdigest())
+            with self._stats_lock:
+                self._hashes[file_path] = (stat_signature, signature)
+            return signature
+        return stat_signature
+
+    def get_entry(self, file_path):
+        """
+        Returns the cache entry for a file, loading or reloading it if the file changed.
+
+        Args:
+            file_path (str): The path to the artifact.
+
+        Returns:
+            CacheEntry: The up-to-date entry for the file.
+
+        Raises:
+            CustomException: If the artifact cannot be read or loaded.
+        """
+        try:
+            signature = self._signature(file_path)
+
+            # Fast path: the file has not changed since it was loaded
+            entry = self._entries.get(file_path)
+            if entry is not None and entry.signature == signature:
+                with self._stats_lock:
+                    self._stats["hits"] += 1
+                return entry
+
+            with self._lock:
+                # Another thread may have reloaded the file while we waited for the lock
+                entry = self._entries.get(file_path)
+                if entry is not None and entry.signature == signature:
+                    with self._stats_lock:
+                        self._stats["hits"] += 1
+                    return entry
+
+                start = time.perf_counter()
+                with timed("model_load"):
+                    model = self.loader(file_path)
+                elapsed = time.perf_counter() - start
+
+                entry = CacheEntry(model=model, signature=signature, loaded_at=time.time())
+
+                # Forget superseded model versions; requests still using them keep their reference
+                with self._stats_lock:
+                    self._entries[file_path] = entry
+                    while len(self._entries) > max(self.config.max_entries, 1):
+                        oldest = min(self._entries, key=lambda path: self._entries[path].loaded_at)
+                        del self._entries[oldest]
+                        self._hashes.pop(oldest, None)
+
+                    self._stats["load_count"] += 1
+                    self._stats["total_load_seconds"] += elapsed
+                    self._stats["last_load_seconds"] = elapsed
+
+                return entry
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def get(self, file_path):
+        """
+        Returns the model stored at file_path, loading it only when it is new or has changed.
+
+        Args:
+            file_path (str): The path to the artifact.
+
+        Returns:
+            The loaded model object.
+        """
+        return self.get_entry(file_path).model
+
+    def stats(self):
+        """
+        Returns load and hit statistics for the cache.
+
+        Returns:
+            dict: Hits, load count, total/last load time in seconds and the cached paths.
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+            stats["cached_paths"] = sorted(self._entries)
+        return stats
+
+    def clear(self):
+        """
+        Drops every cached model so that the next access reloads from disk.
+        """
+        with self._lock, self._stats_lock:
+            self._entries.clear()
+            self._hashes.clear()
+
+
+# Process-wide cache shared by every PredictPipeline
+model_cache = ModelCache()
+registry.register_collector(stats_collector("mlproject_model_cache", model_cache.stats, counters=("hits", "load_count")))
@@ -0,0 +1,230 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+from datetime import datetime
+from dataclasses import dataclass
+from src.MLProject.exception import CustomException
+from src.MLProject.utils import save_object, apply_umask
+
+
+@dataclass
+class ModelRegistryConfig:
+    """
+    This dataclass holds configuration settings for the versioned model registry.
+    """
+
+    # Directory holding one sub-directory per published model version.
+    registry_dir:str = os.path.join('artifacts','models')
+
+    # Name of the file inside registry_dir that holds the current version.
+    pointer_file_name:str = 'CURRENT'
+
+    # Name of the model file inside each version directory.
+    model_file_name:str = 'model.pkl'
+
+    # Name of the metadata file inside each version directory.
+    metadata_file_name:str = 'metadata.json'
+
+    # Number of published versions kept on disk for rollback (including the current one).
+    keep_versions:int = int(os.environ.get("MLPROJECT_KEEP_MODEL_VERSIONS", 5))
+
+
+class ModelRegistry:
+    """
+    This class publishes trained models into versioned directories and tracks the current version.
+
+    A version is written to a staging directory and renamed into place, and the
+    "current" pointer is replaced atomically, so readers either see the old
+    version or the complete new one. Serving code resolves the pointer on each
+    request; in-flight requests keep the model object they already hold.
+    """
+
+    def __init__(self, config=None):
+        """
+        Initialize the registry.
+
+        Args:
+            config (ModelRegistryConfig): Optional configuration, defaults to ModelRegistryConfig().
+        """
+        self.config = config or ModelRegistryConfig()
+        self._pointer_cache = (None, None)
+
+    @property
+    def pointer_path(self):
+        return os.path.join(self.config.registry_dir, self.config.pointer_file_name)
+
+    def version_dir(self, version):
+        return os.path.join(self.config.registry_dir, version)
+
+    def model_path(self, version):
+        return os.path.join(self.version_dir(version), self.config.model_file_name)
+
+    def list_versions(self):
+        """
+        Returns every published version, oldest first.
+
+        Returns:
+            list: Version names sorted chronologically.
+        """
+        if not os.path.isdir(self.config.registry_dir):
+            return []
+        return sorted(
+            name for name in os.listdir(self.config.registry_dir)
+            if name.startswith('v') and os.path.isdir(self.version_dir(name))
+        )
+
+    def current_version(self):
+        """
+        Returns the version the "current" pointer refers to.
+
+        Returns:
+            str or None: The current version, or None if nothing was published yet.
+        """
+        try:
+            st = os.stat(self.pointer_path)
+        except FileNotFoundError:
+            return None
+
+        # Only re-read the pointer file when it was replaced
+        signature = (st.st_ino, st.st_size, st.st_mtime_ns)
+        cached_signature, cached_version = self._pointer_cache
+        if cached_signature == signature:
+            return cached_version
+
+        with open(self.pointer_path) as file_obj:
+            version = file_obj.read().strip() or None
+        self._pointer_cache = (signature, version)
+        return version
+
+    def current_model_path(self):
+        """
+        Returns the model file of the current version.
+
+        Returns:
+            str or None: The path to the current model, or None if nothing was published yet.
+        """
+        version = self.current_version()
+        return self.model_path(version) if version else None
+
+    def metadata(self, version):
+        """
+        Returns the metadata stored with a version.
+
+        Args:
+            version (str): The version name.
+
+        Returns:
+            dict: The metadata recorded at publish time.
+        """
+        path = os.path.join(self.version_dir(version), self.config.metadata_file_name)
+        if not os.path.exists(path):
+            return {}
+        with open(path) as file_obj:
+            return json.load(file_obj)
+
+    def publish(self, obj, metadata=None, extra_objects=None):
+        """
+        Saves a model as a new version and makes it the current one.
+
+        Args:
+            obj: The model object to publish.
+            metadata (dict): Optional JSON-serializable information stored next to the model.
+            extra_objects (dict): Optional objects derived from the model, keyed by the
+                file name they are saved under in the version directory.
+
+        Returns:
+            str: The newly published version.
+
+        Raises:
+            CustomException: If an error occurs while publishing.
+        """
+        try:
+            os.makedirs(self.config.registry_dir, exist_ok=True)
+            version = datetime.now().strftime('v%Y%m%d%H%M%S%f')
+
+            # Write everything into a hidden staging directory first
+            staging_dir = tempfile.mkdtemp(prefix='.staging-', dir=self.config.registry_dir)
+            try:
+                apply_umask(staging_dir)
+                save_object(os.path.join(staging_dir, self.config.model_file_name), obj)
+                for file_name, extra in (extra_objects or {}).items():
+                    save_object(os.path.join(staging_dir, file_name), extra)
+
+                record = dict(metadata or {})
+                record['version'] = version
+                record['published_at'] = datetime.now().isoformat()
+                with open(os.path.join(staging_dir, self.config.metadata_file_name), 'w') as file_obj:
+                    json.dump(record, file_obj, indent=2, default=str)
+
+                # Move the finished version into place in one rename
+                os.rename(staging_dir, self.version_dir(version))
+            except BaseException:
+                shutil.rmtree(staging_dir, ignore_errors=True)
+                raise
+
+            self._set_current(version)
+            self._prune()
+
+            return version
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def rollback(self, version=None):
+        """
+        Points "current" back to an earlier version.
+
+        Args:
+            version (str): The version to activate. Defaults to the one published before the current version.
+
+        Returns:
+            str: The version that is now current.
+
+        Raises:
+            CustomException: If there is no version to roll back to.
+        """
+        try:
+            versions = self.list_versions()
+            if version is None:
+                current = self.current_version()
+                older = [v for v in versions if current is None or v < current]
+                if not older:
+                    raise ValueError("No earlier model version to roll back to")
+                version = older[-1]
+
+            if version not in versions:
+                raise ValueError(f"Unknown model version: {version}")
+
+            self._set_current(version)
+            return version
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def _set_current(self, version):
+        """
+        Atomically replaces the "current" pointer file.
+        """
+        fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', dir=self.config.registry_dir)
+        apply_umask(tmp_path)
+        with os.fdopen(fd, 'w') as file_obj:
+            file_obj.write(version)
+            file_obj.flush()
+            os.fsync(file_obj.fileno())
+        os.replace(tmp_path, self.pointer_path)
+
+    def _prune(self):
+        """
+        Deletes the oldest versions beyond keep_versions, never touching the current one.
+        """
+        current = self.current_version()
+        versions = [v for v in self.list_versions() if v != current]
+        excess = len(versions) - max(self.config.keep_versions - 1, 0)
+        for version in versions[:max(excess, 0)]:
+            shutil.rmtree(self.version_dir(version), ignore_errors=True)
+
+
+# Process-wide registry used by training and serving
+model_registry = ModelRegistry()
@@ -0,0 +1,204 @@
+import os
+import sys
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from dataclasses import dataclass
+import numpy as np
+from src.MLProject.exception import CustomException
+from src.MLProject.metrics import registry, stats_collector
+from src.MLProject.pipelines.prediction_pipeline import PredictPipeline
+
+
+def _env_flag(name, default="0"):
+    return os.environ.get(name, default).lower() in ("1", "true", "yes", "on")
+
+
+@dataclass
+class MicroBatcherConfig:
+    """
+    This dataclass holds configuration settings for coalescing single-row predictions.
+    """
+
+    # Opt-in switch; when off, single-row requests call the model directly.
+    enabled:bool = _env_flag("MLPROJECT_MICROBATCH")
+
+    # Largest number of rows sent to the model in one predict call.
+    max_batch_size:int = int(os.environ.get("MLPROJECT_MICROBATCH_MAX_SIZE", 256))
+
+    # Longest time the first queued row waits for others to join its batch.
+    max_wait_ms:float = float(os.environ.get("MLPROJECT_MICROBATCH_MAX_WAIT_MS", 2))
+
+    # Rows allowed to wait in the queue before new submissions are rejected.
+    max_queue_depth:int = int(os.environ.get("MLPROJECT_MICROBATCH_MAX_QUEUE", 10000))
+
+    # Longest time a caller waits for its batched result before predicting the row directly.
+    result_timeout_ms:float = float(os.environ.get("MLPROJECT_MICROBATCH_TIMEOUT_MS", 1000))
+
+
+class MicroBatcher:
+    """
+    This class collects concurrent single-row prediction requests and scores them with one batched predict call.
+    """
+
+    def __init__(self, predict_fn=None, config=None):
+        """
+        Initialize the batcher. The worker thread is started lazily on first use.
+
+        Args:
+            predict_fn (callable): Function mapping a 2-D feature array to predictions.
+            config (MicroBatcherConfig): Optional configuration, defaults to MicroBatcherConfig().
+        """
+        self.config = config or MicroBatcherConfig()
+        self.predict_fn = predict_fn or (lambda features: PredictPipeline().predict(features))
+        self._lock = threading.Lock()
+        self._queue = None
+        self._worker = None
+        self._pid = None
+        self._stats = {
+            "batches": 0,
+            "rows": 0,
+            "rejected": 0,
+            "timeouts": 0,
+            "max_batch_size_seen": 0,
+            "max_queue_depth_seen": 0,
+        }
+
+    def _ensure_worker(self):
+        """
+        Starts the worker thread, restarting it in a forked child where the parent's thread does not
+        exist, or if it has died. Rows queued for a dead worker are kept for the new one.
+        """
+        if self._worker is not None and self._pid == os.getpid() and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is not None and self._pid == os.getpid() and self._worker.is_alive():
+                return
+            if self._pid != os.getpid():
+                self._queue = queue.Queue(maxsize=self.config.max_queue_depth)
+            self._pid = os.getpid()
+            self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+            self._worker.start()
+
+    def submit(self, row):
+        """
+        Queues one feature row for prediction.
+
+        Args:
+            row (np.array): A 1-D feature vector.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the prediction for this row.
+
+        Raises:
+            CustomException: If the queue is full.
+        """
+        try:
+            self._ensure_worker()
+            future = Future()
+            try:
+                # Copy the row: callers may reuse their buffer once they stop waiting
+                self._queue.put_nowait((np.array(row, dtype=float), future))
+            except queue.Full:
+                self._stats["rejected"] += 1
+                raise RuntimeError("Prediction queue is full")
+
+            depth = self._queue.qsize()
+            if depth > self._stats["max_queue_depth_seen"]:
+                self._stats["max_queue_depth_seen"] = depth
+            return future
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def predict(self, row, timeout=None):
+        """
+        Predicts one feature row through the shared batch.
+
+        If the result is not ready in time the row is withdrawn from the queue (when
+        it has not been picked up yet) and predicted directly, so a stalled worker
+        slows requests down instead of hanging them.
+
+        Args:
+            row (np.array): A 1-D feature vector.
+            timeout (float): Seconds to wait for the batched result, defaults to config.result_timeout_ms.
+
+        Returns:
+            np.array: A one-element array with the prediction, like PredictPipeline.predict.
+        """
+        if timeout is None:
+            timeout = self.config.result_timeout_ms / 1000.0
+        future = self.submit(row)
+        try:
+            return np.array([future.result(timeout=timeout)])
+        except FutureTimeout:
+            future.cancel()
+            self._stats["timeouts"] += 1
+            return np.asarray(self.predict_fn(np.array(row, dtype=float).reshape(1, -1)))
+
+    def _collect(self):
+        """
+        Blocks for the first row, then gathers more until the batch is full or the wait window closes.
+        """
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.config.max_wait_ms / 1000.0
+        while len(batch) < self.config.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        """
+        Worker loop: score each collected batch and hand every caller its own result.
+
+        Any failure, including a row that cannot be stacked with the others, fails
+        that batch's futures and the loop carries on with the next batch.
+        """
+        while True:
+            batch = self._collect()
+            # Skip rows whose caller gave up waiting and predicted them directly
+            batch = [(row, future) for row, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                rows = np.vstack([row for row, _ in batch])
+                preds = self.predict_fn(rows)
+                if len(preds) != len(batch):
+                    raise ValueError(f"Expected {len(batch)} predictions, got {len(preds)}")
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future), pred in zip(batch, preds):
+                future.set_result(pred)
+
+            self._stats["batches"] += 1
+            self._stats["rows"] += len(batch)
+            if len(batch) > self._stats["max_batch_size_seen"]:
+                self._stats["max_batch_size_seen"] = len(batch)
+
+    def stats(self):
+        """
+        Returns batching statistics.
+
+        Returns:
+            dict: Batch and row counts, mean batch size, rejections, timeouts and current/max queue depth.
+        """
+        stats = dict(self._stats)
+        stats["queue_depth"] = self._queue.qsize() if self._queue is not None else 0
+        stats["mean_batch_size"] = stats["rows"] / stats["batches"] if stats["batches"] else 0.0
+        return stats
+
+
+# Process-wide batcher used by the JSON prediction route when enabled
+micro_batcher = MicroBatcher()
+registry.register_collector(stats_collector(
+    "mlproject_microbatch", micro_batcher.stats, counters=("batches", "rows", "rejected", "timeouts"),
+))
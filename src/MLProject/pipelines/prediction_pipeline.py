@@ -1,9 +1,33 @@
 import sys, os
-import io
-from io import StringIO
+import threading
 import pandas as pd, numpy as np
+from dataclasses import dataclass
 from src.MLProject.exception import CustomException
-from src.MLProject.utils import load_object
+from src.MLProject.model_cache import model_cache
+from src.MLProject.compiled_forest import compiled_model_cache
+from src.MLProject.model_registry import model_registry
+from src.MLProject.prediction_cache import prediction_cache
+from src.MLProject.metrics import timed
+from src.MLProject.schema import FEATURE_COLUMNS, PREDICTION_COLUMNS, PREDICTION_DATE_FORMAT, TRAINING_DATE_FORMAT
+from src.MLProject.upload_parser import read_upload
+
+# Date formats accepted in prediction uploads, the documented one first
+PREDICTION_DATE_FORMATS = (PREDICTION_DATE_FORMAT, TRAINING_DATE_FORMAT)
+
+# Largest feature magnitude the model accepts: features are cast to float32, and
+# anything beyond its range (or infinite) is rejected by both prediction engines
+MAX_FEATURE_VALUE = float(np.finfo(np.float32).max)
+
+
+@dataclass
+class PredictPipelineConfig:
+    """
+    This dataclass holds configuration settings for the prediction pipeline.
+    """
+
+    # Inference engine: "sklearn" calls the model's own predict,
+    # "compiled" uses the array-backed CompiledForest built from it.
+    engine:str = os.environ.get("MLPROJECT_PREDICT_ENGINE", "sklearn")
 
 
 class PredictPipeline:
@@ -11,6 +35,17 @@ class PredictPipeline:
     This class represents a pipeline for making predictions using a trained model.
     """
 
+    def __init__(self, engine=None):
+        """
+        Initialize the prediction pipeline.
+
+        Args:
+            engine (str): Optional engine override ("sklearn" or "compiled").
+        """
+        self.predict_pipeline_config = PredictPipelineConfig()
+        if engine is not None:
+            self.predict_pipeline_config.engine = engine
+
     def predict(self,features):
         """
         Makes predictions on a given set of features using the loaded model.
@@ -25,20 +60,52 @@ class PredictPipeline:
             CustomException: If an error occurs during prediction.
         """
         try:
-            # Define the path to the saved model file
-            model_path=os.path.join("artifacts","model.pkl")
+            # Resolve the current registry version, falling back to the legacy model file
+            model_path=model_registry.current_model_path() or os.path.join("artifacts","model.pkl")
 
-            # Load the model from the specified path
-            model=load_object(file_path=model_path)
+            # Get the model from the process-wide cache (reloaded only when the file changes)
+            engine=self.predict_pipeline_config.engine
+            if engine == "compiled":
+                entry=compiled_model_cache.get_entry(model_path)
+            elif engine == "sklearn":
+                entry=model_cache.get_entry(model_path)
+            else:
+                raise ValueError(f"Unknown prediction engine: {engine}")
 
-            # Make predictions using the loaded model
-            preds=model.predict(features)
+            # Make predictions using the loaded model; cached results are reused for rows
+            # already scored by this exact model file with the same engine
+            with timed("predict"):
+                if prediction_cache.config.enabled:
+                    preds=prediction_cache.predict((model_path, entry.signature), features, entry.model.predict, engine=engine)
+                else:
+                    preds=entry.model.predict(features)
 
             return preds
         
         except Exception as e:
             raise CustomException(e,sys)
 
+def extract_date_features(df):
+    """
+    Turns a parsed prediction upload into the model's feature array.
+
+    Args:
+        df (pandas.DataFrame): Rows in PREDICTION_COLUMNS order with a parsed (datetime64) 'Date' column.
+
+    Returns:
+        np.array: The feature array in FEATURE_COLUMNS order, with Year and Day taken from Date.
+    """
+    with timed('date_features'):
+        # Fill one preallocated array column by column instead of building intermediate frames
+        arr = np.empty((len(df), len(FEATURE_COLUMNS)))
+        for i, column in enumerate(FEATURE_COLUMNS[:-2]):
+            arr[:, i] = df[column].to_numpy()
+
+        # Year and Day are the last two features
+        arr[:, -2] = df['Date'].dt.year.to_numpy()
+        arr[:, -1] = df['Date'].dt.day.to_numpy()
+    return arr
+
 class CustomData:
     """
     This class handles processing CSV data uploaded as files.
@@ -49,31 +116,14 @@ class CustomData:
         Initializes the CustomData object with the uploaded file object.
 
         Args:
-            f (file object): The uploaded CSV file object.
+            f (file object): The uploaded CSV file object (a Flask FileStorage) or its binary stream.
         """
 
-        # Read the file content as a string
-        stream = io.StringIO(f.stream.read().decode("UTF8"), newline=None)
-        stream.seek(0)
-        result = stream.read()
+        # Parse the uploaded bytes against the prediction schema
+        df = read_upload(getattr(f, 'stream', f), PREDICTION_COLUMNS, PREDICTION_DATE_FORMATS)
 
-        # Convert the string content to a pandas DataFrame
-        df = pd.read_csv(StringIO(result))
-
-        # Process the DataFrame:
-        # - Create datetime column from 'Date' with specific format
-        # - Extract year and day from the datetime column
-        # - Drop 'Date' and the processed datetime column
-        df['date'] = pd.to_datetime(df['Date'], format = '%d-%m-%Y')
-        df['Year'] = df['date'].dt.year
-        df['Day'] = df['date'].dt.day
-        df=df.drop(columns=['Date','date'],axis=1)
-
-        # Convert the DataFrame to a NumPy array
-        arr = np.array(df)
-
-        # Store the NumPy array as an attribute
-        self.arr=arr
+        # Store the NumPy array of model features as an attribute
+        self.arr=extract_date_features(df)
 
     def get_data_as_data_frame(self):
         """
@@ -89,6 +139,39 @@ class CustomData:
         except Exception as e:
             raise CustomException(e, sys)
         
+@dataclass
+class CustomDataStreamConfig:
+    """
+    This dataclass holds configuration settings for streaming CSV prediction.
+    """
+
+    # Number of CSV rows parsed, transformed and predicted at a time.
+    chunk_rows:int = int(os.environ.get("MLPROJECT_STREAM_CHUNK_ROWS", 10000))
+
+class CustomDataStream:
+    """
+    This class handles processing large uploaded CSV files in fixed-size chunks.
+    """
+
+    def __init__(self,stream,config=None):
+        """
+        Initializes the CustomDataStream object with the uploaded file's binary stream.
+
+        Args:
+            stream (file object): The binary stream of the uploaded CSV file.
+            config (CustomDataStreamConfig): Optional configuration, defaults to CustomDataStreamConfig().
+        """
+        self.stream=stream
+        self.config=config or CustomDataStreamConfig()
+
+    def __iter__(self):
+        """
+        Yields the feature array of each chunk, so only one chunk is held in memory at a time.
+        """
+        # Parse straight from the uploaded bytes, chunk by chunk
+        for df in read_upload(self.stream, PREDICTION_COLUMNS, PREDICTION_DATE_FORMATS, chunksize=self.config.chunk_rows):
+            yield extract_date_features(df)
+
 class CustomDataJSON:
     """
     This class handles processing data provided in JSON format (assumed to be a DataFrame).
@@ -120,4 +203,199 @@ class CustomDataJSON:
             return self.arr.copy() # Returning a copy to avoid unintended modifications
 
         except Exception as e:
-            raise CustomException(e, sys)
\ No newline at end of file
+            raise CustomException(e, sys)
+
+class FeatureSchema:
+    """
+    This class precompiles the mapping from JSON keys to model feature positions.
+
+    Single records are converted straight from the dict into a reusable
+    thread-local buffer, so they never go through pandas and always use the
+    column order the model was trained with, whatever the key order of the request.
+    """
+
+    def __init__(self,columns):
+        """
+        Initializes the FeatureSchema object with the model's feature columns.
+
+        Args:
+            columns (list): Feature names in model input order.
+        """
+        self.columns = list(columns)
+        self.positions = tuple(enumerate(self.columns))
+        self._local = threading.local()
+
+    def buffer(self):
+        """
+        Returns this thread's (1, n_features) feature buffer, allocated on first use.
+        """
+        buf = getattr(self._local, 'buffer', None)
+        if buf is None:
+            buf = self._local.buffer = np.empty((1, len(self.columns)))
+        return buf
+
+    def vectorize(self,record):
+        """
+        Validates a single record and writes its features into this thread's buffer.
+
+        Values follow the batch rules: None (or NaN) counts as missing, numbers and
+        numeric strings up to MAX_FEATURE_VALUE in magnitude are accepted, anything
+        else (booleans, infinities, other types) is invalid.
+
+        Args:
+            record (dict): One JSON record.
+
+        Returns:
+            tuple: The (1, n_features) buffer, and None or a validation error dict
+            with 'missing_keys' and/or 'invalid_keys'. The buffer is overwritten by the
+            next call on the same thread, so copy it if it must outlive the request.
+        """
+        buf = self.buffer()
+        row = buf[0]
+        missing = []
+        invalid = []
+
+        # One pass over the features in model order: type check and convert
+        for i, column in self.positions:
+            value = record.get(column)
+            if type(value) is float or type(value) is int:
+                try:
+                    row[i] = value
+                except OverflowError:
+                    invalid.append(column)
+                    continue
+            elif value is None:
+                missing.append(column)
+                continue
+            elif isinstance(value, (str, int, float)) and not isinstance(value, bool):
+                try:
+                    row[i] = float(value)
+                except (ValueError, OverflowError):
+                    invalid.append(column)
+                    continue
+            else:
+                invalid.append(column)
+                continue
+            if row[i] != row[i]:
+                missing.append(column)
+            elif abs(row[i]) > MAX_FEATURE_VALUE:
+                invalid.append(column)
+
+        if not missing and not invalid:
+            return buf, None
+
+        error = {'row': 0}
+        if missing:
+            error['missing_keys'] = missing
+        if invalid:
+            error['invalid_keys'] = invalid
+        return buf, error
+
+# Shared schema for the model's features
+feature_schema = FeatureSchema(FEATURE_COLUMNS)
+
+def _huge_ints_to_inf(data):
+    """
+    Returns a copy of a batch request body with integers beyond MAX_FEATURE_VALUE replaced by signed infinity.
+    """
+    def convert(value):
+        if type(value) is int and abs(value) > MAX_FEATURE_VALUE:
+            return float('inf') if value > 0 else float('-inf')
+        return value
+
+    if isinstance(data, dict):
+        return {key: [convert(v) for v in value] if isinstance(value, list) else convert(value) for key, value in data.items()}
+    return [{key: convert(v) for key, v in record.items()} if isinstance(record, dict) else record for record in data]
+
+class CustomDataJSONBatch:
+    """
+    This class handles processing a batch of records provided in JSON format.
+
+    Accepted shapes are a single record (dict of scalars), a list of records, or a
+    columnar object mapping each feature name to a list of values.
+    """
+
+    def __init__(self,data):
+        """
+        Initializes the CustomDataJSONBatch object and validates the whole batch at once.
+
+        Args:
+            data (dict or list): The decoded JSON request body.
+        """
+        with timed('validation'):
+            self._load(data)
+
+    def _load(self,data):
+        """
+        Normalizes and validates the request body into arr and errors.
+        """
+        self.is_single = isinstance(data, dict) and not any(isinstance(v, list) for v in data.values())
+
+        # Single records skip pandas: validate and convert straight into a feature buffer
+        if self.is_single:
+            self.errors = []
+            self.arr, error = feature_schema.vectorize(data)
+            if error is not None:
+                self.errors.append(error)
+            return
+
+        try:
+            self._load_batch(data)
+        except OverflowError:
+            # pandas cannot convert integers beyond the float range; they are invalid
+            # like infinity, so validate again with them replaced by it
+            self._load_batch(_huge_ints_to_inf(data))
+
+    def _load_batch(self,data):
+        """
+        Validates a list of records or a columnar object into arr and errors with pandas.
+        """
+        self.errors = []
+
+        # Normalize the other shapes to a DataFrame with one row per record
+        if isinstance(data, dict):
+            df = pd.DataFrame(data)
+        else:
+            records = []
+            for i, record in enumerate(data):
+                if not isinstance(record, dict):
+                    self.errors.append({'row': i, 'error': 'Record is not a JSON object'})
+                    record = {}
+                records.append(record)
+            df = pd.DataFrame.from_records(records)
+
+        # Reorder to the training column order; absent keys become NaN
+        df = df.reindex(columns=FEATURE_COLUMNS)
+        missing_mask = df.isna()
+
+        # Booleans are not numbers here, although pandas would coerce them to 0 and 1
+        bool_mask = pd.DataFrame(False, index=df.index, columns=df.columns)
+        for column in df.columns:
+            if df[column].dtype == bool:
+                bool_mask[column] = True
+            elif df[column].dtype == object:
+                bool_mask[column] = df[column].map(lambda value: isinstance(value, bool))
+
+        # Coerce every column to numbers; values that fail become NaN too, and values
+        # beyond MAX_FEATURE_VALUE (infinities included) are invalid
+        numeric = df.mask(bool_mask).apply(pd.to_numeric, errors='coerce').astype(float)
+        invalid_mask = (numeric.isna() & ~missing_mask) | (numeric.abs() > MAX_FEATURE_VALUE)
+
+        # Only rows that failed validation are visited individually
+        bad_rows = np.flatnonzero((missing_mask | invalid_mask).to_numpy().any(axis=1))
+        reported = {error['row'] for error in self.errors}
+        for i in bad_rows:
+            if i in reported:
+                continue
+            error = {'row': int(i)}
+            missing = [key for key, flag in zip(FEATURE_COLUMNS, missing_mask.iloc[i]) if flag]
+            invalid = [key for key, flag in zip(FEATURE_COLUMNS, invalid_mask.iloc[i]) if flag]
+            if missing:
+                error['missing_keys'] = missing
+            if invalid:
+                error['invalid_keys'] = invalid
+            self.errors.append(error)
+        self.errors.sort(key=lambda error: error['row'])
+
+        # Store the NumPy array as an attribute
+        self.arr = numeric.to_numpy(dtype=float)
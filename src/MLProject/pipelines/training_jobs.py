@@ -0,0 +1,300 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import pandas as pd
+from src.MLProject.exception import CustomException
+from src.MLProject.pipelines.training_pipeline import TrainingPipeline
+from src.MLProject.logger import get_logger, request_id_var
+from src.MLProject.utils import apply_umask
+
+logger = get_logger(__name__)
+
+# Job states that count as "in progress" for deduplication and admission
+ACTIVE_STATES = ("queued", "ingestion", "transformation", "training")
+
+
+@dataclass
+class TrainingJobConfig:
+    """
+    This dataclass holds configuration settings for background training jobs.
+    """
+
+    # Directory holding one JSON status file per job, readable by every serving process.
+    jobs_dir:str = os.path.join('artifacts','jobs')
+
+    # Number of training jobs run at the same time by this process.
+    max_workers:int = int(os.environ.get("MLPROJECT_TRAINING_WORKERS", 1))
+
+    # Number of queued or running jobs accepted before new submissions are rejected.
+    max_pending:int = int(os.environ.get("MLPROJECT_TRAINING_MAX_PENDING", 4))
+
+    # Niceness added to the job threads (and the processes they start) on Linux, so the
+    # scheduler gives serving threads the CPU first while a retrain is running.
+    nice:int = int(os.environ.get("MLPROJECT_TRAINING_NICE", 10))
+
+    # Number of finished (succeeded or failed) job status files kept on disk; older ones are deleted.
+    keep_finished:int = int(os.environ.get("MLPROJECT_TRAINING_KEEP_JOBS", 100))
+
+
+class TrainingQueueFull(Exception):
+    """
+    Raised when a training job is submitted while the queue is at capacity.
+    """
+
+
+class TrainingJobManager:
+    """
+    This class runs TrainingPipeline jobs on a bounded background worker pool and records their status.
+
+    Job ids are derived from the dataset contents, so submitting a dataset that is
+    already queued or training returns the existing job instead of starting another.
+    """
+
+    def __init__(self, config=None, pipeline_factory=TrainingPipeline):
+        """
+        Initialize the job manager. The worker pool is created lazily on first submission.
+
+        Args:
+            config (TrainingJobConfig): Optional configuration, defaults to TrainingJobConfig().
+            pipeline_factory (callable): Returns an object with a run(df, on_stage) method.
+        """
+        self.config = config or TrainingJobConfig()
+        self.pipeline_factory = pipeline_factory
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+        self._active = set()
+
+    def _status_path(self, job_id):
+        return os.path.join(self.config.jobs_dir, f"{job_id}.json")
+
+    def _write_status(self, job_id, status):
+        """
+        Atomically replaces a job's status file.
+        """
+        os.makedirs(self.config.jobs_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', dir=self.config.jobs_dir)
+        apply_umask(tmp_path)
+        with os.fdopen(fd, 'w') as file_obj:
+            json.dump(status, file_obj, default=str)
+        os.replace(tmp_path, self._status_path(job_id))
+
+    def _update_status(self, job_id, **fields):
+        status = self.status(job_id) or {}
+        status.update(fields)
+        self._write_status(job_id, status)
+
+    @staticmethod
+    def dataset_id(df, mode="full"):
+        """
+        Computes a stable id for a training dataset from its columns and values.
+
+        Args:
+            df (pandas.DataFrame): The training data.
+            mode (str): The training mode, so the same data trained differently is a different job.
+
+        Returns:
+            str: A short hex digest identifying the dataset.
+        """
+        sha = hashlib.sha256(mode.encode())
+        sha.update(json.dumps(list(map(str, df.columns))).encode())
+        sha.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+        return sha.hexdigest()[:20]
+
+    def status(self, job_id):
+        """
+        Returns the recorded status of a job.
+
+        Args:
+            job_id (str): The job id returned by submit.
+
+        Returns:
+            dict or None: Stage, timestamps, elapsed seconds and, when finished, the RMSE and model version.
+            A queued or running job whose process has exited is recorded as failed.
+        """
+        # Job ids are hex digests; anything else cannot name a status file
+        if not all(c in "0123456789abcdef" for c in job_id):
+            return None
+
+        try:
+            with open(self._status_path(job_id)) as file_obj:
+                status = json.load(file_obj)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        # A job whose owning process has exited will never finish; record it as failed
+        pid = status.get("pid")
+        if status.get("state") in ACTIVE_STATES and pid not in (None, os.getpid()) and not self._is_running_elsewhere(status):
+            finished_at = time.time()
+            status.update(state="failed", finished_at=finished_at, error="worker exited")
+            if status.get("started_at"):
+                status["elapsed_seconds"] = round(finished_at - status["started_at"], 3)
+            self._write_status(job_id, status)
+            return status
+
+        # Report live elapsed time for jobs that are still running
+        if status.get("started_at") and not status.get("finished_at"):
+            status["elapsed_seconds"] = round(time.time() - status["started_at"], 3)
+        return status
+
+    def _is_running_elsewhere(self, status):
+        """
+        Checks whether an active status file belongs to a live process.
+        """
+        pid = status.get("pid")
+        if pid == os.getpid() or pid is None:
+            return False
+        try:
+            os.kill(pid, 0)
+        except OSError:
+            return False
+        return True
+
+    def active_jobs(self):
+        """
+        Returns the jobs that are queued or running in a live serving process.
+
+        Returns:
+            list: The status dicts of the active jobs of this and every other live process.
+        """
+        if not os.path.isdir(self.config.jobs_dir):
+            return []
+
+        active = []
+        for file_name in os.listdir(self.config.jobs_dir):
+            if not file_name.endswith('.json'):
+                continue
+            job_id = file_name[:-len('.json')]
+            status = self.status(job_id)
+            if status and status.get("state") in ACTIVE_STATES:
+                if job_id in self._active or self._is_running_elsewhere(status):
+                    active.append(status)
+        return active
+
+    def submit(self, df, mode="full"):
+        """
+        Queues a training job for a dataset, reusing an in-progress job for the same dataset.
+
+        Args:
+            df (pandas.DataFrame): The training data.
+            mode (str): "full" or "incremental", see TrainingPipeline.run.
+
+        Returns:
+            tuple: The job status dict and a flag telling whether a new job was created.
+
+        Raises:
+            TrainingQueueFull: If max_pending jobs are already queued or running.
+            CustomException: If the job cannot be recorded.
+        """
+        job_id = self.dataset_id(df, mode)
+        with self._lock:
+            # Deduplicate against jobs in this process and in other live serving processes
+            existing = self.status(job_id)
+            if existing and existing.get("state") in ACTIVE_STATES:
+                if job_id in self._active or self._is_running_elsewhere(existing):
+                    return existing, False
+
+            if len(self._active) >= self.config.max_pending:
+                raise TrainingQueueFull(f"{len(self._active)} training jobs already pending")
+
+            try:
+                if self._executor is None or self._pid != os.getpid():
+                    self._executor = ThreadPoolExecutor(max_workers=self.config.max_workers, thread_name_prefix="training")
+                    self._pid = os.getpid()
+                    self._active = set()
+
+                status = {
+                    "job_id": job_id,
+                    "state": "queued",
+                    "pid": os.getpid(),
+                    "rows": len(df),
+                    "mode": mode,
+                    "submitted_at": datetime.now().isoformat(),
+                }
+                self._write_status(job_id, status)
+                self._active.add(job_id)
+                self._executor.submit(self._run, job_id, df, mode)
+                return status, True
+
+            except Exception as e:
+                raise CustomException(e, sys)
+
+    def _lower_priority(self):
+        """
+        Lowers the scheduling priority of the calling job thread; on Linux niceness is per thread.
+        """
+        if self.config.nice and sys.platform.startswith("linux"):
+            try:
+                os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), min(os.getpriority(os.PRIO_PROCESS, os.getpid()) + self.config.nice, 19))
+            except OSError:
+                pass
+
+    def _run(self, job_id, df, mode):
+        """
+        Worker body: runs the pipeline and records each stage, the result or the error.
+        """
+        self._lower_priority()
+
+        # Log the job's records under its id
+        request_id_var.set(job_id)
+        start = time.time()
+        self._update_status(job_id, started_at=start)
+        logger.info("Training job started", extra={"job_id": job_id, "mode": mode, "rows": len(df)})
+        try:
+            result = self.pipeline_factory().run(
+                df,
+                on_stage=lambda stage: self._update_status(job_id, state=stage),
+                mode=mode
+            )
+            self._update_status(
+                job_id,
+                state="succeeded",
+                finished_at=time.time(),
+                elapsed_seconds=round(time.time() - start, 3),
+                **result
+            )
+            logger.info("Training job succeeded", extra={"job_id": job_id, "rmse": result.get("rmse"), "model_version": result.get("model_version")})
+        except Exception as e:
+            logger.exception("Training job failed", extra={"job_id": job_id})
+            self._update_status(
+                job_id,
+                state="failed",
+                finished_at=time.time(),
+                elapsed_seconds=round(time.time() - start, 3),
+                error=str(e)
+            )
+        finally:
+            with self._lock:
+                self._active.discard(job_id)
+                self._prune()
+
+    def _prune(self):
+        """
+        Deletes the oldest finished job status files beyond keep_finished. Call with the lock held.
+        """
+        finished = []
+        for file_name in os.listdir(self.config.jobs_dir):
+            if not file_name.endswith('.json'):
+                continue
+            status = self.status(file_name[:-len('.json')])
+            if status and status.get("finished_at"):
+                finished.append((status["finished_at"], file_name))
+
+        finished.sort()
+        excess = len(finished) - max(self.config.keep_finished, 0)
+        for _, file_name in finished[:max(excess, 0)]:
+            try:
+                os.remove(os.path.join(self.config.jobs_dir, file_name))
+            except FileNotFoundError:
+                pass
+
+
+# Process-wide job manager used by the training routes
+training_jobs = TrainingJobManager()
@@ -0,0 +1,129 @@
+import sys
+import time
+from src.MLProject.exception import CustomException
+from src.MLProject.metrics import training_stage_seconds
+from src.MLProject.logger import get_logger
+from src.MLProject.components.data_ingestion import DataIngestion
+from src.MLProject.components.data_transformation import DataTransformation
+from src.MLProject.components.model_trainer import ModelTrainer
+from src.MLProject.components.incremental_trainer import IncrementalTrainer
+
+logger = get_logger(__name__)
+
+# Supported training modes
+TRAINING_MODES = ("full", "incremental")
+
+
+class TrainingPipeline:
+    """
+    This class runs data ingestion, data transformation and model training end to end.
+    """
+
+    def __init__(self):
+        """
+        Initialize the pipeline; stage_seconds collects the wall-clock time of each stage.
+        """
+        self.stage_seconds = {}
+
+    def _timed_stages(self,on_stage):
+        """
+        Wraps a stage callback so the time between consecutive stages is added to stage_seconds
+        (and observed in the training stage histogram). Calling the wrapper with None closes the last stage.
+        """
+        current = {"stage": None, "start": None}
+
+        def wrapper(stage):
+            now = time.perf_counter()
+            if current["stage"] is not None:
+                elapsed = now - current["start"]
+                self.stage_seconds[current["stage"]] = round(self.stage_seconds.get(current["stage"], 0.0) + elapsed, 4)
+                training_stage_seconds.observe(elapsed, stage=current["stage"])
+                logger.info("Training stage finished", extra={"stage": current["stage"], "duration_ms": round(elapsed * 1000, 3)})
+            current["stage"], current["start"] = stage, now
+            if stage is not None:
+                on_stage(stage)
+
+        return wrapper
+
+    def run(self,df,on_stage=None,mode="full"):
+        """
+        Trains and publishes a model from a DataFrame of training rows.
+
+        In "full" mode the upload replaces the stored dataset and a new model is fitted
+        from scratch. In "incremental" mode the upload is appended to the stored dataset
+        and the current model is extended, unless the IncrementalTrainer policy forces
+        a full retrain on the whole stored dataset. The stored dataset is only replaced
+        once the new model is published.
+
+        Args:
+            df (pandas.DataFrame): The uploaded training data.
+            on_stage (callable): Optional callback invoked with the name of each stage as it starts.
+            mode (str): "full" or "incremental".
+
+        Returns:
+            dict: The test RMSE, the published model version and its path, the mode actually
+            used, the model selection trade-off (full training), and the seconds spent in each stage.
+
+        Raises:
+            CustomException: If any stage fails.
+        """
+        try:
+            on_stage = self._timed_stages(on_stage or (lambda stage: None))
+            if mode not in TRAINING_MODES:
+                raise ValueError(f"Unknown training mode: {mode}")
+
+            # Build the dataset the model is based on: the upload, or the stored dataset with the upload appended
+            on_stage("ingestion")
+            obj=DataIngestion()
+            dataset=obj.build_dataset(df, append=(mode == "incremental"))
+
+            result = {"training_mode": mode}
+            if mode == "incremental":
+                incremental_trainer = IncrementalTrainer()
+                reason = incremental_trainer.full_retrain_reason()
+                if reason is None:
+                    on_stage("training")
+                    rmse, reason = incremental_trainer.initiate_incremental_training(dataset, df)
+                    if reason is None:
+                        result.update({
+                            "rmse": float(rmse),
+                            "model_version": incremental_trainer.model_trainer.model_version,
+                            "model_path": incremental_trainer.model_trainer.model_path,
+                        })
+                        obj.store_dataset(dataset)
+                        on_stage(None)
+                        result["stage_seconds"] = self.stage_seconds
+                        return result
+
+                # Fall back to a full retrain on the whole stored dataset
+                result.update({"training_mode": "full", "full_retrain_reason": reason})
+                df = dataset
+
+            # Split the data; the splits are handed to transformation in memory
+            # while the CSV artifacts are written in the background
+            on_stage("ingestion")
+            train_set,test_set=obj.split_data(df)
+
+            # Create a DataTransformation object and call its method to transform the data
+            on_stage("transformation")
+            data_transformation = DataTransformation()
+            train_arr,test_arr = data_transformation.initiate_data_transormation(train_set,test_set)
+
+            # Create a ModelTrainer object and call its method to train the model
+            on_stage("training")
+            modeltrainer = ModelTrainer()
+            rmse = modeltrainer.initiate_model_trainer(train_arr,test_arr)
+
+            result.update({
+                "rmse": float(rmse),
+                "model_version": modeltrainer.model_version,
+                "model_path": modeltrainer.model_path,
+                "model_selection": modeltrainer.selection,
+            })
+            obj.store_dataset(df)
+            on_stage(None)
+            result["stage_seconds"] = self.stage_seconds
+            return result
+
+        except Exception as e:
+            raise CustomException(e,sys)
@@ -0,0 +1,173 @@
+import os
+import sys
+import time
+import hashlib
+import threading
+import numpy as np
+from collections import OrderedDict
+from dataclasses import dataclass
+from src.MLProject.exception import CustomException
+from src.MLProject.metrics import registry, stats_collector
+
+
+@dataclass
+class PredictionCacheConfig:
+    """
+    This dataclass holds configuration settings for the prediction result cache.
+    """
+
+    # Whether PredictPipeline looks up results before calling the model.
+    enabled:bool = os.environ.get("MLPROJECT_PREDICTION_CACHE", "1") == "1"
+
+    # Maximum number of cached rows; the least recently used one is evicted first.
+    max_entries:int = int(os.environ.get("MLPROJECT_PREDICTION_CACHE_SIZE", 100000))
+
+    # Seconds a cached result stays valid (0 keeps results until evicted or the model changes).
+    ttl_seconds:float = float(os.environ.get("MLPROJECT_PREDICTION_CACHE_TTL", 300))
+
+    # Batches with more rows than this bypass the cache (e.g. streamed CSV chunks),
+    # since bulk scoring rarely repeats and would only push out the hot rows.
+    max_batch_rows:int = int(os.environ.get("MLPROJECT_PREDICTION_CACHE_MAX_BATCH", 1000))
+
+
+class PredictionCache:
+    """
+    This class keeps recent predictions in a bounded LRU/TTL cache keyed by model version, engine and feature row.
+
+    Results of different engines are cached apart, since they may differ in the
+    last bits; switching engines keeps both sets, while a new model version drops
+    every cached result.
+    """
+
+    def __init__(self, config=None):
+        """
+        Initialize the cache.
+
+        Args:
+            config (PredictionCacheConfig): Optional configuration, defaults to PredictionCacheConfig().
+        """
+        self.config = config or PredictionCacheConfig()
+        self._entries = OrderedDict()
+        self._model_key = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+            "bypassed_rows": 0,
+        }
+
+    @staticmethod
+    def row_keys(features):
+        """
+        Hashes every feature row in its canonical form (a contiguous float64 vector).
+
+        Args:
+            features (np.array): A 2-D feature array.
+
+        Returns:
+            list: One 16-byte digest per row.
+        """
+        rows = np.ascontiguousarray(features, dtype=np.float64)
+        return [hashlib.blake2b(row.tobytes(), digest_size=16).digest() for row in rows]
+
+    def _use_model(self, model_key):
+        """
+        Drops every cached result when the model behind the predictions changes. Call with the lock held.
+        """
+        if model_key != self._model_key:
+            if self._entries:
+                self._stats["invalidations"] += 1
+            self._entries.clear()
+            self._model_key = model_key
+
+    def predict(self, model_key, features, predict_fn, engine="sklearn"):
+        """
+        Returns predictions for a batch, calling predict_fn only for the rows that are not cached.
+
+        Args:
+            model_key (tuple): Identifies the model version, e.g. (path, file signature).
+            features (array-like): A 2-D feature array.
+            predict_fn (callable): The model's predict function.
+            engine (str): The inference engine behind predict_fn, part of every row's key.
+
+        Returns:
+            np.array: One prediction per row, in input order.
+
+        Raises:
+            CustomException: If the lookup or the model call fails.
+        """
+        try:
+            features = np.asarray(features, dtype=np.float64)
+            if features.ndim != 2 or len(features) > self.config.max_batch_rows:
+                self._stats["bypassed_rows"] += len(features)
+                return predict_fn(features)
+
+            keys = [(engine, key) for key in self.row_keys(features)]
+            preds = np.empty(len(keys), dtype=np.float64)
+            missing = []
+            now = time.monotonic()
+
+            # Look up every row; expired entries count as misses
+            with self._lock:
+                self._use_model(model_key)
+                for i, key in enumerate(keys):
+                    entry = self._entries.get(key)
+                    if entry is not None and (entry[1] is None or entry[1] > now):
+                        self._entries.move_to_end(key)
+                        preds[i] = entry[0]
+                        continue
+                    if entry is not None:
+                        del self._entries[key]
+                        self._stats["expirations"] += 1
+                    missing.append(i)
+                self._stats["hits"] += len(keys) - len(missing)
+                self._stats["misses"] += len(missing)
+
+            if not missing:
+                return preds
+
+            # Only the rows that missed are sent to the model, outside the lock
+            computed = np.asarray(predict_fn(features[missing]), dtype=np.float64)
+            preds[missing] = computed
+
+            expires_at = now + self.config.ttl_seconds if self.config.ttl_seconds > 0 else None
+            with self._lock:
+                # Results of a model that was replaced meanwhile are not stored
+                if model_key == self._model_key:
+                    for i, value in zip(missing, computed.tolist()):
+                        self._entries[keys[i]] = (value, expires_at)
+                        self._entries.move_to_end(keys[i])
+                    while len(self._entries) > self.config.max_entries:
+                        self._entries.popitem(last=False)
+                        self._stats["evictions"] += 1
+
+            return preds
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def stats(self):
+        """
+        Returns hit, miss, eviction, expiration and invalidation counters and the current size.
+        """
+        stats = dict(self._stats)
+        stats["size"] = len(self._entries)
+        return stats
+
+    def clear(self):
+        """
+        Drops every cached result.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+# Process-wide result cache shared by every PredictPipeline
+prediction_cache = PredictionCache()
+registry.register_collector(stats_collector(
+    "mlproject_prediction_cache", prediction_cache.stats,
+    counters=("hits", "misses", "evictions", "expirations", "invalidations", "bypassed_rows"),
+))
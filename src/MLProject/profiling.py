@@ -0,0 +1,135 @@
+import os
+import io
+import json
+import time
+import uuid
+import random
+import pstats
+import cProfile
+import functools
+import threading
+from dataclasses import dataclass
+from flask import request, make_response
+
+
+@dataclass
+class ProfilingConfig:
+    """
+    This dataclass holds configuration settings for per-request profiling.
+    """
+
+    # Fraction of requests to profile at random (0 disables sampling).
+    sample_rate:float = float(os.environ.get("MLPROJECT_PROFILE_SAMPLE_RATE", 0))
+
+    # Whether an authorized request can ask for a profile with ?profile=1. Off by default:
+    # every token holder could otherwise add profiling overhead and write profiles at will.
+    allow_flag:bool = os.environ.get("MLPROJECT_PROFILE_ALLOW_FLAG", "0") == "1"
+
+    # Directory the profiles are written to.
+    profile_dir:str = os.environ.get("MLPROJECT_PROFILE_DIR", os.path.join("artifacts", "profiles"))
+
+    # Number of profiles kept; the oldest ones are deleted first.
+    max_profiles:int = int(os.environ.get("MLPROJECT_PROFILE_KEEP", 100))
+
+    # Number of functions listed in the metadata summary of each profile.
+    top_functions:int = int(os.environ.get("MLPROJECT_PROFILE_TOP", 25))
+
+
+config = ProfilingConfig()
+
+# Only one request is profiled at a time; cProfile cannot be active in several threads on every Python version
+_active = threading.Lock()
+
+
+def _profile_reason():
+    """
+    Returns why the current request should be profiled, or None.
+    """
+    if config.allow_flag and request.args.get("profile") in ("1", "true"):
+        return "flag"
+    if config.sample_rate and random.random() < config.sample_rate:
+        return "sampled"
+    return None
+
+
+def _write_profile(profiler, metadata):
+    """
+    Writes a profile (.prof, readable with pstats or snakeviz) and its metadata (.json), then rotates the directory.
+    """
+    os.makedirs(config.profile_dir, exist_ok=True)
+    base = os.path.join(config.profile_dir, metadata["profile_id"])
+
+    # Summarize the most expensive functions by cumulative time
+    summary = io.StringIO()
+    stats = pstats.Stats(profiler, stream=summary)
+    stats.sort_stats("cumulative").print_stats(config.top_functions)
+    metadata["top_functions"] = summary.getvalue().splitlines()
+
+    stats.dump_stats(base + ".prof")
+    with open(base + ".json", "w") as file_obj:
+        json.dump(metadata, file_obj, indent=2)
+
+    # Keep only the newest profiles (ids start with a timestamp, so names sort by age)
+    profile_ids = sorted({os.path.splitext(name)[0] for name in os.listdir(config.profile_dir)})
+    for profile_id in profile_ids[:-config.max_profiles] if config.max_profiles > 0 else []:
+        for extension in (".prof", ".json"):
+            try:
+                os.remove(os.path.join(config.profile_dir, profile_id + extension))
+            except FileNotFoundError:
+                pass
+
+
+def profiled(view_func):
+    """
+    Decorator that profiles a view with cProfile for sampled or flagged requests.
+
+    Apply it below @auth so only authorized requests can ask for a profile. When
+    neither sampling nor the flag applies, the view is called directly, so the
+    cost is one query-argument lookup. A streamed response body is generated after
+    the view returns and is not part of the profile.
+    """
+    @functools.wraps(view_func)
+    def decorated(*args, **kwargs):
+        reason = _profile_reason()
+        if reason is None or not _active.acquire(blocking=False):
+            return view_func(*args, **kwargs)
+
+        try:
+            profiler = cProfile.Profile()
+            start = time.perf_counter()
+            profiler.enable()
+            try:
+                response = make_response(view_func(*args, **kwargs))
+            finally:
+                profiler.disable()
+            duration = time.perf_counter() - start
+
+            now = time.time()
+            profile_id = f"{time.strftime('%Y%m%d%H%M%S', time.localtime(now))}{int(now * 1e6) % 1000000:06d}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+            metadata = {
+                "profile_id": profile_id,
+                "reason": reason,
+                "endpoint": request.url_rule.rule if request.url_rule else request.path,
+                "method": request.method,
+                "args": {key: value for key, value in request.args.items() if key != "token"},
+                "content_type": request.content_type,
+                "content_length": request.content_length,
+                "status": response.status_code,
+                "duration_seconds": round(duration, 6),
+                "pid": os.getpid(),
+                "thread": threading.current_thread().name,
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            }
+
+            # A profile that cannot be written must not fail the request it describes
+            try:
+                _write_profile(profiler, metadata)
+                response.headers["X-Profile-Id"] = profile_id
+            except OSError:
+                pass
+            return response
+
+        finally:
+            _active.release()
+
+    return decorated
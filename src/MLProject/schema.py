@@ -0,0 +1,36 @@
+# Feature columns expected by the model, in the order it was trained with
+FEATURE_COLUMNS = ['Month', 'Weekday', 'EUR',
+        'JPY', 'BGN', 'CZK', 'DKK', 'GBP', 'HUF', 'PLN', 'RON', 'SEK', 'CHF', 'NOK', 'TRY', 'AUD', 'BRL', 'CAD', 'CNY', 'HKD', 'IDR', 'KRW', 'MXN', 'MYR', 'NZD', 'PHP', 'SGD', 'THB', 'ZAR',
+        'Year', 'Day']
+
+# Columns of a training dataset (CSV upload or JSON records), in file order; INR is the target
+TRAINING_COLUMNS = ['Month', 'Weekday', 'Date', 'EUR',
+        'JPY', 'BGN', 'CZK', 'DKK', 'GBP', 'HUF', 'PLN', 'RON', 'SEK', 'CHF', 'NOK', 'TRY', 'AUD', 'BRL', 'CAD', 'CNH', 'HKD', 'IDR', 'KRW', 'MXN', 'MYR', 'NZD', 'PHP', 'SGD', 'THB', 'ZAR',
+        'INR']
+
+# Columns of a prediction CSV upload, in file order; Year and Day are derived from Date
+PREDICTION_COLUMNS = FEATURE_COLUMNS[:2] + ['Date'] + FEATURE_COLUMNS[2:-2]
+
+# Date formats of training data and of prediction uploads
+TRAINING_DATE_FORMAT = '%Y-%m-%d'
+PREDICTION_DATE_FORMAT = '%d-%m-%Y'
+
+# Alternative names accepted for a column in uploaded files (the offshore and onshore yuan rates)
+COLUMN_ALIASES = {'CNH': 'CNY', 'CNY': 'CNH'}
+
+# Explicit storage dtypes for dataset artifacts: small integers for calendar
+# columns and float64 for exchange rates and the INR target. Rates are parsed and
+# stored at full precision; the forest rounds its inputs to float32 itself when
+# predicting, so narrowing them here would only lose digits of the source data
+# that is written back to the artifacts.
+DATASET_DTYPES = {
+    'Month': 'int8', 'Weekday': 'int8', 'Year': 'int16', 'Day': 'int8',
+    'Date': 'datetime64[ns]', 'INR': 'float64',
+}
+RATE_DTYPE = 'float64'
+
+def dataset_dtype(column):
+    """
+    Returns the storage dtype of a dataset column; unlisted columns are exchange rates.
+    """
+    return DATASET_DTYPES.get(column, RATE_DTYPE)
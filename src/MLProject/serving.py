@@ -0,0 +1,129 @@
+import os
+import sys
+import time
+import threading
+import numpy as np
+from dataclasses import dataclass
+from src.MLProject.exception import CustomException
+from src.MLProject.logger import get_logger
+from src.MLProject.model_registry import model_registry
+from src.MLProject.schema import FEATURE_COLUMNS
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class ServingConfig:
+    """
+    This dataclass holds configuration settings for the serving lifecycle.
+    """
+
+    # Rows predicted during warm-up, so the model's pages and code paths are touched before traffic arrives.
+    warmup_rows:int = int(os.environ.get("MLPROJECT_WARMUP_ROWS", 64))
+
+    # Seconds between checks of the registry's CURRENT pointer by the model watcher.
+    model_poll_seconds:float = float(os.environ.get("MLPROJECT_MODEL_POLL_SECONDS", 5))
+
+
+class ServingState:
+    """
+    This class loads and warms the current model and reports whether the process is ready for traffic.
+    """
+
+    def __init__(self, config=None):
+        """
+        Initialize the serving state; the process is not ready until warm_up succeeds.
+
+        Args:
+            config (ServingConfig): Optional configuration, defaults to ServingConfig().
+        """
+        self.config = config or ServingConfig()
+        self.ready = False
+        self.model_version = None
+        self.model_path = None
+        self.warmed_at = None
+        self.warmup_seconds = None
+        self.error = None
+
+    def warm_up(self):
+        """
+        Loads the current model into the process-wide cache and runs a prediction with it.
+
+        Called before a pre-fork server forks its workers, the loaded model is inherited
+        by every worker instead of being loaded by each one on its first request.
+
+        Returns:
+            bool: Whether the process is ready. A failure is logged and recorded on error
+            instead of raised, so the server still starts and /ready reports it.
+        """
+        from src.MLProject.pipelines.prediction_pipeline import PredictPipeline
+
+        try:
+            start = time.perf_counter()
+            version = model_registry.current_version()
+            model_path = model_registry.current_model_path() or os.path.join("artifacts", "model.pkl")
+            if not os.path.exists(model_path):
+                raise FileNotFoundError(f"No model to serve at {model_path}")
+
+            PredictPipeline().predict(np.zeros((self.config.warmup_rows, len(FEATURE_COLUMNS))))
+
+            self.model_version, self.model_path = version, model_path
+            self.warmup_seconds = round(time.perf_counter() - start, 4)
+            self.warmed_at = time.time()
+            self.error = None
+            self.ready = True
+            logger.info("Model warmed up", extra={"model_version": version, "duration_ms": self.warmup_seconds * 1000})
+
+        except Exception as e:
+            self.error = str(CustomException(e, sys))
+            logger.error("Model warm-up failed", extra={"error": self.error})
+
+        return self.ready
+
+    def status(self):
+        """
+        Returns the readiness report served on /ready.
+
+        Returns:
+            dict: Readiness, the warmed and current model versions, warm-up time and any error.
+        """
+        return {
+            "ready": self.ready,
+            "pid": os.getpid(),
+            "model_version": self.model_version,
+            "current_version": model_registry.current_version(),
+            "warmed_at": self.warmed_at,
+            "warmup_seconds": self.warmup_seconds,
+            "error": self.error,
+        }
+
+    def watch_model(self, on_change):
+        """
+        Starts a daemon thread that calls on_change whenever a new model version becomes current.
+
+        Args:
+            on_change (callable): Called with the new version, e.g. to make a server reload its workers.
+
+        Returns:
+            threading.Thread: The watcher thread.
+        """
+        def run():
+            last = model_registry.current_version()
+            while True:
+                time.sleep(self.config.model_poll_seconds)
+                try:
+                    version = model_registry.current_version()
+                    if version != last:
+                        last = version
+                        logger.info("New model version published", extra={"model_version": version})
+                        on_change(version)
+                except Exception:
+                    logger.exception("Model watcher failed")
+
+        thread = threading.Thread(target=run, name="model-watcher", daemon=True)
+        thread.start()
+        return thread
+
+
+# Serving state of this process
+serving_state = ServingState()
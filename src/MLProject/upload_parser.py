@@ -0,0 +1,204 @@
+import os
+import csv
+import time
+import importlib.util
+import pandas as pd
+from dataclasses import dataclass
+from src.MLProject.schema import COLUMN_ALIASES, dataset_dtype
+from src.MLProject.metrics import stage_seconds, timed
+
+
+@dataclass
+class UploadParserConfig:
+    """
+    This dataclass holds configuration settings for parsing uploaded CSV files.
+    """
+
+    # CSV engine: "pyarrow" (multithreaded, needs pyarrow), "c", or "auto" for pyarrow when it is installed.
+    # Chunked reads always use the C engine, since pandas' pyarrow engine cannot read in chunks.
+    engine:str = os.environ.get('MLPROJECT_CSV_ENGINE', 'auto')
+
+
+class UploadSchemaError(ValueError):
+    """
+    Raised when an uploaded CSV file or JSON body does not have the expected columns or values.
+    """
+
+
+def _resolve_engine(engine, chunked):
+    """
+    Picks the pandas CSV engine for a read.
+    """
+    if chunked or engine == 'c':
+        return 'c'
+    if engine == 'auto':
+        return 'pyarrow' if importlib.util.find_spec('pyarrow') else 'c'
+    if engine == 'pyarrow':
+        return engine
+    raise ValueError(f"Unknown CSV engine: {engine}")
+
+
+def _map_columns(header, columns):
+    """
+    Maps the names in a file header to schema columns, accepting COLUMN_ALIASES.
+
+    Returns:
+        dict: File column name -> schema column name, for the columns to load.
+
+    Raises:
+        UploadSchemaError: If a schema column is not in the header.
+    """
+    mapping = {}
+    for name in header:
+        if name in columns:
+            mapping[name] = name
+        elif COLUMN_ALIASES.get(name) in columns and COLUMN_ALIASES[name] not in header:
+            mapping[name] = COLUMN_ALIASES[name]
+
+    missing = [column for column in columns if column not in mapping.values()]
+    if missing:
+        raise UploadSchemaError(f"Missing columns in CSV file: {missing}")
+    return mapping
+
+
+def _parse_dates(values, date_formats):
+    """
+    Parses a column of date strings with the first of date_formats that fits all of them.
+    """
+    for date_format in date_formats[:-1]:
+        try:
+            return pd.to_datetime(values, format=date_format)
+        except (ValueError, TypeError):
+            pass
+    return pd.to_datetime(values, format=date_formats[-1])
+
+
+def _finish_frame(df, mapping, columns, date_formats):
+    """
+    Renames aliased columns in place, parses Date and puts the columns in schema order.
+    """
+    df.columns = [mapping[name] for name in df.columns]
+    if 'Date' in df.columns:
+        df['Date'] = _parse_dates(df['Date'], date_formats)
+    if list(df.columns) != list(columns):
+        df = df[columns]
+    return df
+
+
+def read_upload(stream, columns, date_formats, chunksize=None, config=None):
+    """
+    Parses an uploaded CSV file straight from its binary stream against a fixed column schema.
+
+    Only the schema columns are loaded, each with its dataset dtype (see
+    schema.dataset_dtype), so the upload is never decoded into an intermediate
+    string and the parsed frame is the only full copy of the data. Extra
+    columns are ignored and the result is in schema column order.
+
+    Args:
+        stream (file object): The binary stream of the uploaded file, positioned at the header.
+        columns (list): The schema columns, e.g. TRAINING_COLUMNS or PREDICTION_COLUMNS.
+        date_formats (tuple): Accepted formats of the Date column, the expected one first.
+        chunksize (int): Optional number of rows per chunk; an iterator of frames is returned instead.
+        config (UploadParserConfig): Optional configuration, defaults to UploadParserConfig().
+
+    Returns:
+        pandas.DataFrame or iterator: The parsed rows, with Date as datetime64.
+
+    Raises:
+        UploadSchemaError: If a schema column is missing from the header.
+    """
+    config = config or UploadParserConfig()
+    if chunksize is None:
+        with timed('upload_parse'):
+            return _read_upload(stream, columns, date_formats, None, config)
+    return _read_upload(stream, columns, date_formats, chunksize, config)
+
+
+def _read_upload(stream, columns, date_formats, chunksize, config):
+    """
+    Implements read_upload; returns the frame or an iterator of chunks.
+    """
+    # Read the header ourselves so columns can be checked and aliased before parsing
+    header = next(csv.reader([stream.readline().decode('utf-8-sig')]), [])
+    header = [name.strip() for name in header]
+    mapping = _map_columns(header, columns)
+
+    dtype = {name: (object if schema == 'Date' else dataset_dtype(schema)) for name, schema in mapping.items()}
+    reader = pd.read_csv(
+        stream,
+        header=None,
+        names=header,
+        usecols=[header.index(name) for name in mapping],
+        dtype=dtype,
+        engine=_resolve_engine(config.engine, chunksize is not None),
+        chunksize=chunksize,
+    )
+
+    if chunksize is None:
+        return _finish_frame(reader, mapping, columns, date_formats)
+    return _iter_chunks(reader, mapping, columns, date_formats)
+
+
+def _iter_chunks(reader, mapping, columns, date_formats):
+    """
+    Yields the finished chunks of a chunked read, timing the parse of each one.
+    """
+    while True:
+        start = time.perf_counter()
+        df = next(reader, None)
+        if df is None:
+            return
+        df = _finish_frame(df, mapping, columns, date_formats)
+        stage_seconds.observe(time.perf_counter() - start, stage='upload_parse')
+        yield df
+
+
+def read_records(records, columns, date_formats):
+    """
+    Parses JSON records against a fixed column schema, with the same rules as read_upload.
+
+    Keys may use COLUMN_ALIASES, Date may be in any of date_formats, and every
+    column gets its dataset dtype, so JSON rows and CSV uploads produce the same
+    frame. Extra keys are ignored.
+
+    Args:
+        records (list): The records, one dict per row.
+        columns (list): The schema columns, e.g. TRAINING_COLUMNS.
+        date_formats (tuple): Accepted formats of the Date column, the expected one first.
+
+    Returns:
+        pandas.DataFrame: The parsed rows in schema column order, with Date as datetime64.
+
+    Raises:
+        UploadSchemaError: If a record is not an object, misses a column, or has an invalid value.
+    """
+    rows = []
+    missing = set()
+    for record in records:
+        if not isinstance(record, dict):
+            raise UploadSchemaError("Invalid JSON data: every row must be an object")
+        row = {}
+        for column in columns:
+            if column in record:
+                row[column] = record[column]
+            elif COLUMN_ALIASES.get(column) in record:
+                row[column] = record[COLUMN_ALIASES[column]]
+            else:
+                missing.add(column)
+        rows.append(row)
+
+    if missing:
+        raise UploadSchemaError(f"Missing keys in JSON data: {sorted(missing, key=columns.index)}")
+
+    df = pd.DataFrame(rows, columns=columns)
+    try:
+        df = df.astype({column: dataset_dtype(column) for column in columns if column != 'Date'})
+    except (ValueError, TypeError) as e:
+        raise UploadSchemaError(f"Invalid value in JSON data: {e}")
+
+    if 'Date' in df.columns:
+        try:
+            df['Date'] = _parse_dates(df['Date'], date_formats)
+        except (ValueError, TypeError):
+            raise UploadSchemaError(f"Invalid Date in JSON data, expected one of the formats {list(date_formats)}")
+    return df
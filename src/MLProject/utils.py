@@ -3,13 +3,35 @@ import sys
 from src.MLProject.exception import CustomException
 from src.MLProject.logger import logging
 import numpy as np
-import pickle
-from sklearn.metrics import mean_squared_error
-from sklearn.model_selection import GridSearchCV
+import tempfile
+import joblib
+
+# scikit-learn and the joblib process pool are imported inside the training helpers
+# below, so prediction-only processes that import this module never load them
+
+# The process umask, read once at import (os.umask can only be read by setting it)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def apply_umask(path):
+    """
+    Gives a file or directory created by tempfile the permissions a plain open() or makedirs() would.
+
+    tempfile creates files as 0600 and directories as 0700; published artifacts
+    must stay readable by serving processes running as other users.
+
+    Args:
+        path (str): The temporary file or directory.
+    """
+    mode = 0o777 if os.path.isdir(path) else 0o666
+    os.chmod(path, mode & ~_UMASK)
 
 def save_object(file_path, obj):
     """
-    Saves a given Python object to a file using pickle.
+    Saves a given Python object to a file using joblib's pickle format. The file is replaced atomically.
+
+    NumPy arrays inside the object are stored as raw aligned buffers, so load_object
+    can memory-map them instead of copying them into each process.
 
     Args:
         file_path (str): The path to the file where the object will be saved.
@@ -23,17 +45,111 @@ def save_object(file_path, obj):
         dir_path = os.path.dirname(file_path)
         os.makedirs(dir_path, exist_ok=True)
 
-        # Open the file in binary write mode and pickle the object
-        with open(file_path, "wb") as file_obj:
-            pickle.dump(obj, file_obj)
+        # Pickle into a temporary file in the same directory, then atomically rename it
+        # over the target so readers never see a half-written file
+        fd, tmp_path = tempfile.mkstemp(dir=dir_path or ".", prefix=".tmp-", suffix=".pkl")
+        os.close(fd)
+        try:
+            apply_umask(tmp_path)
+            joblib.dump(obj, tmp_path)
+            with open(tmp_path, "rb") as file_obj:
+                os.fsync(file_obj.fileno())
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
 
     except Exception as e:
         raise CustomException(e, sys)
     
     
-def evaluate_models(X_train,y_train,X_test,y_test,models,param):
+class _ByteCounter:
+    """
+    Write-only file object that counts the bytes written to it instead of storing them.
+    """
+
+    def __init__(self):
+        self.size = 0
+
+    def write(self, data):
+        n = memoryview(data).nbytes
+        self.size += n
+        return n
+
+    def tell(self):
+        return self.size
+
+    def flush(self):
+        pass
+
+
+def serialized_size(obj):
+    """
+    Returns the size in bytes of the file save_object would write for an object, without writing or buffering it.
+
+    Args:
+        obj: The object to measure.
+    """
+    counter = _ByteCounter()
+    joblib.dump(obj, counter)
+    return counter.size
+
+
+def _memmap_arrays(temp_folder, **arrays):
+    """
+    Dumps arrays to disk and reopens them read-only as memory maps.
+
+    Worker processes receive a memory-mapped array as a file reference, so every
+    worker shares one page-cache copy instead of unpickling its own.
+
+    Args:
+        temp_folder (str): Directory for the backing files.
+        **arrays: Arrays to share, keyed by name.
+
+    Returns:
+        dict: The same keys mapped to read-only np.memmap views.
+    """
+    shared = {}
+    for name, arr in arrays.items():
+        path = os.path.join(temp_folder, f"{name}.joblib")
+        joblib.dump(np.ascontiguousarray(arr), path)
+        shared[name] = joblib.load(path, mmap_mode="r")
+    return shared
+
+
+def _fit_and_score(model, params, X, y, train_idx, test_idx):
+    """
+    Fits one (model, params, fold) task and scores it on the held-out fold.
+
+    Returns:
+        float: The estimator's default score (R^2 for regressors), as GridSearchCV uses.
+    """
+    from sklearn.base import clone
+
+    estimator = clone(model).set_params(**params)
+    estimator.fit(X[train_idx], y[train_idx])
+    return estimator.score(X[test_idx], y[test_idx])
+
+
+def _refit(model, params, X, y):
     """
-    Evaluates multiple machine learning models using GridSearchCV and returns a report of their scores.
+    Fits the selected parameters once on the whole training set.
+    """
+    from sklearn.base import clone
+
+    return clone(model).set_params(**params).fit(X, y)
+
+
+def evaluate_models(X_train,y_train,X_test,y_test,models,param,n_jobs=-1,cv=3):
+    """
+    Evaluates multiple machine learning models with a parallel grid search and returns a report of their scores.
+
+    Every (model, params, fold) combination is an independent task spread over a
+    process pool; models with a single parameter combination skip cross-validation.
+    The training arrays are shared with the workers as read-only memory maps. Each
+    model's best parameters are refit once on the whole training set and that
+    estimator replaces the entry in models.
 
     Args:
         X_train (array-like): Training features.
@@ -41,7 +157,10 @@ def evaluate_models(X_train,y_train,X_test,y_test,models,param):
         X_test (array-like): Testing features.
         y_test (array-like): Testing target values.
         models (dict): A dictionary containing model objects to evaluate, keyed by model names.
+            Updated in place with the fitted best estimator of each model.
         param (dict): A dictionary of hyperparameter grids for each model, keyed by model names.
+        n_jobs (int): Number of worker processes (-1 uses every core).
+        cv (int): Number of cross-validation folds.
 
     Returns:
         dict: A dictionary containing model names as keys and their evaluation scores (RMSE) as values.
@@ -50,43 +169,75 @@ def evaluate_models(X_train,y_train,X_test,y_test,models,param):
         CustomException: If an error occurs during evaluation.
     """
 
+    from joblib import Parallel, delayed
+    from sklearn.metrics import mean_squared_error
+    from sklearn.model_selection import KFold, ParameterGrid
+
     try:
         report={}
-
-        # Iterate through each model in the models dictionary
-        for i in range(len(list(models))):
-            model = list(models.values())[i]
-            para=param[list(models.keys())[i]]
-
-            # Perform hyperparameter tuning using GridSearchCV
-            gs = GridSearchCV(model,para,cv=3)
-            gs.fit(X_train,y_train)
-
-            # Set the model's best parameters and refit on the entire training set
-            model.set_params(**gs.best_params_)
-            model.fit(X_train,y_train)
-
-            # Make predictions on training and testing sets
-            y_train_pred = model.predict(X_train)
-            y_test_pred = model.predict(X_test)
+        X_train = np.asarray(X_train, dtype=float)
+        y_train = np.asarray(y_train, dtype=float)
+
+        # Enumerate every (model, params, fold) task up front; a model with a
+        # single parameter combination needs no cross-validation at all
+        folds = list(KFold(n_splits=cv).split(X_train))
+        best_params = {}
+        candidates = []
+        for name in models:
+            grid = list(ParameterGrid(param[name]))
+            if len(grid) == 1:
+                best_params[name] = (grid[0], None)
+            else:
+                candidates.extend((name, params) for params in grid)
+
+        with tempfile.TemporaryDirectory() as temp_folder:
+            shared = _memmap_arrays(temp_folder, X=X_train, y=y_train)
+
+            with Parallel(n_jobs=n_jobs) as parallel:
+                # Cross-validate all candidates of all models in one pool
+                scores = parallel(
+                    delayed(_fit_and_score)(models[name], params, shared["X"], shared["y"], train_idx, test_idx)
+                    for name, params in candidates
+                    for train_idx, test_idx in folds
+                )
+                mean_scores = np.asarray(scores).reshape(len(candidates), len(folds)).mean(axis=1) if candidates else []
+
+                # Pick the best parameters of each model by mean fold score
+                for (name, params), score in zip(candidates, mean_scores):
+                    if name not in best_params or score > best_params[name][1]:
+                        best_params[name] = (params, score)
+
+                # Refit each model's best parameters once on the entire training set
+                names = list(models)
+                fitted = parallel(
+                    delayed(_refit)(models[name], best_params[name][0], shared["X"], shared["y"])
+                    for name in names
+                )
+
+        for name, model in zip(names, fitted):
+            models[name] = model
 
             # Calculate RMSE on the testing set
+            y_test_pred = model.predict(X_test)
             test_model_score = np.sqrt(mean_squared_error(y_test, y_test_pred))
 
             # Add the model name and score to the report dictionary
-            report[list(models.keys())[i]] = test_model_score
+            report[name] = test_model_score
 
         return report
         
     except Exception as e:
         raise CustomException(e,sys)
     
-def load_object(file_path):
+def load_object(file_path, mmap_mode=None):
     """
-    Loads a Python object from a file using pickle.
+    Loads a Python object saved by save_object (plain pickle files are read as well).
 
     Args:
         file_path (str): The path to the file containing the pickled object.
+        mmap_mode (str): Optional NumPy memory-map mode such as "r". Arrays are then
+            mapped from the file, so processes loading the same file share one
+            page-cache copy instead of each holding their own.
 
     Returns:
         The loaded Python object.
@@ -95,9 +246,8 @@ def load_object(file_path):
         CustomException: If an error occurs during loading.
     """
     try:
-        # Open the file in binary read mode and unpickle the object
-        with open(file_path, "rb") as file_obj:
-            return pickle.load(file_obj)
+        # Unpickle the object, mapping its arrays from disk when requested
+        return joblib.load(file_path, mmap_mode=mmap_mode)
 
     except Exception as e:
         raise CustomException(e, sys)
\ No newline at end of file
@@ -0,0 +1,23 @@
+"""
+WSGI entry point for production serving.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+The current model is loaded and warmed when this module is imported. With
+preload_app (see gunicorn.conf.py) that happens once in the gunicorn master,
+before the workers are forked, so they share the loaded model copy-on-write.
+
+Set MLPROJECT_APP_MODE=predict for prediction-only instances: the training routes
+are not registered. Training code is imported on the first training request in
+either mode, and with MLPROJECT_PREDICT_ENGINE=compiled scikit-learn is never
+imported at all (see benchmarks/bench_cold_start.py).
+"""
+import gc
+from app import app
+from src.MLProject.serving import serving_state
+
+serving_state.warm_up()
+
+# Move everything loaded so far out of the garbage collector's generations, so
+# collections in the workers do not write to (and un-share) the inherited pages
+gc.freeze()